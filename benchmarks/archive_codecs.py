@@ -0,0 +1,72 @@
+"""Compares the archive codecs used when uploading a job directory.
+
+Builds a synthetic job directory with a mix of the files produced by a Bilby job, namely text logs and configuration,
+JSON results, and poorly compressible binary data standing in for HDF5 results and plots. Each codec then archives the
+directory to a sink which only counts the bytes written, and the wall time and compression ratio are reported. The gzip
+codecs are run both storing the binary data as it is, and compressing every file.
+
+Usage: python benchmarks/archive_codecs.py [size_in_MiB] [threads]
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from gwcloud_python.utils.archive import ARCHIVE_CODECS, write_job_archive
+
+
+class CountingSink:
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+        return len(data)
+
+
+def build_job_directory(path, size):
+    """Fill a directory with roughly `size` bytes of job output, split between text, JSON and binary files"""
+    (path / 'data').mkdir()
+    (path / 'result').mkdir()
+    (path / 'log_data_analysis').mkdir()
+
+    line = b'12:00:00 bilby INFO    : Running for label test, output will be saved to outdir\n'
+    record = b'{"log_likelihood": -1234.5678, "mass_1": 35.6, "mass_2": 30.1, "luminosity_distance": 410.2},\n'
+    chunk = 1024 * 1024
+    written = 0
+    i = 0
+    while written < size:
+        (path / 'log_data_analysis' / f'job_{i}.log').write_bytes(line * (chunk // len(line)))
+        (path / 'result' / f'job_{i}_result.json').write_bytes(record * (chunk // len(record)))
+        (path / 'data' / f'job_{i}_data.hdf5').write_bytes(os.urandom(chunk))
+        written += 3 * chunk
+        i += 1
+
+    (path / 'job_config_complete.ini').write_text('label=test\noutdir=./\n')
+    return written
+
+
+if __name__ == '__main__':
+    size = int(sys.argv[1]) * 1024 * 1024 if len(sys.argv) > 1 else 256 * 1024 * 1024
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+
+    with tempfile.TemporaryDirectory() as directory:
+        total = build_job_directory(Path(directory), size)
+        print(f'{total / 2 ** 20:.0f} MiB of job output, using {threads} threads')
+
+        runs = [(codec, True) for codec in ARCHIVE_CODECS] + [('gzip', False), ('parallel_gzip', False)]
+        for codec, content_aware in runs:
+            label = codec if content_aware else f'{codec} (all)'
+            sink = CountingSink()
+            start = time.perf_counter()
+            try:
+                write_job_archive(sink, directory, codec=codec, threads=threads, content_aware=content_aware)
+            except ImportError as e:
+                print(f'{label:>20}: skipped, {e}')
+                continue
+            elapsed = time.perf_counter() - start
+            print(
+                f'{label:>20}: {elapsed:6.2f} s ({total / 2 ** 20 / elapsed:7.1f} MiB/s), '
+                f'{sink.size / 2 ** 20:7.1f} MiB (ratio {total / sink.size:5.2f})'
+            )
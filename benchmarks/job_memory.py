@@ -0,0 +1,102 @@
+"""Measures the memory used by a large listing of Bilby jobs.
+
+Builds jobs from listing data in the same way as GWCloud does, and compares them against the previous representation
+of a job, which stored its fields, status, Event ID and extra arguments in per-instance dicts. Both representations are
+measured with the same Event IDs, either a separate Event ID for every job or a single shared instance for each event,
+so that the saving from interning Event IDs is not counted as a saving of the job representation.
+
+Usage: python benchmarks/job_memory.py [number_of_jobs]
+"""
+import sys
+import tracemalloc
+from dataclasses import dataclass
+
+from gwdc_python.helpers import JobStatus
+
+from gwcloud_python import BilbyJob, EventID
+
+
+@dataclass
+class DictEventID:
+    event_id: str
+    trigger_id: str = None
+    nickname: str = None
+    is_ligo_event: bool = False
+    gps_time: float = None
+
+
+class DictBilbyJob:
+    def __init__(self, client, job_id, name, description, user, event_id, job_status, **kwargs):
+        self.client = client
+        self.id = job_id
+        self.type = None
+        self.name = name
+        self.description = description
+        self.user = user
+        self.status = JobStatus(status=job_status['name'], date=job_status['date'])
+        self.event_id = event_id
+        self.other = kwargs
+
+
+def listing(number):
+    statuses = ['Completed', 'Error', 'Running', 'Queued']
+    return [
+        {
+            'job_id': f'QmlsYnlKb2JOb2RlOj{i:08d}',
+            'name': f'GW{i % 1000:06d}_job_{i}',
+            'description': f'Parameter estimation run {i}',
+            'user': f'User {i % 50}',
+            'event_id': {'event_id': f'GW{i % 1000:06d}', 'trigger_id': None, 'nickname': None, 'is_ligo_event': False},
+            'job_status': {'name': statuses[i % len(statuses)], 'date': f'2021-{i % 12 + 1:02d}-01T00:00:00+00:00'},
+        }
+        for i in range(number)
+    ]
+
+
+def measure(build, data):
+    tracemalloc.start()
+    jobs = build(data)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return jobs, size
+
+
+def per_job_event_ids(event_id_class):
+    return lambda event_id: event_id_class(**event_id) if event_id else None
+
+
+def interned_event_ids(event_id_class):
+    interned = {}
+
+    def intern(event_id):
+        if not event_id:
+            return None
+        if event_id['event_id'] not in interned:
+            interned[event_id['event_id']] = event_id_class(**event_id)
+        return interned[event_id['event_id']]
+
+    return intern
+
+
+def build_dict_jobs(data, event_ids):
+    intern = event_ids(DictEventID)
+    return [DictBilbyJob(client=None, **{**job, 'event_id': intern(job['event_id'])}) for job in data]
+
+
+def build_slotted_jobs(data, event_ids):
+    intern = event_ids(EventID)
+    return [BilbyJob(client=None, **{**job, 'event_id': intern(job['event_id'])}) for job in data]
+
+
+if __name__ == '__main__':
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    data = listing(number)
+
+    for strategy, event_ids in [('per job Event IDs', per_job_event_ids), ('interned Event IDs', interned_event_ids)]:
+        print(f'{strategy}:')
+        for label, build in [('dict based jobs', build_dict_jobs), ('slotted jobs', build_slotted_jobs)]:
+            jobs, size = measure(lambda data: build(data, event_ids), data)
+            print(
+                f'{label:>20}: {size / 2 ** 20:8.1f} MiB for {len(jobs)} jobs ({size / len(jobs):6.0f} bytes per job)'
+            )
+            del jobs
@@ -1,6 +1,8 @@
 from .gwcloud import GWCloud
 from .bilby_job import BilbyJob
-from .event_id import EventID
+from .event_id import EventID, EventIDRegistry
+from .job_catalogue import JobCatalogue
+from .job_table import JobTable
 
 from gwdc_python.files import FileReference, FileReferenceList
 from gwdc_python.helpers import TimeRange, Cluster, JobStatus
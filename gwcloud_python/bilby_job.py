@@ -1,3 +1,6 @@
+import sys
+from contextlib import contextmanager
+
 from .utils import file_filters
 from .event_id import EventID
 
@@ -8,6 +11,17 @@ from gwdc_python.helpers import JobStatus
 logger = create_logger(__name__)
 
 
+def _event_id_string(event_id):
+    # The Event ID of a job is sent to the server by its name, where an empty string removes it
+    if isinstance(event_id, EventID):
+        return event_id.event_id
+    elif isinstance(event_id, str):
+        return event_id
+    elif event_id is None:
+        return ''
+    raise Exception('Parameter event_id must be an EventID, a string or None')
+
+
 class BilbyJob(GWDCObjectBase):
     """
     BilbyJob class is useful for interacting with the Bilby jobs returned from a call to the GWCloud API.
@@ -25,15 +39,22 @@ class BilbyJob(GWDCObjectBase):
         Job description
     user : str
         User that ran the job
-    event_id : dict
-        Event ID associated with job, should have keys corresponding to an
-        :class:`~.EventID` object
+    event_id : dict or ~.EventID
+        Event ID associated with job, either an :class:`~.EventID` or a dict
+        with keys corresponding to an :class:`~.EventID` object
     job_status : dict
         Status of job, should have 'name' and 'date' keys corresponding to the status code and when it was produced
     kwargs : dict, optional
         Extra arguments, stored in `other` attribute
     """
 
+    # Large result sets can contain tens of thousands of jobs, so the job fields are stored in slots rather than the
+    # instance dict. GWDCObjectBase doesn't define __slots__, so every job still has an instance dict, but the
+    # attributes it sets are included here so that the dict is left empty
+    __slots__ = (
+        'client', 'id', 'type', 'name', 'description', 'user', 'event_id', '_status', '_other', '_edit_snapshot'
+    )
+
     FILE_LIST_FILTERS = {
         'default': file_filters.default_filter,
         'config': file_filters.config_filter,
@@ -42,18 +63,127 @@ class BilbyJob(GWDCObjectBase):
         'result_json': file_filters.result_json_filter
     }
 
+    # Attributes which are obtained from GWCloud when a lazily created job is first used
+    _LAZY_ATTRIBUTES = frozenset({'name', 'description', 'user', 'event_id', '_status', '_other'})
+
     def __init__(self, client, job_id, name, description, user, event_id, job_status, **kwargs):
         super().__init__(client, job_id)
-        self.name = name
-        self.description = description
-        self.user = user
-        self.status = JobStatus(status=job_status['name'], date=job_status['date'])
-        self.event_id = EventID(**event_id) if event_id else None
-        self.other = kwargs
+        self._edit_snapshot = None
+        for attribute, value in self._values(name, description, user, event_id, job_status, **kwargs).items():
+            setattr(self, attribute, value)
+
+    @classmethod
+    def _lazy(cls, client, job_id):
+        """Create a BilbyJob that only holds its ID. The rest of the job information is obtained from GWCloud
+        when any of it is first accessed, or when the job is passed to
+        :meth:`~gwcloud_python.gwcloud.GWCloud.hydrate_jobs`
+
+        Parameters
+        ----------
+        client : ~gwcloud_python.gwcloud.GWCloud
+            A reference to the GWCloud object instance used to obtain the job information
+        job_id : str
+            The id of the Bilby job
+
+        Returns
+        -------
+        BilbyJob
+        """
+        job = cls.__new__(cls)
+        GWDCObjectBase.__init__(job, client, job_id)
+        job._edit_snapshot = None
+        return job
+
+    @staticmethod
+    def _values(name, description, user, event_id, job_status, **kwargs):
+        return {
+            'name': name,
+            'description': description,
+            'user': sys.intern(user) if isinstance(user, str) else user,
+            '_status': (sys.intern(job_status['name']), job_status['date']),
+            'event_id': EventID(**event_id) if isinstance(event_id, dict) else event_id or None,
+            '_other': kwargs or None,
+        }
+
+    def _populate(self, job_data):
+        """Set the job information of a lazily created job
+
+        Parameters
+        ----------
+        job_data : dict
+            Job information, with keys corresponding to the arguments of :class:`BilbyJob`, excluding the client and
+            job_id
+        """
+        # Attributes which were set on a lazily created job before it was loaded are kept
+        for attribute, value in self._values(**job_data).items():
+            if not self._has_attribute(attribute):
+                setattr(self, attribute, value)
+
+    def _has_attribute(self, attribute):
+        try:
+            object.__getattribute__(self, attribute)
+        except AttributeError:
+            return False
+        return True
+
+    @property
+    def loaded(self):
+        """True if the job information has been obtained from GWCloud. Only jobs which were created lazily,
+        such as those returned when a job is submitted or uploaded, start out unloaded
+
+        Returns
+        -------
+        bool
+        """
+        return self._has_attribute('_status')
+
+    def __getattr__(self, attribute):
+        # Only called when an attribute has not been set, which for the job information means that it is lazily loaded
+        if attribute not in BilbyJob._LAZY_ATTRIBUTES:
+            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{attribute}'")
+        self.client.hydrate_jobs([self])
+        return object.__getattribute__(self, attribute)
 
     def __repr__(self):
+        if not self.loaded:
+            return super().__repr__()
         return f"{self.__class__.__name__}(name={self.name}), user={self.user}"
 
+    def __hash__(self):
+        # Consistent with the equality check of GWDCObjectBase, so that jobs can be used as dictionary keys
+        return hash((self.id, self.type))
+
+    @property
+    def status(self):
+        """Status of the job
+
+        Returns
+        -------
+        ~gwdc_python.helpers.JobStatus
+            The status name and the date when this status began
+        """
+        return JobStatus(status=self._status[0], date=self._status[1])
+
+    @status.setter
+    def status(self, status):
+        self._status = (sys.intern(status.status), status.date)
+
+    @property
+    def other(self):
+        """Extra job information that was provided when the job was created
+
+        Returns
+        -------
+        dict
+        """
+        if self._other is None:
+            self._other = {}
+        return self._other
+
+    @other.setter
+    def other(self, other):
+        self._other = other
+
     def _update_job(self, **kwargs):
         query = """
             mutation BilbyJobEventIDMutation($input: UpdateBilbyJobMutationInput!) {
@@ -72,6 +202,68 @@ class BilbyJob(GWDCObjectBase):
 
         return self.client.request(query=query, variables=variables)
 
+    def _editable_state(self):
+        return {'name': self.name, 'description': self.description, 'event_id': self.event_id}
+
+    @contextmanager
+    def edit(self):
+        """Edit the name, description and Event ID of a Bilby Job in a single request.
+        Within the edit session, changes made with :meth:`set_name`, :meth:`set_description` and :meth:`set_event_id`,
+        or by assigning the attributes directly, are only made locally. When the session ends, all of the changes
+        are sent together. As with :meth:`set_event_id`, the Event ID may be assigned as an EventID, its name, or None
+        to remove it. If the request fails, or an exception is raised within the session, the attributes are restored
+        to their values from before the session
+
+        Yields
+        ------
+        BilbyJob
+            This job
+
+        Examples
+        --------
+        >>> with job.edit():
+        ...     job.set_name('GW150914_release')
+        ...     job.set_description('Rerun with new calibration')
+        ...     job.set_event_id(event_id)
+        """
+        if self._edit_snapshot is not None:
+            # Nested sessions are part of the outer session, which sends the changes
+            yield self
+            return
+
+        snapshot = self._edit_snapshot = self._editable_state()
+        try:
+            yield self
+
+            changes = {}
+            if self.name != snapshot['name']:
+                changes['name'] = str(self.name)
+            if self.description != snapshot['description']:
+                changes['description'] = str(self.description)
+            new_event_id = _event_id_string(self.event_id)
+            if new_event_id != _event_id_string(snapshot['event_id']):
+                changes['event_id'] = new_event_id
+
+            if changes:
+                data = self._update_job(**changes)
+                logger.info(data['update_bilby_job']['result'])
+        except BaseException:
+            for attribute, value in snapshot.items():
+                setattr(self, attribute, value)
+            raise
+        finally:
+            self._edit_snapshot = None
+
+        if isinstance(self.event_id, str):
+            # An Event ID assigned directly by its name is obtained once the job has been updated, as in set_event_id
+            self.event_id = self.client.get_event_id(event_id=self.event_id) if self.event_id else None
+
+    def _save(self, **kwargs):
+        # Within an edit session, changes are sent when the session ends
+        if self._edit_snapshot is None:
+            data = self._update_job(**kwargs)
+            logger.info(data['update_bilby_job']['result'])
+
     def set_name(self, name):
         """Set the name of a Bilby Job
 
@@ -81,9 +273,8 @@ class BilbyJob(GWDCObjectBase):
             The new name
         """
 
-        data = self._update_job(name=str(name))
+        self._save(name=str(name))
         self.name = name
-        logger.info(data['update_bilby_job']['result'])
 
     def set_description(self, description):
         """Set the description of a Bilby Job
@@ -94,9 +285,8 @@ class BilbyJob(GWDCObjectBase):
             The new description
         """
 
-        data = self._update_job(description=str(description))
+        self._save(description=str(description))
         self.description = description
-        logger.info(data['update_bilby_job']['result'])
 
     def set_event_id(self, event_id=None):
         """Set the Event ID of a Bilby Job
@@ -107,15 +297,10 @@ class BilbyJob(GWDCObjectBase):
             The desired Event ID, by default None
         """
 
+        new_event_id = _event_id_string(event_id)
+        self._save(event_id=new_event_id)
         if isinstance(event_id, EventID):
-            new_event_id = event_id.event_id
-        elif isinstance(event_id, str):
-            new_event_id = event_id
-        elif event_id is None:
-            new_event_id = ''
+            # The EventID is already known, so it doesn't need to be obtained again
+            self.event_id = event_id
         else:
-            raise Exception('Parameter event_id must be an EventID, a string or None')
-
-        data = self._update_job(event_id=new_event_id)
-        self.event_id = self.client.get_event_id(event_id=new_event_id)
-        logger.info(data['update_bilby_job']['result'])
+            self.event_id = self.client.get_event_id(event_id=new_event_id) if new_event_id else None
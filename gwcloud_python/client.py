@@ -0,0 +1,357 @@
+import gzip
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from copy import deepcopy
+
+import requests
+from requests.adapters import HTTPAdapter
+from humps import camelize, decamelize
+from gwdc_python import GWDC
+from gwdc_python.exceptions import GWDCUnknownException
+from gwdc_python.utils import split_variables_dict
+from gwdc_python.logger import create_logger
+
+from .utils.graphql import query_hash, parse_operation
+from .utils.single_flight import SingleFlight
+from .utils.multipart import MultipartStream, tqdm_progress
+from .settings import (
+    GWCLOUD_CONNECT_TIMEOUT,
+    GWCLOUD_READ_TIMEOUT,
+    GWCLOUD_UPLOAD_READ_TIMEOUT,
+    GWCLOUD_MAX_RETRIES,
+    GWCLOUD_RETRY_BACKOFF,
+    GWCLOUD_IDEMPOTENT_MUTATIONS,
+    GWCLOUD_POOL_SIZE,
+    GWCLOUD_COMPRESSION_THRESHOLD,
+    GWCLOUD_COALESCE_REQUESTS
+)
+
+logger = create_logger(__name__)
+
+PERSISTED_QUERY_NOT_FOUND = "PersistedQueryNotFound"
+PERSISTED_QUERY_NOT_SUPPORTED = "PersistedQueryNotSupported"
+
+# HTTP status codes indicating a temporary failure, after which a request may be retried
+RETRY_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+
+def _file_positions(files):
+    """Get the position of each file to be uploaded, so that they can be sent again, or None if any can't be rewound"""
+    try:
+        if all(f.seekable() for _, f in files.values()):
+            return [f.tell() for _, f in files.values()]
+    except (AttributeError, OSError, ValueError):
+        pass
+    return None
+
+
+def _persisted_query_error(content):
+    for error in content.get("errors") or []:
+        code = (error.get("extensions") or {}).get("code")
+        if error.get("message") == PERSISTED_QUERY_NOT_FOUND or code == "PERSISTED_QUERY_NOT_FOUND":
+            return PERSISTED_QUERY_NOT_FOUND
+        if error.get("message") == PERSISTED_QUERY_NOT_SUPPORTED or code == "PERSISTED_QUERY_NOT_SUPPORTED":
+            return PERSISTED_QUERY_NOT_SUPPORTED
+    return None
+
+
+class GWCloudClient(GWDC):
+    """
+    GWCloudClient extends the GWDC client with the transport features used by GWCloud.
+
+    Parameters
+    ----------
+    token : str
+        API token for a Bilby user
+    endpoint : str
+        URL to which we send the queries
+    custom_error_handler : function, optional
+        Function used to wrap the request method, by default None
+    persisted_queries : bool, optional
+        If True, queries are first sent as a hash of the query document, and the full document is only sent if the
+        server has not seen the hash before, by default False
+    stats : ~gwcloud_python.utils.instrumentation.RequestStats, optional
+        If provided, every request is recorded in these stats, by default None
+    timeout : float or tuple, optional
+        Timeout in seconds for each request, or a (connect, read) tuple of timeouts,
+        by default (GWCLOUD_CONNECT_TIMEOUT, GWCLOUD_READ_TIMEOUT)
+    upload_timeout : float or tuple, optional
+        Timeout in seconds for each request uploading files, or a (connect, read) tuple of timeouts, where a read
+        timeout of None waits for the server to respond however long it takes,
+        by default (GWCLOUD_CONNECT_TIMEOUT, GWCLOUD_UPLOAD_READ_TIMEOUT)
+    max_retries : int, optional
+        Number of times a query is retried after a connection error, timeout or temporary server error,
+        by default GWCLOUD_MAX_RETRIES
+    retry_backoff : float, optional
+        Delay in seconds before the first retry, which doubles with each further retry, by default GWCLOUD_RETRY_BACKOFF
+    idempotent_mutations : iterable, optional
+        Names of the mutations which may be retried like queries, by default GWCLOUD_IDEMPOTENT_MUTATIONS
+    pool_size : int, optional
+        Maximum number of connections kept open to the endpoint, by default GWCLOUD_POOL_SIZE
+    compression_threshold : int, optional
+        Request bodies larger than this many bytes are gzip compressed. If None, requests are never compressed,
+        by default GWCLOUD_COMPRESSION_THRESHOLD
+    coalesce_requests : bool, optional
+        If True, identical queries made concurrently from several threads share a single request, and each caller
+        receives its own copy of the result, by default GWCLOUD_COALESCE_REQUESTS
+    upload_progress : function, optional
+        Called with the number of bytes sent so far and the total number of bytes, which may be None if unknown,
+        as files are uploaded. If None, a progress bar is displayed, by default None
+    """
+
+    def __init__(self, token, endpoint, custom_error_handler=None, persisted_queries=False, stats=None,
+                 timeout=(GWCLOUD_CONNECT_TIMEOUT, GWCLOUD_READ_TIMEOUT),
+                 upload_timeout=(GWCLOUD_CONNECT_TIMEOUT, GWCLOUD_UPLOAD_READ_TIMEOUT), max_retries=GWCLOUD_MAX_RETRIES,
+                 retry_backoff=GWCLOUD_RETRY_BACKOFF, idempotent_mutations=GWCLOUD_IDEMPOTENT_MUTATIONS,
+                 pool_size=GWCLOUD_POOL_SIZE, compression_threshold=GWCLOUD_COMPRESSION_THRESHOLD,
+                 coalesce_requests=GWCLOUD_COALESCE_REQUESTS, upload_progress=None):
+        # These must be set before initialising GWDC, as it makes a request to check the API token
+        self.persisted_queries = persisted_queries
+        self.stats = stats
+        self.timeout = timeout
+        self.upload_timeout = upload_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.idempotent_mutations = frozenset(idempotent_mutations)
+        self.compression_threshold = compression_threshold
+        self.coalesce_requests = coalesce_requests
+        self._in_flight = SingleFlight()
+        self.upload_progress = upload_progress
+        self._local = threading.local()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        super().__init__(token=token, endpoint=endpoint, custom_error_handler=custom_error_handler)
+        if custom_error_handler:
+            self.request_partial = custom_error_handler(self.request_partial)
+
+    def request_partial(self, query, variables=None, headers=None, authorize=True):
+        """Make a request in the same way as :meth:`request`, but return any data alongside the errors instead of
+        raising an exception for the first error. This allows the successful fields of a request to be used even
+        if other fields failed
+
+        Parameters
+        ----------
+        query : str
+            GraphQL query document
+        variables : dict, optional
+            Variables of the query, by default None
+        headers : dict, optional
+            Extra headers to send with the request, by default None
+        authorize : bool, optional
+            If True, the request is authorised with the API token, by default True
+
+        Returns
+        -------
+        tuple
+            The data returned by the request, which may be None, and the list of GraphQL errors
+        """
+        all_headers = {}
+        if authorize:
+            if self.api_token:
+                all_headers = {"Authorization": self.api_token}
+            elif self.public_id:
+                all_headers = {"X-Correlation-ID": f"{self.public_id} {self.session_id}"}
+
+        return self._request(
+            endpoint=self.endpoint,
+            query=query,
+            variables=variables,
+            headers={**all_headers, **(headers or {})},
+            partial=True
+        )
+
+    @contextmanager
+    def reporting_progress(self, progress):
+        """Report the progress of the uploads made by the current thread to a different callback, such as when a file
+        is uploaded as several requests and its progress is reported as a whole
+
+        Parameters
+        ----------
+        progress : function
+            Called with the number of bytes sent so far and the total number of bytes of each upload request
+        """
+        previous = getattr(self._local, "upload_progress", None)
+        self._local.upload_progress = progress
+        try:
+            yield
+        finally:
+            self._local.upload_progress = previous
+
+    def _is_retryable(self, query):
+        operation_type, name = parse_operation(query)
+        return operation_type == "query" or name in self.idempotent_mutations
+
+    def _request(self, endpoint, query, variables=None, headers=None, method="POST", partial=False):
+        if not self.coalesce_requests or parse_operation(query)[0] != "query":
+            return self._recorded_request(endpoint, query, variables, headers, method, partial)
+
+        # The headers are part of the key, as the same query may return different data for different users
+        key = (
+            endpoint,
+            query,
+            json.dumps(variables or {}, sort_keys=True, default=str),
+            json.dumps(headers or {}, sort_keys=True),
+            partial,
+        )
+        data = self._in_flight.do(
+            key,
+            lambda: self._recorded_request(endpoint, query, variables, headers, method, partial)
+        )
+        return deepcopy(data)
+
+    def _recorded_request(self, endpoint, query, variables, headers, method, partial=False):
+        if self.stats is None:
+            return self._perform_request(endpoint, query, variables, headers, method, partial=partial)
+
+        metrics = {"request_bytes": 0, "response_bytes": 0, "retries": 0}
+        start = time.perf_counter()
+        error = True
+        try:
+            data = self._perform_request(endpoint, query, variables, headers, method, partial, metrics)
+            error = False
+            return data
+        finally:
+            self.stats.record(parse_operation(query)[1], time.perf_counter() - start, error=error, **metrics)
+
+    def _perform_request(self, endpoint, query, variables, headers, method, partial=False, metrics=None):
+        camelized_variables = camelize(variables or {})
+        nulled_variables, files, _ = split_variables_dict(camelized_variables)
+        if files:
+            # Multipart requests always include the full document alongside the files
+            operations = {"query": query, "variables": nulled_variables, "operationName": parse_operation(query)[1]}
+            retry = self._is_retryable(query)
+            content = self._send_multipart(endpoint, operations, files, headers or {}, method, retry, metrics)
+            return self._result(content, partial)
+
+        payload = {"query": query, "variables": camelized_variables}
+        if self.persisted_queries:
+            payload = {
+                "variables": camelized_variables,
+                "extensions": {
+                    "persistedQuery": {
+                        "version": 1,
+                        "sha256Hash": query_hash(query),
+                    }
+                }
+            }
+
+        retry = self._is_retryable(query)
+        content = self._send(endpoint, payload, headers or {}, method, retry, metrics)
+
+        error = _persisted_query_error(content)
+        if error:
+            if error == PERSISTED_QUERY_NOT_SUPPORTED:
+                logger.info("The server does not support persisted queries, full queries will be sent instead.")
+                self.persisted_queries = False
+                payload.pop("extensions")
+
+            payload["query"] = query
+            content = self._send(endpoint, payload, headers or {}, method, retry, metrics)
+
+        return self._result(content, partial)
+
+    def _result(self, content, partial):
+        errors = content.get("errors", None)
+        if partial:
+            return decamelize(content.get("data", None)), errors or []
+        if errors:
+            raise GWDCUnknownException(errors[0].get("message"), extensions=errors[0].get("extensions"))
+        return decamelize(content.get("data", None))
+
+    def _send_multipart(self, endpoint, operations, files, headers, method, retry=False, metrics=None):
+        # The files are streamed as the request is sent, so they can only be sent again if they can be rewound
+        positions = _file_positions(files) if retry else None
+        progress = getattr(self._local, "upload_progress", None) or self.upload_progress or tqdm_progress()
+
+        attempts = self.max_retries + 1 if positions is not None else 1
+        for attempt in range(attempts):
+            if attempt:
+                self._wait_before_retry(attempt, metrics)
+                for (_, f), position in zip(files.values(), positions):
+                    f.seek(position)
+
+            final = attempt == attempts - 1
+            stream = MultipartStream(operations, files, progress=progress)
+            try:
+                # Requests with an unknown size are sent with chunked transfer encoding. A WSGI server may read these as
+                # empty, so the job archives are always uploaded with a known size
+                response = self.session.request(
+                    method=method,
+                    url=endpoint,
+                    headers={**headers, "Content-Type": stream.content_type},
+                    data=stream if stream.size is not None else iter(stream),
+                    timeout=self.upload_timeout
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if final:
+                    raise
+                logger.warning(f"Request failed ({e}), retrying...")
+                continue
+            finally:
+                if metrics is not None:
+                    metrics["request_bytes"] += stream.bytes_sent
+
+            if metrics is not None:
+                metrics["response_bytes"] += len(response.content)
+
+            if response.status_code in RETRY_STATUS_CODES:
+                if final:
+                    response.raise_for_status()
+                logger.warning(f"Request failed with status {response.status_code}, retrying...")
+                continue
+
+            return json.loads(response.content)
+
+    def _wait_before_retry(self, attempt, metrics=None):
+        # Exponential backoff with jitter, so that many clients don't retry in lockstep
+        time.sleep(self.retry_backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1))
+        if metrics is not None:
+            metrics["retries"] += 1
+
+    def _send(self, endpoint, payload, headers, method, retry=False, metrics=None):
+        body = json.dumps(payload).encode("utf-8")
+        headers = {**headers, "Content-Type": "application/json"}
+        if self.compression_threshold is not None and len(body) > self.compression_threshold:
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+
+        attempts = self.max_retries + 1 if retry else 1
+        for attempt in range(attempts):
+            if attempt:
+                self._wait_before_retry(attempt, metrics)
+
+            if metrics is not None:
+                metrics["request_bytes"] += len(body)
+
+            final = attempt == attempts - 1
+            try:
+                response = self.session.request(
+                    method=method,
+                    url=endpoint,
+                    headers=headers,
+                    data=body,
+                    timeout=self.timeout
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if final:
+                    raise
+                logger.warning(f"Request failed ({e}), retrying...")
+                continue
+
+            if metrics is not None:
+                metrics["response_bytes"] += len(response.content)
+
+            if response.status_code in RETRY_STATUS_CODES:
+                if final:
+                    response.raise_for_status()
+                logger.warning(f"Request failed with status {response.status_code}, retrying...")
+                continue
+
+            return json.loads(response.content)
@@ -1,6 +1,18 @@
-from dataclasses import dataclass
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, fields
+from threading import RLock
 
 
+def _slotted(cls):
+    """Recreate a dataclass with __slots__ for each of its fields, avoiding a per-instance dict"""
+    field_names = tuple(f.name for f in fields(cls))
+    excluded = field_names + ('__dict__', '__weakref__')
+    cls_dict = {key: value for key, value in cls.__dict__.items() if key not in excluded}
+    cls_dict['__slots__'] = field_names
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+
+@_slotted
 @dataclass
 class EventID:
     """Object used to help with abstraction of Event IDs. Currently a glorified dictionary."""
@@ -9,3 +21,238 @@ class EventID:
     nickname: str = None
     is_ligo_event: bool = False
     gps_time: float = None
+
+
+_EVENT_ID_FIELDS = tuple(f.name for f in fields(EventID))
+
+_TRUE_STRINGS = frozenset({'true', 't', 'yes', 'y', '1'})
+
+
+def _event_id_record(record):
+    """Get the Event ID fields provided by a record, such as a row read from a CSV file with :class:`csv.DictReader`.
+    Empty cells, which are read as empty strings or None, are left out so that they do not change the current values,
+    and string GPS times and LIGO event flags are converted. Fields of an :class:`.EventID` which are None are left out
+    in the same way
+
+    Parameters
+    ----------
+    record : dict or .EventID
+        Event ID information, with keys corresponding to the fields of an :class:`.EventID`
+
+    Returns
+    -------
+    dict
+        Dictionary containing only the Event ID fields present in the record
+    """
+    if isinstance(record, EventID):
+        # GWCloud leaves fields which are None unchanged, so they must not replace the current values locally either
+        values = {name: getattr(record, name) for name in _EVENT_ID_FIELDS}
+        return {name: value for name, value in values.items() if value is not None}
+
+    unknown = set(record) - set(_EVENT_ID_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown Event ID fields {', '.join(sorted(unknown))}")
+
+    values = {name: value for name, value in record.items() if value is not None and value != ''}
+    if isinstance(values.get('gps_time'), str):
+        values['gps_time'] = float(values['gps_time'])
+    if isinstance(values.get('is_ligo_event'), str):
+        values['is_ligo_event'] = values['is_ligo_event'].strip().lower() in _TRUE_STRINGS
+    if not values.get('event_id'):
+        raise ValueError("Every Event ID record must have an event_id")
+    return values
+
+
+class EventIDRegistry:
+    """
+    Client side registry of Event IDs, which ensures that only one :class:`.EventID` instance exists for each event.
+    Event IDs can be looked up by their event id, trigger id or nickname, and queried by GPS time.
+
+    The registry is filled as Event IDs are returned from GWCloud, and can be loaded with every Event ID
+    in a single request using :meth:`load`. Once loaded, :meth:`~gwcloud_python.gwcloud.GWCloud.get_event_id`
+    will be answered from the registry instead of making a request.
+
+    Parameters
+    ----------
+    client : ~gwcloud_python.gwcloud.GWCloud
+        A reference to the GWCloud object instance used to load the Event IDs
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.loaded = False
+        self._lock = RLock()
+        self._by_event_id = {}
+        self._by_trigger_id = {}
+        self._by_nickname = {}
+        self._gps_index = None
+
+    def __len__(self):
+        return len(self._by_event_id)
+
+    def __contains__(self, event_id):
+        return getattr(event_id, 'event_id', event_id) in self._by_event_id
+
+    def __iter__(self):
+        return iter(list(self._by_event_id.values()))
+
+    def load(self):
+        """Obtain all Event IDs from GWCloud and store them in the registry, replacing any existing contents
+
+        Returns
+        -------
+        EventIDRegistry
+            This registry, to allow chaining
+        """
+        self.client.get_all_event_ids()
+        return self
+
+    def _index(self, event):
+        if event.trigger_id:
+            self._by_trigger_id[event.trigger_id] = event
+        if event.nickname:
+            self._by_nickname[event.nickname] = event
+        self._gps_index = None
+
+    def _unindex(self, event):
+        if self._by_trigger_id.get(event.trigger_id) is event:
+            del self._by_trigger_id[event.trigger_id]
+        if self._by_nickname.get(event.nickname) is event:
+            del self._by_nickname[event.nickname]
+        self._gps_index = None
+
+    def intern(self, event_data):
+        """Get the shared :class:`.EventID` instance for an event, creating it if it is not yet in the registry.
+        If the event is already registered, the existing instance is updated with the provided values.
+
+        Parameters
+        ----------
+        event_data : dict or .EventID or None
+            Event ID information, with keys corresponding to the fields of an :class:`.EventID`
+
+        Returns
+        -------
+        .EventID or None
+            The shared instance for the event, or None if no event data was provided
+        """
+        if not event_data:
+            return None
+
+        if isinstance(event_data, EventID):
+            event_data = {name: getattr(event_data, name) for name in _EVENT_ID_FIELDS}
+
+        with self._lock:
+            event = self._by_event_id.get(event_data['event_id'])
+            if event is None:
+                event = EventID(**event_data)
+                self._by_event_id[event.event_id] = event
+            else:
+                self._unindex(event)
+                for name, value in event_data.items():
+                    setattr(event, name, value)
+            self._index(event)
+            return event
+
+    def discard(self, event_id):
+        """Remove an Event ID from the registry, if present
+
+        Parameters
+        ----------
+        event_id : .EventID or str
+            The Event ID to remove
+        """
+        with self._lock:
+            event = self._by_event_id.pop(getattr(event_id, 'event_id', event_id), None)
+            if event is not None:
+                self._unindex(event)
+
+    def _sync(self, all_event_data):
+        """Replace the contents of the registry with a complete list of Event IDs, keeping existing instances
+
+        Parameters
+        ----------
+        all_event_data : list
+            Event ID information for every Event ID
+
+        Returns
+        -------
+        list
+            List of the shared EventID instances
+        """
+        with self._lock:
+            events = [self.intern(event_data) for event_data in all_event_data]
+            for event_id in set(self._by_event_id) - {event.event_id for event in events}:
+                self.discard(event_id)
+            self.loaded = True
+            return events
+
+    def get(self, event_id):
+        """Get an Event ID from the registry by its event id
+
+        Parameters
+        ----------
+        event_id : str
+            Event ID of the form GW123456_123456
+
+        Returns
+        -------
+        .EventID or None
+            The registered Event ID, or None if it is not in the registry
+        """
+        return self._by_event_id.get(event_id)
+
+    def get_by_trigger_id(self, trigger_id):
+        """Get an Event ID from the registry by its trigger id
+
+        Parameters
+        ----------
+        trigger_id : str
+            Trigger ID of the form S123456a
+
+        Returns
+        -------
+        .EventID or None
+            The registered Event ID, or None if it is not in the registry
+        """
+        return self._by_trigger_id.get(trigger_id)
+
+    def get_by_nickname(self, nickname):
+        """Get an Event ID from the registry by its nickname
+
+        Parameters
+        ----------
+        nickname : str
+            Common name used to identify the event
+
+        Returns
+        -------
+        .EventID or None
+            The registered Event ID, or None if it is not in the registry
+        """
+        return self._by_nickname.get(nickname)
+
+    def between(self, start, end):
+        """Get all registered Event IDs with a GPS time in the closed interval [start, end]
+
+        Parameters
+        ----------
+        start : float
+            GPS time at the start of the range
+        end : float
+            GPS time at the end of the range
+
+        Returns
+        -------
+        list
+            List of Event IDs in the time range, sorted by GPS time
+        """
+        with self._lock:
+            if self._gps_index is None:
+                events = sorted(
+                    (event for event in self._by_event_id.values() if event.gps_time is not None),
+                    key=lambda event: event.gps_time
+                )
+                self._gps_index = ([event.gps_time for event in events], events)
+            gps_times, events = self._gps_index
+
+        return events[bisect_left(gps_times, start):bisect_right(gps_times, end)]
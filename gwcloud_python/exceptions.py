@@ -24,6 +24,27 @@ Alternatively, head straight to https://gwcloud.org.au/api-token/ to create one.
         )
 
 
+class EventIDUpsertError(Exception):
+    """Raised when some of the changes made by :meth:`~gwcloud_python.gwcloud.GWCloud.upsert_event_ids` fail.
+    The successful changes are still applied
+
+    Attributes
+    ----------
+    event_ids : list
+        The Event IDs that were successfully created or updated
+    errors : dict
+        Dictionary mapping the event id of each failed change to its error message
+    """
+
+    def __init__(self, event_ids, errors):
+        self.event_ids = event_ids
+        self.errors = errors
+        super().__init__(
+            f"Failed to change {len(errors)} Event IDs: "
+            + ", ".join(f"{event_id} ({message})" for event_id, message in errors.items())
+        )
+
+
 def custom_error_handler(f):
     @functools.wraps(f)
     def wrapper(*args, **kwargs):
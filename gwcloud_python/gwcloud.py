@@ -1,26 +1,69 @@
 import os
-import tarfile
+import threading
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 import itertools
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import ExitStack
 
-from gwdc_python import GWDC
 from gwdc_python.files import FileReference, FileReferenceList
 from gwdc_python.helpers import TimeRange, Cluster
 from gwdc_python.utils import rename_dict_keys
 from gwdc_python.logger import create_logger
 
 from .bilby_job import BilbyJob
-from .event_id import EventID
-from .exceptions import custom_error_handler
+from .client import GWCloudClient
+from .job_table import JobTable
+from .utils.instrumentation import RequestStats
+from .event_id import EventID, EventIDRegistry, _EVENT_ID_FIELDS, _event_id_record
+from .exceptions import custom_error_handler, EventIDUpsertError
 from .utils.file_download import _download_files, _save_file_map_fn, _get_file_map_fn
-from .utils.file_upload import check_file
-from .settings import GWCLOUD_ENDPOINT
+from .utils.file_upload import group_supporting_files, batch_supporting_files
+from .utils.archive import (
+    write_job_archive,
+    spool_job_archive,
+    archive_extension,
+    archive_fingerprint,
+    job_directory_fingerprint,
+    ArchiveFingerprint
+)
+from .utils.chunked_upload import FilePart, UploadJournal, UploadProgress, part_ranges
+from .utils.multipart import tqdm_progress
+from .utils.upload_token import UploadTokenCache
+from .utils.upload_ledger import UploadLedger
+from .utils.graphql import batched_operation, batched_variables, batched_results, chunked
+from .utils.job_watcher import _watch_job_statuses
+from .settings import (
+    GWCLOUD_ENDPOINT,
+    GWCLOUD_PERSISTED_QUERIES,
+    GWCLOUD_BATCH_SIZE,
+    GWCLOUD_WATCH_MIN_INTERVAL,
+    GWCLOUD_WATCH_MAX_INTERVAL,
+    GWCLOUD_WATCH_BACKOFF,
+    GWCLOUD_CONNECT_TIMEOUT,
+    GWCLOUD_READ_TIMEOUT,
+    GWCLOUD_UPLOAD_READ_TIMEOUT,
+    GWCLOUD_MAX_RETRIES,
+    GWCLOUD_RETRY_BACKOFF,
+    GWCLOUD_COMPRESSION_THRESHOLD,
+    GWCLOUD_COALESCE_REQUESTS,
+    GWCLOUD_ARCHIVE_CODEC,
+    GWCLOUD_ARCHIVE_THREADS,
+    GWCLOUD_UPLOAD_PART_SIZE,
+    GWCLOUD_UPLOAD_WORKERS,
+    GWCLOUD_UPLOAD_JOURNAL_SUFFIX,
+    GWCLOUD_SUPPORTING_FILES_BATCH_BYTES,
+    GWCLOUD_SUPPORTING_FILES_BATCH_FILES,
+    GWCLOUD_UPLOAD_LEDGER
+)
 
 logger = create_logger(__name__)
 
 
+def _no_progress(bytes_sent, total):
+    pass
+
+
 class GWCloud:
     """
     GWCloud class provides an API for interacting with Bilby, allowing jobs to be submitted and acquired.
@@ -31,36 +74,123 @@ class GWCloud:
         API token for a Bilby user. If omitted, creates an anonymous read-only GWCloud instance
     endpoint : str, optional
         URL to which we send the queries, by default GWCLOUD_ENDPOINT
+    persisted_queries : bool, optional
+        If True, send queries as a hash of the query document, falling back to the full document if the server
+        has not seen it before, by default GWCLOUD_PERSISTED_QUERIES
+    instrument : bool, optional
+        If True, record the latency, size, retries and errors of every request in :attr:`request_stats`,
+        by default False
+    timeout : float or tuple, optional
+        Timeout in seconds for each request, or a (connect, read) tuple of timeouts,
+        by default (GWCLOUD_CONNECT_TIMEOUT, GWCLOUD_READ_TIMEOUT)
+    upload_timeout : float or tuple, optional
+        Timeout in seconds for each request uploading files, or a (connect, read) tuple of timeouts. Uploads are not
+        retried, so by default there is no read timeout, and the server is given as long as it needs to create the
+        job, by default (GWCLOUD_CONNECT_TIMEOUT, GWCLOUD_UPLOAD_READ_TIMEOUT)
+    max_retries : int, optional
+        Number of times a query is retried after a connection error, timeout or temporary server error. Mutations
+        are only retried if they are known to be idempotent, by default GWCLOUD_MAX_RETRIES
+    retry_backoff : float, optional
+        Delay in seconds before the first retry, which doubles with each further retry, by default GWCLOUD_RETRY_BACKOFF
+    compression_threshold : int, optional
+        Request bodies larger than this many bytes are gzip compressed. If None, requests are never compressed,
+        by default GWCLOUD_COMPRESSION_THRESHOLD
+    coalesce_requests : bool, optional
+        If True, identical queries made concurrently from several threads share a single request,
+        by default GWCLOUD_COALESCE_REQUESTS
+    upload_progress : function, optional
+        Called with the number of bytes sent so far and the total number of bytes, which may be None if unknown,
+        as files are uploaded. If None, a progress bar is displayed, by default None
+    upload_ledger : str or ~pathlib.Path, optional
+        Path to a local ledger of uploaded jobs. If given, the content of each job archive or directory is
+        fingerprinted before it is uploaded, and if the same content has already been uploaded with the same
+        description and visibility, the existing job is returned instead. If None, content is always uploaded,
+        by default GWCLOUD_UPLOAD_LEDGER
 
     Attributes
     ----------
-    client : GWDC
+    client : ~gwcloud_python.client.GWCloudClient
         Handles a lot of the underlying logic surrounding the queries
+    event_ids : ~gwcloud_python.event_id.EventIDRegistry
+        Registry of the Event IDs seen by this instance, shared between all jobs that reference the same event
+    upload_ledger : ~gwcloud_python.utils.upload_ledger.UploadLedger or None
+        Ledger of the jobs uploaded by this instance, if enabled
     """
 
-    def __init__(self, token="", endpoint=GWCLOUD_ENDPOINT):
-        self.client = GWDC(
+    def __init__(self, token="", endpoint=GWCLOUD_ENDPOINT, persisted_queries=GWCLOUD_PERSISTED_QUERIES,
+                 instrument=False, timeout=(GWCLOUD_CONNECT_TIMEOUT, GWCLOUD_READ_TIMEOUT),
+                 upload_timeout=(GWCLOUD_CONNECT_TIMEOUT, GWCLOUD_UPLOAD_READ_TIMEOUT), max_retries=GWCLOUD_MAX_RETRIES,
+                 retry_backoff=GWCLOUD_RETRY_BACKOFF,
+                 compression_threshold=GWCLOUD_COMPRESSION_THRESHOLD, coalesce_requests=GWCLOUD_COALESCE_REQUESTS,
+                 upload_progress=None, upload_ledger=GWCLOUD_UPLOAD_LEDGER):
+        self.client = GWCloudClient(
             token=token,
             endpoint=endpoint,
             custom_error_handler=custom_error_handler,
+            persisted_queries=persisted_queries,
+            stats=RequestStats() if instrument else None,
+            timeout=timeout,
+            upload_timeout=upload_timeout,
+            max_retries=max_retries,
+            retry_backoff=retry_backoff,
+            compression_threshold=compression_threshold,
+            coalesce_requests=coalesce_requests,
+            upload_progress=upload_progress,
         )
         self.request = self.client.request  # Setting shorthand for simplicity
+        self.event_ids = EventIDRegistry(self)
+        self._upload_tokens = UploadTokenCache(lambda: self._generate_upload_token())
+        self.upload_ledger = UploadLedger(upload_ledger) if upload_ledger is not None else None
+
+    @property
+    def request_stats(self):
+        """Statistics of the requests made by this instance, aggregated by GraphQL operation.
+        Only available if the instance was created with instrumentation enabled
+
+        Returns
+        -------
+        ~gwcloud_python.utils.instrumentation.RequestStats or None
+        """
+        return self.client.stats
 
-    def _upload_supporting_files(self, tokens, file_paths):
+    def _upload_supporting_files(self, tokens, file_paths, directory=None, max_workers=GWCLOUD_UPLOAD_WORKERS):
         """
-        Uploads supporting files for a job
+        Uploads supporting files for a job. Each distinct file is only uploaded once, even if several tokens refer to
+        it, and the files are uploaded in batches, several at once
 
         Parameters
         ----------
-        token : list
+        tokens : list
             List of supporting file upload tokens
-        file_path : list
+        file_paths : list
             List of local file paths to the supporting files to be uploaded
+        directory : str or ~pathlib.Path, optional
+            Directory against which relative file paths are resolved. If None, they are resolved against the current
+            working directory, by default None
+        max_workers : int, optional
+            Maximum number of batches uploaded at once, by default GWCLOUD_UPLOAD_WORKERS
 
         Returns
         -------
         None
         """
+        if directory is not None:
+            file_paths = [Path(directory, file_path) for file_path in file_paths]
+
+        files = group_supporting_files(tokens, file_paths)
+        batches = batch_supporting_files(
+            files,
+            GWCLOUD_SUPPORTING_FILES_BATCH_BYTES,
+            GWCLOUD_SUPPORTING_FILES_BATCH_FILES
+        )
+        if not batches:
+            return
+
+        progress = UploadProgress(self.client.upload_progress or tqdm_progress(), sum(size for _, size, _ in files))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(lambda batch: self._upload_supporting_file_batch(batch, progress), batches))
+
+    def _upload_supporting_file_batch(self, batch, progress):
         query = """
             mutation SupportingFilesUploadMutation($input: UploadSupportingFilesMutationInput!) {
                 uploadSupportingFiles(input: $input) {
@@ -70,15 +200,18 @@ class GWCloud:
                 }
             }
         """
-        file_paths = map(check_file, file_paths)
+        # Only the files of this batch are open while it is uploaded, and a file with several tokens is only sent once.
+        # Progress is reported for all of the batches as a whole rather than for each request
         with ExitStack() as stack:
-            files = [stack.enter_context(file_path.open('rb')) for file_path in file_paths]
+            stack.enter_context(self.client.reporting_progress(_no_progress))
+            supporting_files = []
+            for path, size, file_tokens in batch:
+                f = stack.enter_context(FilePart(path, 0, size, on_read=progress))
+                supporting_files.extend({"fileToken": token, "supportingFile": f} for token in file_tokens)
 
             variables = {
                 "input": {
-                    "supportingFiles": [
-                        {"fileToken": token, "supportingFile": f} for token, f in zip(tokens, files)
-                    ]
+                    "supportingFiles": supporting_files
                 }
             }
 
@@ -106,9 +239,12 @@ class GWCloud:
 
         Returns
         -------
-        str
-            Message received from server after job submission
+        BilbyJob
+            The submitted Bilby job, whose information is obtained from GWCloud when it is first accessed
         """
+        return self._start_bilby_job(job_name, job_description, private, ini_string, cluster)
+
+    def _start_bilby_job(self, job_name, job_description, private, ini_string, cluster, directory=None):
         query = """
             mutation NewBilbyJobFromIniString($input: BilbyJobFromIniStringMutationInput!){
                 newBilbyJobFromIniString (input: $input) {
@@ -147,10 +283,10 @@ class GWCloud:
             tokens.append(supporting_file['token'])
             file_paths.append(supporting_file['file_path'])
 
-        self._upload_supporting_files(tokens, file_paths)
+        self._upload_supporting_files(tokens, file_paths, directory)
 
         job_id = data['new_bilby_job_from_ini_string']['result']['job_id']
-        return self.get_job_by_id(job_id)
+        return BilbyJob._lazy(self, job_id)
 
     def start_bilby_job_from_file(self, job_name, job_description, private, ini_file, cluster=Cluster.DEFAULT):
         """Submit the parameters required to start a Bilby job, using an .ini file
@@ -170,21 +306,61 @@ class GWCloud:
 
         Returns
         -------
-        str
-            Message received from server after job submission
+        BilbyJob
+            The submitted Bilby job, whose information is obtained from GWCloud when it is first accessed
         """
 
-        # Change the working directory to the folder containing the ini file, this will make the supporting file upload
-        # search for files relative to the ini file
-        cwd = Path().resolve()
+        # Supporting files are found relative to the ini file. The working directory is not changed, as it is shared by
+        # every thread, so several jobs can be submitted at once
         ini_file = Path(ini_file)
-        try:
-            os.chdir(Path(ini_file).parent)
-            with ini_file.open() as f:
-                ini_string = f.read().strip()
-                return self.start_bilby_job_from_string(job_name, job_description, private, ini_string, cluster)
-        finally:
-            os.chdir(str(cwd))
+        with ini_file.open() as f:
+            ini_string = f.read().strip()
+
+        return self._start_bilby_job(
+            job_name, job_description, private, ini_string, cluster, ini_file.parent.resolve()
+        )
+
+    def start_bilby_jobs_from_files(self, specs, max_workers=GWCLOUD_UPLOAD_WORKERS, hydrate=True):
+        """Submit several Bilby jobs at once, each using an .ini file. The jobs are submitted concurrently, and a
+        failure to submit one job does not prevent the others from being submitted
+
+        Parameters
+        ----------
+        specs : list
+            List of dictionaries, each containing the arguments of :meth:`start_bilby_job_from_file` for a job,
+            namely 'job_name', 'job_description', 'private', 'ini_file' and optionally 'cluster'
+        max_workers : int, optional
+            Maximum number of jobs submitted at once, by default GWCLOUD_UPLOAD_WORKERS
+        hydrate : bool, optional
+            If True, the information of the submitted jobs is obtained from GWCloud in batches once they have been
+            submitted, otherwise it is obtained when first accessed, by default True
+
+        Returns
+        -------
+        list
+            For each spec, in order, either the submitted BilbyJob or the exception raised when submitting it
+        """
+        def submit(spec):
+            try:
+                return self.start_bilby_job_from_file(**spec)
+            except Exception as e:
+                logger.warning(f"Unable to submit job from {spec.get('ini_file')}: {e}")
+                return e
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(submit, specs))
+
+            if hydrate:
+                jobs = [result for result in results if isinstance(result, BilbyJob)]
+                futures = [executor.submit(self.hydrate_jobs, batch) for batch in chunked(jobs, GWCLOUD_BATCH_SIZE)]
+                for future in futures:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        # The jobs were still submitted, and are loaded when first accessed instead
+                        logger.warning(f"Unable to load submitted jobs: {e}")
+
+        return results
 
     def get_official_job_list(self, search=""):
         """Get list of public Bilby jobs corresponding to a search of "labels.name:Official" and
@@ -202,19 +378,24 @@ class GWCloud:
         """
         return self.get_public_job_list(search=f"labels.name:Official {search}", time_range=TimeRange.ANY)
 
+    def _get_job_data_from_query(self, query_data):
+        job_data = rename_dict_keys(query_data, {'id': 'job_id'})
+        job_data['event_id'] = self.event_ids.intern(job_data.get('event_id'))
+        return job_data
+
     def _get_job_model_from_query(self, query_data):
         if not query_data:
             return None
 
-        return BilbyJob(
-            client=self,
-            **rename_dict_keys(
-                query_data,
-                {'id': 'job_id'}
-            )
-        )
+        return BilbyJob(client=self, **self._get_job_data_from_query(query_data))
+
+    def _get_job_list_from_query(self, edges, as_table=False):
+        if as_table:
+            return JobTable.from_query(self, [job['node'] for job in edges])
+
+        return [self._get_job_model_from_query(job['node']) for job in edges]
 
-    def get_public_job_list(self, search="", time_range=TimeRange.ANY, number=100):
+    def get_public_job_list(self, search="", time_range=TimeRange.ANY, number=100, as_table=False):
         """Obtains a list of public Bilby jobs, filtering based on the search terms
         and the time range within which the job was created.
 
@@ -226,10 +407,13 @@ class GWCloud:
             Time range by which to filter job list, by default TimeRange.ANY
         number : int, optional
             Number of job results to return in one request, by default 100
+        as_table : bool, optional
+            If True, return the jobs as a columnar :class:`~gwcloud_python.job_table.JobTable`
+            instead of a list, by default False
 
         Returns
         -------
-        list
+        list or ~gwcloud_python.job_table.JobTable
             List of BilbyJob instances for the jobs corresponding to the search terms and in the specified time range
         """
         query = """
@@ -267,9 +451,71 @@ class GWCloud:
 
         if not data['public_bilby_jobs']['edges']:
             logger.info('Job search returned no results.')
-            return []
 
-        return [self._get_job_model_from_query(job['node']) for job in data['public_bilby_jobs']['edges']]
+        return self._get_job_list_from_query(data['public_bilby_jobs']['edges'], as_table)
+
+    def _get_public_job_pages(self, search="", time_range=TimeRange.ANY, page_size=100):
+        """Iterates through the public job list one page at a time, following the pagination cursors
+        until the listing has been exhausted
+
+        Parameters
+        ----------
+        search : str, optional
+            Search terms by which to filter public job list, by default ""
+        time_range : ~gwdc_python.helpers.TimeRange or str, optional
+            Time range by which to filter job list, by default TimeRange.ANY
+        page_size : int, optional
+            Number of job results to obtain in each request, by default 100
+
+        Yields
+        ------
+        list
+            List of job data dictionaries for each page of results
+        """
+        query = """
+            query ($search: String, $timeRange: String, $first: Int, $after: String){
+                publicBilbyJobs (search: $search, timeRange: $timeRange, first: $first, after: $after) {
+                    pageInfo {
+                        hasNextPage
+                        endCursor
+                    }
+                    edges {
+                        node {
+                            id
+                            user
+                            name
+                            description
+                            jobStatus {
+                                name
+                                date
+                            }
+                            eventId {
+                                eventId
+                                triggerId
+                                nickname
+                                isLigoEvent
+                            }
+                        }
+                    }
+                }
+            }
+        """
+
+        variables = {
+            "search": search,
+            "timeRange": time_range.value if isinstance(time_range, TimeRange) else time_range,
+            "first": page_size,
+            "after": None
+        }
+
+        while True:
+            data = self.request(query=query, variables=variables)
+            yield [job['node'] for job in data['public_bilby_jobs']['edges']]
+
+            page_info = data['public_bilby_jobs']['page_info']
+            if not page_info['has_next_page']:
+                return
+            variables['after'] = page_info['end_cursor']
 
     def get_job_by_id(self, job_id):
         """Get a Bilby job instance corresponding to a specific job ID
@@ -284,6 +530,15 @@ class GWCloud:
         BilbyJob
             BilbyJob instance corresponding to the input ID
         """
+        query_data = self._get_job_query_data(job_id)
+
+        if not query_data:
+            logger.info('No job matching input ID was returned.')
+            return None
+
+        return self._get_job_model_from_query(query_data)
+
+    def _get_job_query_data(self, job_id):
         query = """
             query ($id: ID!){
                 bilbyJob (id: $id) {
@@ -310,14 +565,61 @@ class GWCloud:
         }
 
         data = self.request(query=query, variables=variables)
+        return data['bilby_job']
 
-        if not data['bilby_job']:
-            logger.info('No job matching input ID was returned.')
-            return None
+    def hydrate_jobs(self, jobs):
+        """Obtain the job information of many lazily created Bilby jobs, such as those returned when jobs are
+        submitted or uploaded, using batched requests. Jobs which have already been loaded are skipped.
+        Lazily created jobs are otherwise loaded one at a time, when their information is first accessed
+
+        Parameters
+        ----------
+        jobs : list
+            List of BilbyJob instances to load
+
+        Returns
+        -------
+        list
+            The same list of BilbyJob instances, to allow chaining
+        """
+        unloaded = {}
+        for job in jobs:
+            if not job.loaded:
+                unloaded.setdefault(job.id, []).append(job)
+
+        if len(unloaded) == 1:
+            job_id = next(iter(unloaded))
+            results = {job_id: self._get_job_query_data(job_id)}
+        else:
+            results = {}
+            for chunk in chunked(unloaded, GWCLOUD_BATCH_SIZE):
+                query = batched_operation(
+                    operation="query",
+                    name="BilbyJobs",
+                    field="bilbyJob",
+                    argument="id",
+                    argument_type="ID!",
+                    selection="""{
+                        id name user description
+                        jobStatus { name date }
+                        eventId { eventId triggerId nickname isLigoEvent }
+                    }""",
+                    count=len(chunk)
+                )
+                data = self.request(query=query, variables=batched_variables("id", chunk))
+                results.update(zip(chunk, batched_results(data, len(chunk))))
+
+        for job_id, query_data in results.items():
+            if not query_data:
+                raise Exception(f"No job matching the ID {job_id} was returned.")
+            job_data = self._get_job_data_from_query(query_data)
+            del job_data['job_id']
+            for job in unloaded[job_id]:
+                job._populate(job_data)
 
-        return self._get_job_model_from_query(data['bilby_job'])
+        return jobs
 
-    def get_user_jobs(self, number=100):
+    def get_user_jobs(self, number=100, as_table=False):
         """Obtains a list of Bilby jobs created by the user, filtering based on the search terms
         and the time range within which the job was created.
 
@@ -325,10 +627,13 @@ class GWCloud:
         ----------
         number : int, optional
             Number of job results to return in one request, by default 100
+        as_table : bool, optional
+            If True, return the jobs as a columnar :class:`~gwcloud_python.job_table.JobTable`
+            instead of a list, by default False
 
         Returns
         -------
-        list
+        list or ~gwcloud_python.job_table.JobTable
             List of BilbyJob instances for the jobs corresponding to the search terms and in the specified time range
         """
         query = """
@@ -362,7 +667,222 @@ class GWCloud:
 
         data = self.request(query=query, variables=variables)
 
-        return [self._get_job_model_from_query(job['node']) for job in data['bilby_jobs']['edges']]
+        return self._get_job_list_from_query(data['bilby_jobs']['edges'], as_table)
+
+    def _get_job_statuses(self, job_ids):
+        """Get the current status of many jobs, using batched requests
+
+        Parameters
+        ----------
+        job_ids : list
+            IDs of the jobs for which to obtain the status
+
+        Returns
+        -------
+        dict
+            Dictionary mapping each job ID to its job status data, or None if the job could not be found
+        """
+        statuses = {}
+        for chunk in chunked(job_ids, GWCLOUD_BATCH_SIZE):
+            query = batched_operation(
+                operation="query",
+                name="BilbyJobStatuses",
+                field="bilbyJob",
+                argument="id",
+                argument_type="ID!",
+                selection="{ jobStatus { name date } }",
+                count=len(chunk)
+            )
+            data = self.request(query=query, variables=batched_variables("id", chunk))
+            for job_id, result in zip(chunk, batched_results(data, len(chunk))):
+                statuses[job_id] = result['job_status'] if result else None
+
+        return statuses
+
+    def watch_jobs(self, jobs, min_interval=GWCLOUD_WATCH_MIN_INTERVAL, max_interval=GWCLOUD_WATCH_MAX_INTERVAL,
+                   backoff=GWCLOUD_WATCH_BACKOFF, timeout=None):
+        """Watch the statuses of many Bilby jobs, yielding each status change as it is seen.
+        The statuses of all unfinished jobs are obtained together in batched requests, and the time between polls
+        grows while no statuses change. Jobs are no longer polled once they reach a terminal status,
+        and the generator finishes when every job has finished. Lazily created jobs are loaded together with
+        :meth:`hydrate_jobs` before watching begins.
+
+        Parameters
+        ----------
+        jobs : list
+            List of BilbyJob instances to watch. The status attribute of each job is updated as it changes
+        min_interval : float, optional
+            Minimum time between polls in seconds, by default GWCLOUD_WATCH_MIN_INTERVAL
+        max_interval : float, optional
+            Maximum time between polls in seconds, by default GWCLOUD_WATCH_MAX_INTERVAL
+        backoff : float, optional
+            Factor by which the time between polls grows when nothing changes, by default GWCLOUD_WATCH_BACKOFF
+        timeout : float, optional
+            Stop watching after this many seconds, by default None
+
+        Yields
+        ------
+        ~gwcloud_python.utils.job_watcher.JobStatusChange
+            The job along with its previous and new status
+        """
+        # Otherwise each lazily created job would be loaded by its own request when its status is first read
+        jobs = self.hydrate_jobs(list(jobs))
+        return _watch_job_statuses(self._get_job_statuses, jobs, min_interval, max_interval, backoff, timeout)
+
+    def wait_for_jobs(self, jobs, timeout=None, **kwargs):
+        """Wait until all of the Bilby jobs have reached a terminal status, such as 'Completed' or 'Error'.
+        Accepts the same keyword arguments as :meth:`watch_jobs`
+
+        Parameters
+        ----------
+        jobs : list
+            List of BilbyJob instances to wait for. The status attribute of each job is updated as it changes
+        timeout : float, optional
+            Stop waiting after this many seconds, by default None
+
+        Returns
+        -------
+        list
+            The input list of BilbyJob instances, with updated statuses
+        """
+        jobs = list(jobs)
+        for change in self.watch_jobs(jobs, timeout=timeout, **kwargs):
+            logger.info(f'{change.job} is now {change.status.status}')
+        return jobs
+
+    def update_jobs(self, updates):
+        """Update the name, description or Event ID of many Bilby jobs, using batched requests.
+        Each job is updated independently, so a failure to update one job does not prevent the others from being
+        updated. The attributes of each successfully updated job are changed to match.
+
+        Parameters
+        ----------
+        updates : dict
+            Dictionary mapping each BilbyJob instance to a dictionary of the new values for that job,
+            with keys 'name', 'description' or 'event_id'. The Event ID may be an EventID, a string or None
+
+        Returns
+        -------
+        dict
+            Dictionary mapping each BilbyJob instance to None if it was updated, or the error message if it was not
+
+        Examples
+        --------
+        >>> gwc.update_jobs({job1: {'name': 'GW150914_v2'}, job2: {'description': 'Rerun', 'event_id': None}})
+        {BilbyJob(name=GW150914_v2, ...): None, BilbyJob(name=GW151012, ...): None}
+        """
+        inputs = []
+        for job, changes in updates.items():
+            unknown = set(changes) - {'name', 'description', 'event_id'}
+            if unknown:
+                raise ValueError(f"Unable to update the job attributes {', '.join(sorted(unknown))}")
+
+            job_input = {'job_id': job.id}
+            if 'name' in changes:
+                job_input['name'] = str(changes['name'])
+            if 'description' in changes:
+                job_input['description'] = str(changes['description'])
+            if 'event_id' in changes:
+                event_id = changes['event_id']
+                if not (event_id is None or isinstance(event_id, (EventID, str))):
+                    raise ValueError('Parameter event_id must be an EventID, a string or None')
+                job_input['event_id'] = getattr(event_id, 'event_id', event_id) or ''
+            inputs.append((job, job_input))
+
+        messages = self._batched_mutation(
+            name="BilbyJobUpdates",
+            field="updateBilbyJob",
+            input_type="UpdateBilbyJobMutationInput!",
+            inputs=[job_input for _, job_input in inputs]
+        )
+        results = {job: message for (job, _), message in zip(inputs, messages)}
+
+        self._apply_job_updates({job: updates[job] for job, message in results.items() if message is None})
+        return results
+
+    def _batched_mutation(self, name, field, input_type, inputs):
+        """Apply the same mutation to many inputs, using batched requests. Each input is applied independently,
+        so a failure for one input does not prevent the others from being applied. If a whole request fails, such as
+        when the server can't be reached, each input of that request fails with its error, and the remaining requests
+        are still made
+
+        Parameters
+        ----------
+        name : str
+            Name of the batched mutation
+        field : str
+            Name of the mutation field to apply to each input
+        input_type : str
+            GraphQL type of the mutation input
+        inputs : list
+            Input dictionaries for each mutation
+
+        Returns
+        -------
+        list
+            For each input, None if the mutation succeeded, or the error message if it failed
+        """
+        messages = []
+        for chunk in chunked(inputs, GWCLOUD_BATCH_SIZE):
+            query = batched_operation(
+                operation="mutation",
+                name=name,
+                field=field,
+                argument="input",
+                argument_type=input_type,
+                selection="{ result }",
+                count=len(chunk)
+            )
+            try:
+                data, errors = self.client.request_partial(query=query, variables=batched_variables("input", chunk))
+            except Exception as e:
+                # The earlier requests may already have been applied, so their results are still returned
+                logger.warning(f"Unable to apply {field} to {len(chunk)} inputs: {e}")
+                messages.extend([str(e)] * len(chunk))
+                continue
+
+            # Errors are matched to inputs by the alias at the start of their path. Errors without a path apply to
+            # the whole request, and so to every input in the chunk
+            chunk_messages = {}
+            for error in errors:
+                aliases = error['path'][:1] if error.get('path') else [f"item{i}" for i in range(len(chunk))]
+                for alias in aliases:
+                    chunk_messages.setdefault(alias, error.get('message'))
+
+            for i, result in enumerate(batched_results(data or {}, len(chunk))):
+                message = chunk_messages.get(f"item{i}")
+                if message is None and result is None:
+                    message = "No result was returned"
+                messages.append(message)
+
+        return messages
+
+    def _apply_job_updates(self, updates):
+        """Set the attributes of jobs which have been updated in GWCloud. Any Event IDs given as strings that are not
+        already in the :attr:`event_ids` registry are obtained together in batched requests
+
+        Parameters
+        ----------
+        updates : dict
+            Dictionary mapping each BilbyJob instance to a dictionary of its new values
+        """
+        missing = {
+            changes['event_id'] for changes in updates.values()
+            if isinstance(changes.get('event_id'), str) and changes['event_id'] not in self.event_ids
+        }
+        self._get_event_ids(missing)
+
+        for job, changes in updates.items():
+            if 'name' in changes:
+                job.name = changes['name']
+            if 'description' in changes:
+                job.description = changes['description']
+            if 'event_id' in changes:
+                event_id = changes['event_id']
+                if isinstance(event_id, EventID):
+                    job.event_id = self.event_ids.intern(event_id)
+                else:
+                    job.event_id = self.event_ids.get(event_id) if event_id else None
 
     def _get_files_by_bilby_job(self, job):
         query = """
@@ -509,7 +1029,8 @@ class GWCloud:
         return data['generate_file_download_ids']['result']
 
     def _generate_upload_token(self):
-        """Creates a new long lived upload token for use uploading jobs
+        """Creates a new long lived upload token for use uploading jobs. The token is cached and reused by uploads
+        until it expires
 
         Returns
         -------
@@ -527,7 +1048,16 @@ class GWCloud:
         data = self.request(query=query)
         return data['generate_bilby_job_upload_token']['token']
 
-    def upload_job_archive(self, description, job_archive, public=False):
+    def _upload_request(self, query, variables):
+        # The cached upload token is discarded if an upload fails, in case the server no longer accepts it
+        try:
+            return self.request(query=query, variables=variables, authorize=False)
+        except Exception:
+            self._upload_tokens.invalidate()
+            raise
+
+    def upload_job_archive(self, description, job_archive, public=False, resumable=False,
+                           part_size=GWCLOUD_UPLOAD_PART_SIZE, max_workers=GWCLOUD_UPLOAD_WORKERS):
         """Upload a bilby job to GWCloud by job output archive
 
         Parameters
@@ -541,39 +1071,204 @@ class GWCloud:
         job_archive : str
             The path to the job output archive to upload
 
+        resumable : bool, optional
+            If True, the archive is uploaded in parts, and the parts which have been uploaded are recorded in a journal
+            next to the archive. If the upload fails, uploading the same archive again only sends the missing parts,
+            by default False
+
+        part_size : int, optional
+            Size in bytes of each part of a resumable upload, by default GWCLOUD_UPLOAD_PART_SIZE
+
+        max_workers : int, optional
+            Maximum number of parts of a resumable upload sent at once, by default GWCLOUD_UPLOAD_WORKERS
+
         Returns
         -------
         BilbyJob
-            The created Bilby job
+            The created Bilby job, whose information is obtained from GWCloud when it is first accessed
         """
+        fingerprint = archive_fingerprint(job_archive) if self.upload_ledger is not None else None
+        return self._upload_once(
+            fingerprint,
+            description,
+            public,
+            lambda: self._upload_job_archive(description, job_archive, public, resumable, part_size, max_workers)
+        )
+
+    def _upload_job_archive(self, description, job_archive, public, resumable=False,
+                            part_size=GWCLOUD_UPLOAD_PART_SIZE, max_workers=GWCLOUD_UPLOAD_WORKERS):
+        if resumable:
+            return self._upload_job_parts(description, Path(job_archive), public, part_size, max_workers)
+
+        with open(job_archive, 'rb') as f:
+            return self._upload_job_file(description, f, public)
+
+    def _upload_once(self, fingerprint, description, public, upload):
+        """Upload a job, unless content with the same fingerprint has already been uploaded with the same description
+        and visibility according to the ledger
+
+        Parameters
+        ----------
+        fingerprint : str or None
+            Fingerprint of the content to upload, or None if the ledger is disabled
+        description : str
+            Description of the job
+        public : bool
+            If the job is public or not
+        upload : function
+            Function, taking no arguments, which uploads the job and returns it
+
+        Returns
+        -------
+        BilbyJob
+            The uploaded job, or the job created when the same content was uploaded before
+        """
+        if fingerprint is None:
+            return upload()
+
+        job_id = self.upload_ledger.get(self.client.endpoint, fingerprint, description, public)
+        if job_id is not None:
+            logger.info(f"The same job has already been uploaded as job {job_id}, so it has not been uploaded again")
+            return BilbyJob._lazy(self, job_id)
+
+        job = upload()
+        self.upload_ledger.record(self.client.endpoint, fingerprint, description, public, job.id)
+        return job
+
+    def _upload_job_parts(self, description, job_archive, public, part_size, max_workers):
+        journal = UploadJournal(f"{job_archive}{GWCLOUD_UPLOAD_JOURNAL_SUFFIX}")
+        fingerprint = UploadJournal.fingerprint(job_archive, part_size)
+        if journal.resume(fingerprint):
+            logger.info(f"Resuming upload, {len(journal.parts)} parts have already been uploaded")
+        else:
+            journal.start(self._create_upload_session(description, public, fingerprint["size"]), fingerprint)
+
+        parts = part_ranges(fingerprint["size"], part_size)
+        missing = [part for part in parts if part[0] not in journal.parts]
+        sent = sum(size for number, _, size in parts if number in journal.parts)
+        progress = UploadProgress(self.client.upload_progress or tqdm_progress(), fingerprint["size"], sent)
+
+        error = None
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._upload_job_part, journal.session_id, job_archive, part, progress)
+                for part in missing
+            ]
+            # Every part that succeeds is recorded, even after another part has failed
+            for future in as_completed(futures):
+                try:
+                    journal.record(*future.result())
+                except Exception as e:
+                    error = error or e
+
+        if error is not None:
+            raise error
+
+        job_id = self._complete_upload_session(journal.session_id, [journal.parts[number] for number, _, _ in parts])
+        journal.remove()
+        return BilbyJob._lazy(self, job_id)
+
+    def _create_upload_session(self, description, public, size):
         query = """
-            mutation JobUploadMutation($input: UploadBilbyJobMutationInput!) {
-                uploadBilbyJob(input: $input) {
+            mutation CreateBilbyJobUploadSessionMutation($input: CreateBilbyJobUploadSessionMutationInput!) {
+                createBilbyJobUploadSession(input: $input) {
                     result {
-                        jobId
+                        sessionId
                     }
                 }
             }
         """
 
-        with open(job_archive, 'rb') as f:
+        variables = {
+            "input": {
+                "uploadToken": self._upload_tokens.get(),
+                "details": {
+                    "description": description,
+                    "private": not public
+                },
+                "size": size
+            }
+        }
+
+        data = self._upload_request(query, variables)
+        return data['create_bilby_job_upload_session']['result']['session_id']
+
+    def _upload_job_part(self, session_id, job_archive, part, progress):
+        query = """
+            mutation UploadBilbyJobPartMutation($input: UploadBilbyJobPartMutationInput!) {
+                uploadBilbyJobPart(input: $input) {
+                    result {
+                        partId
+                    }
+                }
+            }
+        """
+
+        number, offset, size = part
+        # Progress is reported for the archive as a whole rather than for each request
+        with FilePart(job_archive, offset, size, on_read=progress) as f, self.client.reporting_progress(_no_progress):
             variables = {
                 "input": {
-                    "uploadToken": self._generate_upload_token(),
-                    "details": {
-                        "description": description,
-                        "private": not public
-                    },
-                    "jobFile": f
+                    "sessionId": session_id,
+                    "partNumber": number,
+                    "part": f
                 }
             }
 
             data = self.request(query=query, variables=variables, authorize=False)
 
+        return number, data['upload_bilby_job_part']['result']['part_id']
+
+    def _complete_upload_session(self, session_id, part_ids):
+        query = """
+            mutation CompleteBilbyJobUploadSessionMutation($input: CompleteBilbyJobUploadSessionMutationInput!) {
+                completeBilbyJobUploadSession(input: $input) {
+                    result {
+                        jobId
+                    }
+                }
+            }
+        """
+
+        variables = {
+            "input": {
+                "sessionId": session_id,
+                "partIds": part_ids
+            }
+        }
+
+        data = self.request(query=query, variables=variables, authorize=False)
+        return data['complete_bilby_job_upload_session']['result']['job_id']
+
+    def _upload_job_file(self, description, job_file, public):
+        query = """
+            mutation JobUploadMutation($input: UploadBilbyJobMutationInput!) {
+                uploadBilbyJob(input: $input) {
+                    result {
+                        jobId
+                    }
+                }
+            }
+        """
+
+        variables = {
+            "input": {
+                "uploadToken": self._upload_tokens.get(),
+                "details": {
+                    "description": description,
+                    "private": not public
+                },
+                "jobFile": job_file
+            }
+        }
+
+        data = self._upload_request(query, variables)
+
         job_id = data['upload_bilby_job']['result']['job_id']
-        return self.get_job_by_id(job_id)
+        return BilbyJob._lazy(self, job_id)
 
-    def upload_job_directory(self, description, job_directory, public=False):
+    def upload_job_directory(self, description, job_directory, public=False, stream=False,
+                             codec=GWCLOUD_ARCHIVE_CODEC, threads=GWCLOUD_ARCHIVE_THREADS, upload_filter=None):
         """Upload a bilby job to GWCloud by job output directory
 
         Parameters
@@ -587,21 +1282,190 @@ class GWCloud:
         job_directory : str
             The path to the job output directory to upload
 
+        stream : bool, optional
+            If True, the archive of the job is held in memory, or written to the system temporary directory if it is
+            larger than GWCLOUD_ARCHIVE_SPOOL_SIZE, rather than being written to a temporary file in the job directory.
+            The archive is complete before it is uploaded in either case, as the upload must have a known size
+            rather than being sent with chunked transfer encoding, which the server may read as an empty request,
+            by default False
+
+        codec : str, optional
+            Compression used for the archive of the job, one of 'none', 'gzip', 'parallel_gzip' or 'zstd'.
+            The 'parallel_gzip' and 'zstd' codecs compress using several threads, by default GWCLOUD_ARCHIVE_CODEC
+
+        threads : int, optional
+            Number of threads used by the parallel codecs. If None, a thread is used for each CPU,
+            by default GWCLOUD_ARCHIVE_THREADS
+
+        upload_filter : ~gwcloud_python.utils.upload_filter.UploadFilter, optional
+            Selects the files of the job directory which are uploaded, such as
+            :data:`~gwcloud_python.utils.upload_filter.DEFAULT_UPLOAD_FILTER`, which only uploads the files served by
+            default when the files of the job are downloaded. If None, all files are uploaded, by default None
+
         Returns
         -------
         BilbyJob
-            The created Bilby job
+            The created Bilby job, whose information is obtained from GWCloud when it is first accessed
         """
+        members = self._select_job_files(job_directory, upload_filter)
+        if stream:
+            # The job directory is fingerprinted first, so that the archive isn't created if it has been uploaded
+            fingerprint = None
+            if self.upload_ledger is not None:
+                fingerprint = job_directory_fingerprint(job_directory, members)
+
+            def upload():
+                with spool_job_archive(job_directory, codec=codec, threads=threads, members=members) as archive:
+                    return self._upload_job_file(description, archive, public)
+
+            return self._upload_once(fingerprint, description, public, upload)
+
+        job_archive, fingerprint = self._write_job_archive(job_directory, members, codec, threads)
+        try:
+            return self._upload_once(
+                fingerprint,
+                description,
+                public,
+                lambda: self._upload_job_archive(description, job_archive, public)
+            )
+        finally:
+            os.remove(job_archive)
+
+    def upload_job_directories(self, job_directories, description="", public=False, max_workers=GWCLOUD_UPLOAD_WORKERS,
+                               archive_workers=None, codec=GWCLOUD_ARCHIVE_CODEC, upload_filter=None):
+        """Upload many bilby jobs to GWCloud by job output directory. The archives of the jobs are created and
+        uploaded at the same time, in separate pools of threads, and a failure to upload one job does not prevent
+        the others from being uploaded
+
+        Parameters
+        ----------
+        job_directories : list or dict
+            The paths to the job output directories to upload, or a dictionary mapping each path to the description
+            of the job
+
+        description : str, optional
+            The description of every job, if `job_directories` is a list, by default ""
+
+        public : bool, optional
+            If the uploaded jobs should be public or not, by default False
 
-        # Generate a temporary archive of the job
-        path = Path(job_directory)
-        with NamedTemporaryFile(dir=job_directory, suffix='.tar.gz') as f:
-            with tarfile.open(f.name, "w:gz", compresslevel=2) as tar_handle:
-                for item in path.rglob("*"):
-                    tar_handle.add(item, arcname=item.relative_to(path), recursive=False)
+        max_workers : int, optional
+            Maximum number of jobs uploaded at once, by default GWCLOUD_UPLOAD_WORKERS
 
-            # Upload the archive
-            return self.upload_job_archive(description, f.name, public)
+        archive_workers : int, optional
+            Maximum number of job archives created at once. If None, an archive is created for each CPU at once,
+            by default None
+
+        codec : str, optional
+            Compression used for the archives of the jobs, as for :meth:`upload_job_directory`,
+            by default GWCLOUD_ARCHIVE_CODEC
+
+        upload_filter : ~gwcloud_python.utils.upload_filter.UploadFilter, optional
+            Selects the files of each job directory which are uploaded. If None, all files are uploaded,
+            by default None
+
+        Returns
+        -------
+        list
+            For each job directory, in order, either the created BilbyJob or the exception raised when uploading it.
+            If the ledger is enabled, job directories with the same content and description are only uploaded once,
+            and share the created BilbyJob
+        """
+        if not isinstance(job_directories, dict):
+            job_directories = {job_directory: description for job_directory in job_directories}
+        jobs = list(job_directories.items())
+
+        archive_workers = archive_workers or os.cpu_count() or 1
+        # The CPUs are shared between the archives being created at once
+        threads = max(1, (os.cpu_count() or 1) // archive_workers)
+        # Limits the number of archives on disk, which have been created but not yet uploaded
+        pending = threading.BoundedSemaphore(archive_workers + max_workers)
+
+        def archive(job_directory):
+            pending.acquire()
+            try:
+                members = self._select_job_files(job_directory, upload_filter)
+                return self._write_job_archive(job_directory, members, codec, threads)
+            except BaseException:
+                pending.release()
+                raise
+
+        def upload(job_description, job_archive, fingerprint):
+            try:
+                return self._upload_once(
+                    fingerprint,
+                    job_description,
+                    public,
+                    lambda: self._upload_job_archive(job_description, job_archive, public)
+                )
+            finally:
+                os.remove(job_archive)
+                pending.release()
+
+        results = [None] * len(jobs)
+        with ThreadPoolExecutor(max_workers=archive_workers) as archive_pool, \
+                ThreadPoolExecutor(max_workers=max_workers) as upload_pool:
+            archives = {archive_pool.submit(archive, job_directory): i for i, (job_directory, _) in enumerate(jobs)}
+            uploads = {}
+            # If the ledger is enabled, the same job appearing more than once in the batch is only uploaded once, as
+            # its first upload is not recorded in the ledger until it finishes
+            first_uploads = {}
+            duplicates = {}
+            for future in as_completed(archives):
+                i = archives[future]
+                try:
+                    job_archive, fingerprint = future.result()
+                except Exception as e:
+                    results[i] = e
+                    continue
+
+                key = (fingerprint, jobs[i][1])
+                if fingerprint is not None and key in first_uploads:
+                    duplicates[i] = first_uploads[key]
+                    os.remove(job_archive)
+                    pending.release()
+                    continue
+                first_uploads[key] = i
+                uploads[upload_pool.submit(upload, jobs[i][1], job_archive, fingerprint)] = i
+
+            for future in as_completed(uploads):
+                i = uploads[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    results[i] = e
+
+        for i, first in duplicates.items():
+            logger.info(f"Job directory {jobs[i][0]} is the same as {jobs[first][0]}, so it was not uploaded again")
+            results[i] = results[first]
+
+        for (job_directory, _), result in zip(jobs, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Unable to upload job directory {job_directory}: {result}")
+        return results
+
+    def _select_job_files(self, job_directory, upload_filter):
+        if upload_filter is None:
+            # The files are listed before the archive is created, so that the archive doesn't include itself
+            return list(Path(job_directory).rglob("*"))
+
+        members, skipped_bytes = upload_filter.select(job_directory)
+        logger.info(f"Skipping {skipped_bytes} bytes of files which are excluded from the upload")
+        return members
+
+    def _write_job_archive(self, job_directory, members, codec, threads):
+        # Generate a temporary archive of the job, which is removed once it has been uploaded. If the ledger is
+        # enabled, the job is fingerprinted as it is archived
+        fingerprint = ArchiveFingerprint() if self.upload_ledger is not None else None
+        with NamedTemporaryFile(dir=job_directory, suffix=archive_extension(codec), delete=False) as f:
+            try:
+                write_job_archive(f, job_directory, codec=codec, threads=threads, members=members,
+                                  fingerprint=fingerprint)
+            except BaseException:
+                f.close()
+                os.remove(f.name)
+                raise
+        return f.name, fingerprint.hexdigest() if fingerprint is not None else None
 
     def upload_external_job(self, job_name, job_description, private, ini_string, url):
         """Upload a Bilby job to GWCloud with external results
@@ -623,7 +1487,7 @@ class GWCloud:
         Returns
         -------
         BilbyJob
-            The created Bilby job
+            The created Bilby job, whose information is obtained from GWCloud when it is first accessed
         """
         query = """
             mutation UploadExternalBilbyJob($input: UploadExternalBilbyJobMutationInput!) {
@@ -650,7 +1514,7 @@ class GWCloud:
         data = self.request(query=query, variables=variables)
 
         job_id = data['upload_external_bilby_job']['result']['job_id']
-        return self.get_job_by_id(job_id)
+        return BilbyJob._lazy(self, job_id)
 
     def upload_hdf5_job(self, description, hdf5_file, ini_file, public=False):
         """Upload a bilby job to GWCloud with HDF5 result file and INI configuration file
@@ -669,7 +1533,7 @@ class GWCloud:
         Returns
         -------
         BilbyJob
-            The created Bilby job
+            The created Bilby job, whose information is obtained from GWCloud when it is first accessed
         """
         query = """
             mutation JobUploadMutation($input: UploadHdf5BilbyJobMutationInput!) {
@@ -684,7 +1548,7 @@ class GWCloud:
         with open(hdf5_file, 'rb') as hdf5_f, open(ini_file, 'rb') as ini_f:
             variables = {
                 "input": {
-                    "uploadToken": self._generate_upload_token(),
+                    "uploadToken": self._upload_tokens.get(),
                     "details": {
                         "description": description,
                         "private": not public
@@ -694,10 +1558,10 @@ class GWCloud:
                 }
             }
 
-            data = self.request(query=query, variables=variables, authorize=False)
+            data = self._upload_request(query, variables)
 
         job_id = data['upload_hdf5_bilby_job']['result']['job_id']
-        return self.get_job_by_id(job_id)
+        return BilbyJob._lazy(self, job_id)
 
     def create_event_id(self, event_id, gps_time, trigger_id=None, nickname=None, is_ligo_event=False):
         """Create an Event ID that can be assigned to Bilby Jobs
@@ -741,7 +1605,14 @@ class GWCloud:
         }
         data = self.request(query=query, variables=variables)
         logger.info(data['create_event_id']['result'])
-        return self.get_event_id(event_id=event_id)
+        # The Event ID is built from the values that were sent, rather than obtained again
+        return self.event_ids.intern({
+            'event_id': event_id,
+            'trigger_id': trigger_id,
+            'nickname': nickname,
+            'is_ligo_event': is_ligo_event,
+            'gps_time': gps_time,
+        })
 
     def update_event_id(self, event_id, gps_time=None, trigger_id=None, nickname=None, is_ligo_event=None):
         """Create an Event ID that can be assigned to Bilby Jobs
@@ -785,7 +1656,22 @@ class GWCloud:
         }
         data = self.request(query=query, variables=variables)
         logger.info(data['update_event_id']['result'])
-        return self.get_event_id(event_id=event_id)
+
+        # Fields which were not provided are left unchanged, so the Event ID can only be built locally if its
+        # current values are known
+        if event_id not in self.event_ids:
+            return self._request_event_id(event_id=event_id)
+
+        changes = {
+            'trigger_id': trigger_id,
+            'nickname': nickname,
+            'is_ligo_event': is_ligo_event,
+            'gps_time': gps_time,
+        }
+        return self.event_ids.intern({
+            'event_id': event_id,
+            **{name: value for name, value in changes.items() if value is not None}
+        })
 
     def delete_event_id(self, event_id):
         """Delete an Event ID
@@ -811,10 +1697,33 @@ class GWCloud:
             }
         }
         data = self.request(query=query, variables=variables)
+        self.event_ids.discard(event_id)
         logger.info(data['delete_event_id']['result'])
 
     def get_event_id(self, event_id):
-        """Get EventID by the event_id
+        """Get EventID by the event_id. If all Event IDs have been loaded into the :attr:`event_ids` registry,
+        the Event ID is obtained from the registry without making a request.
+
+        Parameters
+        ----------
+        event_id : str
+            Event ID of the form GW123456_123456
+
+        Returns
+        -------
+        .EventID
+            The requested Event ID
+        """
+        if event_id == '':
+            return None
+
+        if self.event_ids.loaded and event_id in self.event_ids:
+            return self.event_ids.get(event_id)
+
+        return self._request_event_id(event_id)
+
+    def _request_event_id(self, event_id):
+        """Request an EventID from GWCloud by the event_id, updating the shared instance in the registry
 
         Parameters
         ----------
@@ -837,17 +1746,15 @@ class GWCloud:
                 }
             }
         """
-        if event_id == '':
-            return None
 
         variables = {
             "eventId": event_id
         }
         data = self.request(query=query, variables=variables)
-        return EventID(**data['event_id'])
+        return self.event_ids.intern(data['event_id'])
 
     def get_all_event_ids(self):
-        """Obtain a list of all Event IDs
+        """Obtain a list of all Event IDs, which are also loaded into the :attr:`event_ids` registry
 
         Parameters
         ----------
@@ -871,4 +1778,121 @@ class GWCloud:
             }
         """
         data = self.request(query=query)
-        return [EventID(**event) for event in data['all_event_ids']]
+        return self.event_ids._sync(data['all_event_ids'])
+
+    def upsert_event_ids(self, records, delete_missing=False):
+        """Create or update many Event IDs, such as those read from a CSV file. The records are compared with the
+        current Event IDs, obtained in a single request, and only the Event IDs that are new or have changed are
+        created or updated, using batched requests.
+
+        **INFO**:
+        *Event IDs can only be created, updated or deleted by a select few users.*
+
+        Parameters
+        ----------
+        records : list
+            List of dictionaries or .EventID objects, with keys corresponding to the fields of an :class:`.EventID`.
+            Fields missing from a record keep their current values, and empty cells, or fields of an .EventID which
+            are None, are treated as missing. New Event IDs must have a gps_time
+        delete_missing : bool, optional
+            If True, Event IDs that are not in the records are deleted, by default False
+
+        Returns
+        -------
+        list
+            The .EventID objects for each of the records, after any changes have been made
+
+        Raises
+        ------
+        EventIDUpsertError
+            If any of the changes failed. The successful changes are still made
+
+        Examples
+        --------
+        >>> import csv
+        >>> with open('event_ids.csv') as f:
+        ...     event_ids = gwc.upsert_event_ids(csv.DictReader(f))
+        """
+        current = {
+            event.event_id: {name: getattr(event, name) for name in _EVENT_ID_FIELDS}
+            for event in self.get_all_event_ids()
+        }
+        defaults = {'trigger_id': None, 'nickname': None, 'is_ligo_event': False, 'gps_time': None}
+
+        desired = {}
+        for record in records:
+            values = _event_id_record(record)
+            event_id = values['event_id']
+            desired[event_id] = {**(desired.get(event_id) or current.get(event_id) or defaults), **values}
+
+        creates = [values for event_id, values in desired.items() if event_id not in current]
+        updates = [values for event_id, values in desired.items() if current.get(event_id, values) != values]
+        deletes = [event_id for event_id in current if event_id not in desired] if delete_missing else []
+
+        missing_gps_time = [values['event_id'] for values in creates if values['gps_time'] is None]
+        if missing_gps_time:
+            raise ValueError(f"New Event IDs must have a gps_time: {', '.join(missing_gps_time)}")
+
+        errors = {}
+        for changes, name, field, input_type in [
+            (creates, "CreateEventIDs", "createEventId", "EventIDMutationInput!"),
+            (updates, "UpdateEventIDs", "updateEventId", "UpdateEventIDMutationInput!"),
+        ]:
+            messages = self._batched_mutation(name=name, field=field, input_type=input_type, inputs=changes)
+            for values, message in zip(changes, messages):
+                if message is None:
+                    self.event_ids.intern(values)
+                else:
+                    errors[values['event_id']] = message
+
+        messages = self._batched_mutation(
+            name="DeleteEventIDs",
+            field="deleteEventId",
+            input_type="DeleteEventIDMutationInput!",
+            inputs=[{'event_id': event_id} for event_id in deletes]
+        )
+        for event_id, message in zip(deletes, messages):
+            if message is None:
+                self.event_ids.discard(event_id)
+            else:
+                errors[event_id] = message
+
+        logger.info(
+            f"Created {len(creates)}, updated {len(updates)} and deleted {len(deletes)} Event IDs, "
+            f"with {len(errors)} failures"
+        )
+
+        event_ids = [self.event_ids.get(event_id) for event_id in desired if event_id in self.event_ids]
+        if errors:
+            raise EventIDUpsertError(event_ids, errors)
+        return event_ids
+
+    def _get_event_ids(self, event_ids):
+        """Request many Event IDs from GWCloud using batched requests, updating the shared instances in the registry
+
+        Parameters
+        ----------
+        event_ids : list
+            IDs of the events, of the form GW123456_123456
+
+        Returns
+        -------
+        dict
+            Dictionary mapping each event id to its EventID, or None if the Event ID could not be found
+        """
+        results = {}
+        for chunk in chunked(event_ids, GWCLOUD_BATCH_SIZE):
+            query = batched_operation(
+                operation="query",
+                name="EventIDs",
+                field="eventId",
+                argument="eventId",
+                argument_type="String!",
+                selection="{ eventId triggerId nickname isLigoEvent gpsTime }",
+                count=len(chunk)
+            )
+            data, _ = self.client.request_partial(query=query, variables=batched_variables("event_id", chunk))
+            for event_id, result in zip(chunk, batched_results(data or {}, len(chunk))):
+                results[event_id] = self.event_ids.intern(result)
+
+        return results
@@ -0,0 +1,278 @@
+import sqlite3
+from dataclasses import asdict
+from datetime import datetime, timezone
+
+from gwdc_python.helpers import TimeRange
+from gwdc_python.logger import create_logger
+
+logger = create_logger(__name__)
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS event_ids (
+        event_id TEXT PRIMARY KEY,
+        trigger_id TEXT,
+        nickname TEXT,
+        is_ligo_event INTEGER,
+        gps_time REAL
+    );
+
+    CREATE TABLE IF NOT EXISTS jobs (
+        id TEXT PRIMARY KEY,
+        name TEXT,
+        description TEXT,
+        user TEXT,
+        status TEXT,
+        status_date TEXT,
+        event_id TEXT
+    );
+
+    CREATE INDEX IF NOT EXISTS jobs_user ON jobs (user);
+    CREATE INDEX IF NOT EXISTS jobs_event_id ON jobs (event_id);
+
+    CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5 (job_id UNINDEXED, name, description);
+
+    CREATE TABLE IF NOT EXISTS sync_state (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+"""
+
+_SELECT_JOBS = """
+    SELECT jobs.id, jobs.name, jobs.description, jobs.user, jobs.status, jobs.status_date,
+        event_ids.event_id, event_ids.trigger_id, event_ids.nickname, event_ids.is_ligo_event, event_ids.gps_time
+    FROM jobs
+    LEFT JOIN event_ids ON event_ids.event_id = jobs.event_id
+"""
+
+
+def _fts_query(search):
+    # Quote each search term so that user input can't be interpreted as FTS5 syntax, and allow prefix matches
+    terms = ['"{}"*'.format(term.replace('"', '""')) for term in search.split()]
+    return ' '.join(terms)
+
+
+class JobCatalogue:
+    """
+    JobCatalogue is a local SQLite mirror of the public Bilby job list, which can be searched offline.
+    Job names and descriptions are indexed for full text search, and the catalogue is kept up to date
+    by incrementally syncing from the public job listing of GWCloud.
+
+    Parameters
+    ----------
+    client : ~gwcloud_python.gwcloud.GWCloud
+        A reference to the GWCloud object instance used to sync the catalogue
+    path : str or ~pathlib.Path, optional
+        Path to the SQLite database file, by default ":memory:"
+    """
+
+    def __init__(self, client, path=":memory:"):
+        self.client = client
+        self.connection = sqlite3.connect(str(path))
+        self.connection.executescript(_SCHEMA)
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def close(self):
+        """Close the connection to the catalogue database"""
+        self.connection.close()
+
+    @property
+    def last_synced(self):
+        """The time at which the catalogue was last synced, or None if it has never been synced
+
+        Returns
+        -------
+        ~datetime.datetime or None
+        """
+        row = self.connection.execute("SELECT value FROM sync_state WHERE key = 'last_synced'").fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def _upsert_event_id(self, event_id):
+        self.connection.execute(
+            """
+                INSERT INTO event_ids (event_id, trigger_id, nickname, is_ligo_event, gps_time)
+                VALUES (:event_id, :trigger_id, :nickname, :is_ligo_event, :gps_time)
+                ON CONFLICT (event_id) DO UPDATE SET
+                    trigger_id = excluded.trigger_id,
+                    nickname = excluded.nickname,
+                    is_ligo_event = excluded.is_ligo_event,
+                    gps_time = COALESCE(excluded.gps_time, event_ids.gps_time)
+            """,
+            {
+                "event_id": event_id['event_id'],
+                "trigger_id": event_id.get('trigger_id'),
+                "nickname": event_id.get('nickname'),
+                "is_ligo_event": event_id.get('is_ligo_event', False),
+                "gps_time": event_id.get('gps_time'),
+            }
+        )
+
+    def _upsert_job(self, job):
+        """Insert or update a job from the public job listing
+
+        Returns
+        -------
+        bool
+            True if the job was new or had changed, False if the catalogue was already up to date
+        """
+        event_id = job.get('event_id')
+        if event_id:
+            self._upsert_event_id(event_id)
+
+        row = (
+            str(job['id']),
+            job['name'],
+            job['description'],
+            job['user'],
+            job['job_status']['name'],
+            job['job_status']['date'],
+            event_id['event_id'] if event_id else None,
+        )
+
+        existing = self.connection.execute(
+            "SELECT id, name, description, user, status, status_date, event_id FROM jobs WHERE id = ?",
+            row[:1]
+        ).fetchone()
+
+        if existing == row:
+            return False
+
+        self.connection.execute("INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?)", row)
+        self.connection.execute("DELETE FROM jobs_fts WHERE job_id = ?", row[:1])
+        self.connection.execute("INSERT INTO jobs_fts (job_id, name, description) VALUES (?, ?, ?)", row[:3])
+        return True
+
+    def sync(self, full=False, page_size=100):
+        """Update the catalogue from the public job list of GWCloud.
+
+        The public job list is returned with the most recently changed jobs first, so by default the sync stops as
+        soon as an entire page of results is already up to date in the catalogue. Jobs which have been deleted or made
+        private are only removed from the catalogue by a full sync, which sees the entire list.
+
+        Parameters
+        ----------
+        full : bool, optional
+            If True, walk the entire public job list rather than stopping at the first unchanged page, and remove the
+            jobs which are no longer in the list, by default False
+        page_size : int, optional
+            Number of jobs to obtain in each request, by default 100
+
+        Returns
+        -------
+        int
+            Number of jobs that were added or updated
+        """
+        updated = 0
+        seen = set()
+        with self.connection:
+            for event_id in self.client.get_all_event_ids():
+                self._upsert_event_id(asdict(event_id))
+
+            for page in self.client._get_public_job_pages(time_range=TimeRange.ANY, page_size=page_size):
+                page_updates = sum(self._upsert_job(job) for job in page)
+                seen.update(str(job['id']) for job in page)
+                updated += page_updates
+                if not page_updates and not full:
+                    break
+
+            removed = []
+            if full:
+                removed = [
+                    row for row in self.connection.execute("SELECT id FROM jobs").fetchall() if row[0] not in seen
+                ]
+                self.connection.executemany("DELETE FROM jobs WHERE id = ?", removed)
+                self.connection.executemany("DELETE FROM jobs_fts WHERE job_id = ?", removed)
+
+            self.connection.execute(
+                "INSERT OR REPLACE INTO sync_state (key, value) VALUES ('last_synced', ?)",
+                (datetime.now(timezone.utc).isoformat(),)
+            )
+
+        logger.info(f'Job catalogue sync updated {updated} jobs and removed {len(removed)} jobs.')
+        return updated
+
+    def _row_to_job(self, row):
+        job_id, name, description, user, status, status_date, event_id, trigger_id, nickname, is_ligo, gps = row
+        return self.client._get_job_model_from_query({
+            'id': job_id,
+            'name': name,
+            'description': description,
+            'user': user,
+            'job_status': {
+                'name': status,
+                'date': status_date
+            },
+            'event_id': {
+                'event_id': event_id,
+                'trigger_id': trigger_id,
+                'nickname': nickname,
+                'is_ligo_event': bool(is_ligo),
+                'gps_time': gps
+            } if event_id else None
+        })
+
+    def search(self, search="", user=None, status=None, event_id=None, number=None):
+        """Search the catalogue for jobs, matching the search terms against the job names and descriptions
+
+        Parameters
+        ----------
+        search : str, optional
+            Search terms by which to filter the jobs, by default ""
+        user : str, optional
+            Only return jobs run by this user, by default None
+        status : str, optional
+            Only return jobs with this status name, by default None
+        event_id : ~gwcloud_python.event_id.EventID or str, optional
+            Only return jobs associated with this Event ID, by default None
+        number : int, optional
+            Maximum number of jobs to return, by default all matching jobs are returned
+
+        Returns
+        -------
+        list
+            List of BilbyJob instances for the jobs matching the search
+        """
+        conditions, parameters = [], []
+
+        if search.strip():
+            conditions.append("jobs.id IN (SELECT job_id FROM jobs_fts WHERE jobs_fts MATCH ?)")
+            parameters.append(_fts_query(search))
+
+        if user is not None:
+            conditions.append("jobs.user = ?")
+            parameters.append(user)
+
+        if status is not None:
+            conditions.append("jobs.status = ?")
+            parameters.append(status)
+
+        if event_id is not None:
+            conditions.append("jobs.event_id = ?")
+            parameters.append(getattr(event_id, 'event_id', event_id))
+
+        query = _SELECT_JOBS
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY jobs.status_date DESC"
+        if number is not None:
+            query += " LIMIT ?"
+            parameters.append(number)
+
+        return [self._row_to_job(row) for row in self.connection.execute(query, parameters)]
+
+    def get_job_by_id(self, job_id):
+        """Get a Bilby job instance from the catalogue corresponding to a specific job ID
+
+        Parameters
+        ----------
+        job_id : str
+            ID of job to obtain
+
+        Returns
+        -------
+        BilbyJob or None
+            BilbyJob instance corresponding to the input ID, or None if the job is not in the catalogue
+        """
+        row = self.connection.execute(_SELECT_JOBS + " WHERE jobs.id = ?", (str(job_id),)).fetchone()
+        return self._row_to_job(row) if row else None
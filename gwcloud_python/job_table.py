@@ -0,0 +1,270 @@
+from datetime import datetime, timezone
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CATEGORICAL_COLUMNS = ('user', 'status', 'event_id')
+COLUMNS = ('id', 'name', 'description', 'user', 'status', 'status_date', 'event_id')
+
+_NUMPY_REQUIRED = "JobTable requires NumPy, which can be installed with 'pip install gwcloud-python[table]'"
+
+
+def _parse_date(date):
+    try:
+        parsed = datetime.fromisoformat(date.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+class _CategoryEncoder:
+    def __init__(self):
+        self.codes = {}
+        self.categories = []
+
+    def encode(self, value):
+        if value is None:
+            return -1
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.categories)
+            self.categories.append(value)
+        return code
+
+
+class JobTable:
+    """
+    JobTable is a columnar representation of a list of Bilby jobs, in which each job attribute is stored in a NumPy
+    array. The user, status and event_id columns are categorical, storing an integer code for each job along with
+    the list of distinct values. This allows large job lists to be analysed and filtered without creating a
+    :class:`~gwcloud_python.bilby_job.BilbyJob` for every job.
+
+    Requires NumPy, which can be installed with ``pip install gwcloud-python[table]``
+
+    Parameters
+    ----------
+    client : ~gwcloud_python.gwcloud.GWCloud
+        A reference to the GWCloud object instance from which the jobs were obtained
+    columns : dict
+        Dictionary mapping the non-categorical column names to arrays
+    codes : dict
+        Dictionary mapping the categorical column names to arrays of integer codes, where -1 denotes a missing value
+    categories : dict
+        Dictionary mapping the categorical column names to arrays of the distinct values in each column
+    event_ids : dict
+        Dictionary mapping each event id to the Event ID data returned for it
+    """
+
+    def __init__(self, client, columns, codes, categories, event_ids):
+        if np is None:
+            raise ImportError(_NUMPY_REQUIRED)
+
+        self.client = client
+        self.columns = columns
+        self.codes = codes
+        self.categories = categories
+        self.event_ids = event_ids
+
+    @classmethod
+    def from_query(cls, client, query_data):
+        """Build a JobTable directly from the job data returned by a GWCloud query
+
+        Parameters
+        ----------
+        client : ~gwcloud_python.gwcloud.GWCloud
+            A reference to the GWCloud object instance from which the jobs were obtained
+        query_data : list
+            List of job data dictionaries, as found in the nodes of a job list query
+
+        Returns
+        -------
+        JobTable
+        """
+        if np is None:
+            raise ImportError(_NUMPY_REQUIRED)
+
+        encoders = {column: _CategoryEncoder() for column in CATEGORICAL_COLUMNS}
+        values = {column: [] for column in COLUMNS}
+        event_ids = {}
+
+        for job in query_data:
+            event_id = job.get('event_id')
+            if event_id:
+                event_ids[event_id['event_id']] = event_id
+
+            values['id'].append(job['id'])
+            values['name'].append(job['name'])
+            values['description'].append(job['description'])
+            values['status_date'].append(job['job_status']['date'])
+            values['user'].append(encoders['user'].encode(job['user']))
+            values['status'].append(encoders['status'].encode(job['job_status']['name']))
+            values['event_id'].append(encoders['event_id'].encode(event_id['event_id'] if event_id else None))
+
+        columns = {
+            'id': np.array(values['id'], dtype=object),
+            'name': np.array(values['name'], dtype=object),
+            'description': np.array(values['description'], dtype=object),
+            'status_date': np.array(
+                [np.datetime64(_parse_date(date) or 'NaT', 'us') for date in values['status_date']],
+                dtype='datetime64[us]'
+            ),
+            # The original date strings are kept so that jobs can be recreated exactly
+            'status_date_text': np.array(values['status_date'], dtype=object),
+        }
+        codes = {column: np.array(values[column], dtype=np.int32) for column in CATEGORICAL_COLUMNS}
+        categories = {column: np.array(encoders[column].categories, dtype=object) for column in CATEGORICAL_COLUMNS}
+
+        return cls(client, columns, codes, categories, event_ids)
+
+    def __len__(self):
+        return len(self.columns['id'])
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(jobs={len(self)})"
+
+    def __getitem__(self, column):
+        """Get the values of a column as an array. Missing categorical values are returned as None
+
+        Parameters
+        ----------
+        column : str
+            Name of the column, one of 'id', 'name', 'description', 'user', 'status', 'status_date' or 'event_id'
+
+        Returns
+        -------
+        ~numpy.ndarray
+        """
+        if column not in CATEGORICAL_COLUMNS:
+            return self.columns[column]
+
+        codes = self.codes[column]
+        values = np.append(self.categories[column], None)
+        return values[codes]
+
+    def _mask_for(self, column, value):
+        values = value if isinstance(value, (list, tuple, set, frozenset)) else [value]
+        lookup = {category: code for code, category in enumerate(self.categories[column])}
+        # Missing values have a code of -1, and values not in the table can't match any code
+        wanted = [-1 if v is None else lookup.get(getattr(v, 'event_id', v), -2) for v in values]
+        return np.isin(self.codes[column], wanted)
+
+    def filter(self, mask):
+        """Create a subset of this table from a boolean mask or an array of row indices
+
+        Parameters
+        ----------
+        mask : ~numpy.ndarray
+            Boolean array with one entry for each job, or array of the row indices to keep
+
+        Returns
+        -------
+        JobTable
+            New table containing only the selected rows
+        """
+        return self.__class__(
+            self.client,
+            {column: values[mask] for column, values in self.columns.items()},
+            {column: codes[mask] for column, codes in self.codes.items()},
+            self.categories,
+            self.event_ids
+        )
+
+    def where(self, user=None, status=None, event_id=None, after=None, before=None):
+        """Create a subset of this table by matching column values. Each argument may be a single value or a
+        list of accepted values, and only rows matching every provided argument are kept
+
+        Parameters
+        ----------
+        user : str or list, optional
+            User, or users, that ran the jobs
+        status : str or list, optional
+            Status name, or names, of the jobs
+        event_id : ~gwcloud_python.event_id.EventID or str or list, optional
+            Event ID, or IDs, associated with the jobs. Include None in a list to match jobs without an Event ID
+        after : str or ~datetime.datetime, optional
+            Only keep jobs with a status date on or after this time
+        before : str or ~datetime.datetime, optional
+            Only keep jobs with a status date before this time
+
+        Returns
+        -------
+        JobTable
+            New table containing only the matching rows
+        """
+        mask = np.ones(len(self), dtype=bool)
+        for column, value in (('user', user), ('status', status), ('event_id', event_id)):
+            if value is not None:
+                mask &= self._mask_for(column, value)
+
+        if after is not None:
+            mask &= self.columns['status_date'] >= np.datetime64(after, 'us')
+        if before is not None:
+            mask &= self.columns['status_date'] < np.datetime64(before, 'us')
+
+        return self.filter(mask)
+
+    def value_counts(self, column):
+        """Count the number of jobs with each value of a categorical column
+
+        Parameters
+        ----------
+        column : str
+            Name of the categorical column, one of 'user', 'status' or 'event_id'
+
+        Returns
+        -------
+        dict
+            Dictionary mapping each value to the number of jobs with that value
+        """
+        counts = np.bincount(self.codes[column][self.codes[column] >= 0], minlength=len(self.categories[column]))
+        return {value: int(count) for value, count in zip(self.categories[column], counts) if count}
+
+    def to_jobs(self, rows=None):
+        """Convert rows of the table into BilbyJob instances
+
+        Parameters
+        ----------
+        rows : ~numpy.ndarray, optional
+            Boolean mask or row indices of the jobs to convert, by default all rows are converted
+
+        Returns
+        -------
+        list
+            List of BilbyJob instances
+        """
+        table = self if rows is None else self.filter(rows)
+        users, statuses, event_ids = table['user'], table['status'], table['event_id']
+
+        return [
+            self.client._get_job_model_from_query({
+                'id': table.columns['id'][i],
+                'name': table.columns['name'][i],
+                'description': table.columns['description'][i],
+                'user': users[i],
+                'job_status': {
+                    'name': statuses[i],
+                    'date': table.columns['status_date_text'][i]
+                },
+                'event_id': self.event_ids.get(event_ids[i])
+            })
+            for i in range(len(table))
+        ]
+
+    def to_pandas(self):
+        """Convert the table to a pandas DataFrame, with categorical dtypes for the categorical columns
+
+        Returns
+        -------
+        ~pandas.DataFrame
+        """
+        import pandas as pd
+
+        return pd.DataFrame({
+            column: pd.Categorical.from_codes(self.codes[column], categories=self.categories[column])
+            if column in CATEGORICAL_COLUMNS else self.columns[column]
+            for column in COLUMNS
+        })
@@ -5,3 +5,87 @@ GWCLOUD_FILE_DOWNLOAD_ENDPOINT = GWDC_FILE_DOWNLOAD_ENDPOINT
 GWCLOUD_UPLOADED_JOB_FILE_DOWNLOAD_ENDPOINT = (
     "https://gwcloud.org.au/file_download/?fileId="
 )
+
+# Send GraphQL queries as a hash of the query document, only sending the full document if the server hasn't seen it
+GWCLOUD_PERSISTED_QUERIES = False
+
+# Maximum number of aliased operations sent in a single batched GraphQL request
+GWCLOUD_BATCH_SIZE = 100
+
+# Polling intervals (in seconds) used when watching job statuses. The interval grows by the backoff factor each time a
+# poll sees no status changes, up to the maximum, and resets to the minimum when a change is seen
+GWCLOUD_WATCH_MIN_INTERVAL = 5
+GWCLOUD_WATCH_MAX_INTERVAL = 300
+GWCLOUD_WATCH_BACKOFF = 2
+
+# Timeouts (in seconds) for connecting to GWCloud and for waiting on a response to a GraphQL request
+GWCLOUD_CONNECT_TIMEOUT = 10
+GWCLOUD_READ_TIMEOUT = 300
+
+# Timeout (in seconds) for waiting on the response to a file upload. The server only responds once it has processed
+# the upload, which can take much longer than a query, and uploads which may have created a job are not retried, so by
+# default there is no read timeout
+GWCLOUD_UPLOAD_READ_TIMEOUT = None
+
+# Number of times a failed query is retried after a connection error, timeout or temporary server error. The delay
+# before each retry starts at the backoff (in seconds) and doubles with every attempt
+GWCLOUD_MAX_RETRIES = 3
+GWCLOUD_RETRY_BACKOFF = 0.5
+
+# Mutations that can safely be sent more than once, and so are retried in the same way as queries
+GWCLOUD_IDEMPOTENT_MUTATIONS = (
+    "ResultFileMutation",
+    "UpdateEventIDMutation",
+    "BilbyJobEventIDMutation",
+    "SupportingFilesUploadMutation",
+    "UploadBilbyJobPartMutation",
+)
+
+# Maximum number of connections kept open to GWCloud
+GWCLOUD_POOL_SIZE = 10
+
+# Request bodies larger than this many bytes are gzip compressed. Requires server support, so disabled when None
+GWCLOUD_COMPRESSION_THRESHOLD = None
+
+# Identical queries made at the same time from several threads share a single request
+GWCLOUD_COALESCE_REQUESTS = True
+
+# Number of bytes read from a file at a time when uploading it
+GWCLOUD_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Maximum number of bytes of a streamed job archive held in memory while waiting to be uploaded
+GWCLOUD_ARCHIVE_PIPE_SIZE = 16 * 1024 * 1024
+
+# Job archives which are not written to the job directory are held in memory up to this many bytes, and are otherwise
+# written to the system temporary directory, so that their size is known when they are uploaded
+GWCLOUD_ARCHIVE_SPOOL_SIZE = 64 * 1024 * 1024
+
+# Compression used for job archives, one of "none", "gzip", "parallel_gzip" or "zstd". The parallel_gzip and zstd codecs
+# use a thread for each CPU unless the number of threads is set
+GWCLOUD_ARCHIVE_CODEC = "gzip"
+GWCLOUD_ARCHIVE_THREADS = None
+
+# Size of the blocks of data compressed in parallel by the parallel_gzip codec, which are joined into a single gzip
+# member
+GWCLOUD_ARCHIVE_BLOCK_SIZE = 1024 * 1024
+
+# Job archives uploaded in parts are split into parts of this many bytes, of which at most the given number are
+# uploaded at once
+GWCLOUD_UPLOAD_PART_SIZE = 64 * 1024 * 1024
+GWCLOUD_UPLOAD_WORKERS = 4
+
+# Suffix added to the path of a job archive to give the path of the journal recording the parts that have been uploaded
+GWCLOUD_UPLOAD_JOURNAL_SUFFIX = ".upload.json"
+
+# Supporting files are uploaded in batches of at most this many bytes and files, except that a file larger than the
+# limit is uploaded in a batch of its own
+GWCLOUD_SUPPORTING_FILES_BATCH_BYTES = 64 * 1024 * 1024
+GWCLOUD_SUPPORTING_FILES_BATCH_FILES = 20
+
+# Upload tokens are reused until they expire, less the margin (in seconds). Tokens which don't state when they expire
+# are reused for the given number of seconds
+GWCLOUD_UPLOAD_TOKEN_TTL = 60 * 60
+GWCLOUD_UPLOAD_TOKEN_MARGIN = 60
+
+# Path to a local ledger of uploaded jobs, used to skip uploading the same job twice. Disabled when None
+GWCLOUD_UPLOAD_LEDGER = None
@@ -0,0 +1,22 @@
+import pytest
+
+from .stand_in_server import StandInGraphQLServer
+
+
+def _resolve_bilby_job(id):
+    if id == 'missing':
+        raise KeyError(id)
+    return {
+        'id': id,
+        'name': 'test_name',
+        'user': 'Test User',
+        'description': 'test description',
+        'jobStatus': {'name': 'Completed', 'date': '2021-12-02'},
+        'eventId': None,
+    }
+
+
+@pytest.fixture
+def server():
+    with StandInGraphQLServer({'bilbyJob': _resolve_bilby_job}) as server:
+        yield server
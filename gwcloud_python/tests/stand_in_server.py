@@ -0,0 +1,239 @@
+"""A minimal local stand-in for the GWCloud GraphQL server, used to test the client transport offline."""
+import gzip
+import json
+import re
+import threading
+from hashlib import sha256
+from uuid import uuid4
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_NAME = re.compile(rb'name="([^"]*)"')
+_FILE_NAME = re.compile(rb'filename="([^"]*)"')
+_FIELD = re.compile(r'\s*(?:(\w+)\s*:\s*)?(\w+)\s*(\(([^)]*)\))?\s*')
+_ARGUMENT = re.compile(r'(\w+)\s*:\s*\$(\w+)')
+
+
+def _root_fields(query):
+    """Yield the alias, field name and arguments of each root field of a GraphQL document"""
+    body = query[query.index('{') + 1:query.rindex('}')]
+    position = 0
+    while position < len(body):
+        match = _FIELD.match(body, position)
+        if not match or not match.group(2):
+            break
+        alias, name, _, arguments = match.groups()
+        position = match.end()
+        if position < len(body) and body[position] == '{':
+            depth = 0
+            for position in range(position, len(body)):
+                depth += {'{': 1, '}': -1}.get(body[position], 0)
+                if depth == 0:
+                    break
+            position += 1
+        yield alias or name, name, dict(_ARGUMENT.findall(arguments or ''))
+
+
+def _parse_multipart(body, content_type):
+    """Parse a GraphQL multipart request, replacing each file in the variables with its name and contents"""
+    boundary = b'--' + content_type.split('boundary=')[1].encode('utf-8')
+    fields, files = {}, {}
+    for part in body.split(boundary)[1:-1]:
+        head, _, content = part[2:-2].partition(b'\r\n\r\n')
+        name = _NAME.search(head).group(1).decode('utf-8')
+        file_name = _FILE_NAME.search(head)
+        if file_name:
+            files[name] = {'name': file_name.group(1).decode('utf-8'), 'content': content}
+        else:
+            fields[name] = content
+
+    payload = json.loads(fields['operations'])
+    for name, paths in json.loads(fields['map']).items():
+        for path in paths:
+            *parents, key = path.split('.')
+            target = payload
+            for parent in parents:
+                target = target[int(parent) if isinstance(target, list) else parent]
+            target[int(key) if isinstance(target, list) else key] = files[name]
+    return payload, files
+
+
+class StandInUploadSessions:
+    """Resolvers for the chunked job upload protocol, which keep the uploaded parts in memory.
+
+    Attributes
+    ----------
+    sessions : dict
+        Maps each session ID to the details of the job and a dictionary of its uploaded parts, by part ID
+    part_numbers : list
+        Number of each part uploaded, in the order they were received
+    failing_parts : set
+        Numbers of the parts which fail the next time they are uploaded
+    archives : dict
+        Maps the ID of each job created by a completed upload to the contents of its archive
+    """
+
+    def __init__(self):
+        self.sessions = {}
+        self.part_numbers = []
+        self.failing_parts = set()
+        self.archives = {}
+
+    def resolvers(self):
+        return {
+            'generateBilbyJobUploadToken': lambda: {'token': 'upload_token'},
+            'createBilbyJobUploadSession': self._create_session,
+            'uploadBilbyJobPart': self._upload_part,
+            'completeBilbyJobUploadSession': self._complete_session,
+        }
+
+    def _create_session(self, input):
+        session_id = uuid4().hex
+        self.sessions[session_id] = {'details': input['details'], 'size': input['size'], 'parts': {}}
+        return {'result': {'sessionId': session_id}}
+
+    def _upload_part(self, input):
+        number = input['partNumber']
+        self.part_numbers.append(number)
+        if number in self.failing_parts:
+            self.failing_parts.discard(number)
+            raise Exception(f'Part {number} failed')
+
+        part_id = f'{number}-{sha256(input["part"]["content"]).hexdigest()}'
+        self.sessions[input['sessionId']]['parts'][part_id] = input['part']['content']
+        return {'result': {'partId': part_id}}
+
+    def _complete_session(self, input):
+        session = self.sessions.pop(input['sessionId'])
+        archive = b''.join(session['parts'][part_id] for part_id in input['partIds'])
+        if len(archive) != session['size']:
+            raise Exception('The uploaded archive is incomplete')
+
+        job_id = str(len(self.archives) + 1)
+        self.archives[job_id] = archive
+        return {'result': {'jobId': job_id}}
+
+
+class StandInGraphQLServer:
+    """Serves GraphQL requests on localhost, answering each root field with a resolver function.
+
+    Parameters
+    ----------
+    resolvers : dict
+        Maps root field names to functions, which are called with the field arguments as keyword arguments
+    persisted_queries : bool, optional
+        If True, the server supports automatic persisted queries, by default True
+
+    Attributes
+    ----------
+    failures : list
+        HTTP status codes returned, in order, in place of the next responses
+    uploads : list
+        The files sent in each multipart request, as dictionaries mapping the part name to the file name and contents
+    """
+
+    def __init__(self, resolvers, persisted_queries=True):
+        self.resolvers = {'sessionUser': lambda: {'isAuthenticated': True}, **resolvers}
+        self.persisted_queries = persisted_queries
+        self.stored_queries = {}
+        self.request_bytes = 0
+        self.requests = []
+        self.request_headers = []
+        self.uploads = []
+        self.failures = []
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.endpoint = f'http://127.0.0.1:{self._server.server_address[1]}/graphql'
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_counters(self):
+        self.request_bytes = 0
+        self.requests = []
+        self.request_headers = []
+        self.uploads = []
+
+    def _execute(self, payload):
+        query = payload.get('query')
+        persisted = (payload.get('extensions') or {}).get('persistedQuery')
+
+        if persisted:
+            if not self.persisted_queries:
+                return {'errors': [{'message': 'PersistedQueryNotSupported'}]}
+            if query is None:
+                query = self.stored_queries.get(persisted['sha256Hash'])
+                if query is None:
+                    return {'errors': [{'message': 'PersistedQueryNotFound'}]}
+            elif sha256(query.encode('utf-8')).hexdigest() == persisted['sha256Hash']:
+                self.stored_queries[persisted['sha256Hash']] = query
+
+        if query is None:
+            return {'errors': [{'message': 'Must provide query string.'}]}
+
+        variables = payload.get('variables') or {}
+        data, errors = {}, []
+        for alias, name, arguments in _root_fields(query):
+            try:
+                data[alias] = self.resolvers[name](**{
+                    argument: variables.get(variable) for argument, variable in arguments.items()
+                })
+            except Exception as e:
+                data[alias] = None
+                errors.append({'message': str(e), 'path': [alias]})
+
+        return {'data': data, 'errors': errors} if errors else {'data': data}
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _read_body(self):
+                if self.headers.get('Transfer-Encoding') != 'chunked':
+                    return self.rfile.read(int(self.headers['Content-Length']))
+
+                body = bytearray()
+                while True:
+                    size = int(self.rfile.readline().split(b';')[0], 16)
+                    if not size:
+                        self.rfile.readline()
+                        return bytes(body)
+                    body += self.rfile.read(size)
+                    self.rfile.readline()
+
+            def do_POST(self):
+                body = self._read_body()
+                server.request_bytes += len(body)
+                server.request_headers.append(dict(self.headers))
+                if self.headers.get('Content-Encoding') == 'gzip':
+                    body = gzip.decompress(body)
+                if self.headers.get('Content-Type', '').startswith('multipart/form-data'):
+                    payload, files = _parse_multipart(body, self.headers['Content-Type'])
+                    server.uploads.append(files)
+                else:
+                    payload = json.loads(body)
+                server.requests.append(payload)
+
+                if server.failures:
+                    self.send_response(server.failures.pop(0))
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                response = json.dumps(server._execute(payload)).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                    response = gzip.compress(response)
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(response)))
+                self.end_headers()
+                self.wfile.write(response)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
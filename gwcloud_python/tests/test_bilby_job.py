@@ -1,5 +1,8 @@
+import types
+
 import pytest
 from gwdc_python.files.constants import GWDCObjectType
+from gwdc_python.helpers import JobStatus
 
 from gwcloud_python import BilbyJob, FileReference, FileReferenceList, EventID
 from gwcloud_python.utils import file_filters
@@ -252,3 +255,132 @@ def test_bilbyjob_set_event_id(mock_bilby_job, update_query):
             }
         }
     )
+
+
+def test_bilby_job_compact_attributes(mock_bilby_job):
+    bilby_job = mock_bilby_job({})
+
+    # GWDCObjectBase has no __slots__, so the job has an instance dict, but every field is stored in a slot
+    assert all(isinstance(getattr(BilbyJob, name), types.MemberDescriptorType) for name in BilbyJob.__slots__)
+    assert bilby_job.__dict__ == {}
+    assert not hasattr(bilby_job.event_id, '__dict__')
+    assert bilby_job.status == JobStatus(status='Completed', date='2021-12-02')
+    assert bilby_job.other == {}
+
+    bilby_job.status = JobStatus(status='Error', date='2021-12-03')
+    bilby_job.other['extra'] = 'value'
+    assert bilby_job.status == JobStatus(status='Error', date='2021-12-03')
+    assert bilby_job.other == {'extra': 'value'}
+
+
+def test_bilbyjob_set_event_id_known(mock_bilby_job_update, update_query):
+    bilby_job = mock_bilby_job_update
+    event_id = EventID(event_id='GW111111', nickname='known')
+
+    bilby_job.set_event_id(event_id=event_id)
+    assert bilby_job.event_id is event_id
+    bilby_job.client.get_event_id.assert_not_called()
+
+
+def test_bilbyjob_edit(mock_bilby_job_update, update_query):
+    bilby_job = mock_bilby_job_update
+    event_id = EventID(event_id='GW111111')
+
+    with bilby_job.edit():
+        bilby_job.set_name(name='ADifferentName')
+        bilby_job.set_description(description='A different description')
+        bilby_job.set_event_id(event_id=event_id)
+        bilby_job.client.request.assert_not_called()
+
+    assert bilby_job.name == 'ADifferentName'
+    assert bilby_job.description == 'A different description'
+    assert bilby_job.event_id is event_id
+    bilby_job.client.request.assert_called_once_with(
+        query=update_query,
+        variables={
+            'input': {
+                'job_id': bilby_job.id,
+                'name': 'ADifferentName',
+                'description': 'A different description',
+                'event_id': 'GW111111'
+            }
+        }
+    )
+    bilby_job.client.get_event_id.assert_not_called()
+
+
+@pytest.mark.parametrize('initial_event_id', [EventID(event_id='GW123456'), None])
+def test_bilbyjob_edit_event_id_assigned(mock_bilby_job_update, update_query, initial_event_id):
+    bilby_job = mock_bilby_job_update
+    bilby_job.event_id = initial_event_id
+    bilby_job.client.get_event_id.return_value = EventID(event_id='GW111111')
+
+    with bilby_job.edit():
+        bilby_job.event_id = 'GW111111'
+
+    assert bilby_job.event_id == EventID(event_id='GW111111')
+    bilby_job.client.get_event_id.assert_called_once_with(event_id='GW111111')
+    bilby_job.client.request.assert_called_once_with(
+        query=update_query,
+        variables={
+            'input': {
+                'job_id': bilby_job.id,
+                'event_id': 'GW111111'
+            }
+        }
+    )
+
+
+def test_bilbyjob_edit_event_id_removed(mock_bilby_job_update, update_query):
+    bilby_job = mock_bilby_job_update
+
+    with bilby_job.edit():
+        bilby_job.event_id = None
+
+    assert bilby_job.event_id is None
+    bilby_job.client.request.assert_called_once_with(
+        query=update_query,
+        variables={'input': {'job_id': bilby_job.id, 'event_id': ''}}
+    )
+
+
+def test_bilbyjob_edit_event_id_invalid(mock_bilby_job_update):
+    bilby_job = mock_bilby_job_update
+    event_id = bilby_job.event_id
+
+    with pytest.raises(Exception, match='must be an EventID, a string or None'):
+        with bilby_job.edit():
+            bilby_job.event_id = 123456
+
+    assert bilby_job.event_id is event_id
+    bilby_job.client.request.assert_not_called()
+
+
+def test_bilbyjob_edit_unchanged(mock_bilby_job_update):
+    bilby_job = mock_bilby_job_update
+
+    with bilby_job.edit():
+        bilby_job.name = 'ADifferentName'
+        bilby_job.name = 'TestName'
+
+    bilby_job.client.request.assert_not_called()
+
+
+def test_bilbyjob_edit_rollback(mock_bilby_job_update):
+    bilby_job = mock_bilby_job_update
+    bilby_job.client.request.side_effect = Exception('Update failed')
+    event_id = bilby_job.event_id
+
+    with pytest.raises(Exception, match='Update failed'):
+        with bilby_job.edit():
+            bilby_job.set_name(name='ADifferentName')
+            bilby_job.set_event_id(event_id=None)
+
+    assert bilby_job.name == 'TestName'
+    assert bilby_job.event_id is event_id
+
+    # The job can be edited again after a failed session
+    bilby_job.client.request.side_effect = None
+    with bilby_job.edit():
+        bilby_job.set_description(description='A different description')
+    assert bilby_job.client.request.call_count == 2
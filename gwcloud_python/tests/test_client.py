@@ -0,0 +1,164 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+from gwdc_python.exceptions import GWDCUnknownException
+
+from gwcloud_python import GWCloud
+
+
+def test_request_instrumentation(server):
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint, instrument=True)
+    gwc.get_job_by_id('job_id')
+    gwc.get_job_by_id('job_id')
+
+    summary = gwc.request_stats.summary()
+    assert summary['sessionUser']['count'] == 1
+    assert summary['bilbyJob']['count'] == 2
+    assert summary['bilbyJob']['errors'] == 0
+    assert summary['bilbyJob']['request_bytes'] > 0
+    assert summary['bilbyJob']['response_bytes'] > 0
+    assert summary['bilbyJob']['latency_p50'] > 0
+
+
+def test_request_instrumentation_records_errors(server):
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint, instrument=True)
+    with pytest.raises(GWDCUnknownException):
+        gwc.get_job_by_id('missing')
+
+    assert gwc.request_stats.summary()['bilbyJob']['errors'] == 1
+
+
+def test_request_instrumentation_disabled(server):
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint)
+    assert gwc.request_stats is None
+    assert gwc.get_job_by_id('job_id').name == 'test_name'
+
+
+def test_query_retried_after_server_error(server):
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint, instrument=True, retry_backoff=0)
+    server.failures = [502, 503]
+
+    assert gwc.get_job_by_id('job_id').name == 'test_name'
+    assert gwc.request_stats.summary()['bilbyJob']['retries'] == 2
+
+
+def test_query_fails_after_max_retries(server):
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint, max_retries=1, retry_backoff=0)
+    server.failures = [502, 502, 502]
+
+    with pytest.raises(requests.HTTPError):
+        gwc.get_job_by_id('job_id')
+    assert server.failures == [502]
+
+
+def test_mutation_not_retried(server):
+    server.resolvers['deleteEventId'] = lambda input: {'result': True}
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint, retry_backoff=0)
+    server.reset_counters()
+    server.failures = [502]
+
+    with pytest.raises(requests.HTTPError):
+        gwc.delete_event_id('GW123456_123456')
+    assert len(server.requests) == 1
+
+
+def test_idempotent_mutation_retried(server):
+    server.resolvers['generateFileDownloadIds'] = lambda input: {'result': ['id1']}
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint, retry_backoff=0)
+    server.reset_counters()
+    server.failures = [504]
+
+    assert gwc._get_download_ids_from_tokens('job_id', ['token']) == ['id1']
+    assert len(server.requests) == 2
+
+
+def test_request_timeout(server):
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint, timeout=0.1, max_retries=1, retry_backoff=0)
+    server.resolvers['bilbyJob'] = lambda id: time.sleep(0.5)
+
+    with pytest.raises(requests.Timeout):
+        gwc.get_job_by_id('job_id')
+
+
+def test_upload_not_timed_out(server, tmp_path):
+    job_archive = tmp_path / 'job.tar.gz'
+    job_archive.write_bytes(b'archive')
+
+    def upload_bilby_job(input):
+        # The server takes longer than the read timeout of queries to create the job
+        time.sleep(0.5)
+        return {'result': {'jobId': 'uploaded_job'}}
+
+    server.resolvers['generateBilbyJobUploadToken'] = lambda: {'token': 'upload_token'}
+    server.resolvers['uploadBilbyJob'] = upload_bilby_job
+    gwc = GWCloud(
+        token='my_token',
+        endpoint=server.endpoint,
+        timeout=0.1,
+        upload_progress=lambda bytes_sent, total: None
+    )
+
+    assert gwc.upload_job_archive('description', job_archive).id == 'uploaded_job'
+
+    gwc.client.upload_timeout = 0.1
+    with pytest.raises(requests.Timeout):
+        gwc.upload_job_archive('description', job_archive)
+
+
+def test_request_compression(server):
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint, compression_threshold=0)
+    assert gwc.get_job_by_id('job_id').name == 'test_name'
+
+    assert server.request_headers[-1]['Content-Encoding'] == 'gzip'
+    assert server.requests[-1]['variables'] == {'id': 'job_id'}
+
+
+def test_concurrent_queries_coalesced(server):
+    release = threading.Event()
+    calls = []
+
+    resolve_bilby_job = server.resolvers['bilbyJob']
+
+    def wait_to_resolve_bilby_job(id):
+        calls.append(id)
+        release.wait(5)
+        return resolve_bilby_job(id)
+
+    server.resolvers['bilbyJob'] = wait_to_resolve_bilby_job
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint)
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [executor.submit(gwc.get_job_by_id, 'job_id') for _ in range(5)]
+        time.sleep(0.2)
+        release.set()
+        jobs = [future.result() for future in futures]
+
+    assert calls == ['job_id']
+    assert all(job.name == 'test_name' for job in jobs)
+    assert len({id(job) for job in jobs}) == 5
+
+
+def test_concurrent_queries_not_coalesced(server):
+    release = threading.Event()
+    calls = []
+
+    resolve_bilby_job = server.resolvers['bilbyJob']
+
+    def wait_to_resolve_bilby_job(id):
+        calls.append(id)
+        release.wait(5)
+        return resolve_bilby_job(id)
+
+    server.resolvers['bilbyJob'] = wait_to_resolve_bilby_job
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint, coalesce_requests=False)
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(gwc.get_job_by_id, 'job_id') for _ in range(3)]
+        time.sleep(0.2)
+        release.set()
+        [future.result() for future in futures]
+
+    assert calls == ['job_id'] * 3
@@ -0,0 +1,115 @@
+import pytest
+
+from gwcloud_python import GWCloud, EventID, EventIDRegistry
+
+
+@pytest.fixture
+def all_event_ids():
+    return [
+        {
+            'event_id': 'GW150914_095045',
+            'trigger_id': 'S150914a',
+            'nickname': 'GW150914',
+            'is_ligo_event': False,
+            'gps_time': 1126259462.391
+        },
+        {
+            'event_id': 'GW170817_124104',
+            'trigger_id': 'S170817a',
+            'nickname': 'GW170817',
+            'is_ligo_event': False,
+            'gps_time': 1187008882.4
+        },
+        {
+            'event_id': 'GW151226_033853',
+            'trigger_id': None,
+            'nickname': None,
+            'is_ligo_event': True,
+            'gps_time': 1135136350.6
+        },
+    ]
+
+
+@pytest.fixture
+def setup_gwcloud(mocker):
+    def mock_init(self, token, endpoint, custom_error_handler=None):
+        pass
+
+    mocker.patch('gwdc_python.gwdc.GWDC.__init__', mock_init)
+
+    def _setup_gwcloud(*responses):
+        mocker.patch('gwdc_python.gwdc.GWDC.request', mocker.Mock(side_effect=responses))
+        return GWCloud(token='my_token')
+
+    return _setup_gwcloud
+
+
+@pytest.fixture
+def loaded_registry(setup_gwcloud, all_event_ids):
+    gwc = setup_gwcloud({'all_event_ids': all_event_ids})
+    return gwc.event_ids.load()
+
+
+def test_registry_lookups(loaded_registry, all_event_ids):
+    assert len(loaded_registry) == 3
+    assert loaded_registry.loaded
+
+    event = loaded_registry.get('GW150914_095045')
+    assert event == EventID(**all_event_ids[0])
+    assert loaded_registry.get_by_trigger_id('S150914a') is event
+    assert loaded_registry.get_by_nickname('GW150914') is event
+    assert 'GW170817_124104' in loaded_registry
+    assert loaded_registry.get('GW000000_000000') is None
+
+
+def test_registry_gps_time_range(loaded_registry):
+    assert [e.nickname for e in loaded_registry.between(1126259462, 1187008882.4)] == ['GW150914', None, 'GW170817']
+    assert [e.event_id for e in loaded_registry.between(1130000000, 1140000000)] == ['GW151226_033853']
+    assert loaded_registry.between(0, 1) == []
+
+    loaded_registry.intern({'event_id': 'GW151226_033853', 'gps_time': 1.0})
+    assert [e.event_id for e in loaded_registry.between(0, 1)] == ['GW151226_033853']
+
+
+def test_registry_interns_instances():
+    registry = EventIDRegistry(client=None)
+
+    partial = registry.intern({'event_id': 'GW123456', 'nickname': 'old'})
+    full = registry.intern({'event_id': 'GW123456', 'nickname': 'new', 'gps_time': 12.5})
+
+    assert partial is full
+    assert full == EventID(event_id='GW123456', nickname='new', gps_time=12.5)
+    assert registry.get_by_nickname('old') is None
+    assert registry.get_by_nickname('new') is full
+    assert registry.intern(None) is None
+
+    registry.discard(full)
+    assert 'GW123456' not in registry
+
+
+def test_jobs_share_event_ids(setup_gwcloud, all_event_ids):
+    job_data = {
+        'id': 1,
+        'name': 'test_name',
+        'description': 'test description',
+        'user': 'Test User1',
+        'event_id': {'event_id': 'GW150914_095045', 'nickname': 'GW150914'},
+        'job_status': {'name': 'Completed', 'date': '2021-12-02'}
+    }
+    gwc = setup_gwcloud(
+        {'bilby_job': job_data},
+        {'bilby_job': {**job_data, 'id': 2}},
+        {'all_event_ids': all_event_ids},
+    )
+
+    job_1 = gwc.get_job_by_id(1)
+    job_2 = gwc.get_job_by_id(2)
+    assert job_1.event_id is job_2.event_id
+    assert job_1.event_id.gps_time is None
+
+    gwc.get_all_event_ids()
+    assert job_1.event_id.gps_time == all_event_ids[0]['gps_time']
+
+    # Once loaded, Event IDs are answered from the registry without a request
+    assert gwc.get_event_id('GW150914_095045') is job_1.event_id
+    assert gwc.request.call_count == 3
@@ -1,4 +1,6 @@
+import io
 import os
+import tarfile
 import pytest
 from tempfile import NamedTemporaryFile, TemporaryFile
 
@@ -7,6 +9,11 @@ from gwdc_python.files import FileReference, FileReferenceList
 from gwdc_python.helpers import JobStatus
 
 from gwcloud_python import GWCloud, BilbyJob, EventID
+from gwcloud_python.exceptions import EventIDUpsertError
+from gwcloud_python.utils.graphql import parse_operation
+from gwcloud_python.utils.upload_filter import DEFAULT_UPLOAD_FILTER
+
+from .stand_in_server import StandInGraphQLServer, StandInUploadSessions
 
 
 @pytest.fixture
@@ -474,3 +481,596 @@ def test_upload_hdf5_job_private(setup_mock_gwdc, mock_bilby_job, mocker):
         # Clean up temporary files
         os.unlink(hdf5_path)
         os.unlink(ini_path)
+
+
+def test_get_job_statuses_batched(setup_mock_gwdc, mocker):
+    mocker.patch('gwcloud_python.gwcloud.GWCLOUD_BATCH_SIZE', 2)
+    setup_mock_gwdc(None)
+    gwc = GWCloud(token='my_token')
+    gwc.request = mocker.Mock(side_effect=[
+        {
+            'item0': {'job_status': {'name': 'Running', 'date': '2021-12-02'}},
+            'item1': None,
+        },
+        {
+            'item0': {'job_status': {'name': 'Completed', 'date': '2021-12-03'}},
+        },
+    ])
+
+    statuses = gwc._get_job_statuses(['id1', 'id2', 'id3'])
+
+    assert statuses == {
+        'id1': {'name': 'Running', 'date': '2021-12-02'},
+        'id2': None,
+        'id3': {'name': 'Completed', 'date': '2021-12-03'},
+    }
+    assert gwc.request.call_count == 2
+    assert gwc.request.call_args_list[0][1]['variables'] == {'id0': 'id1', 'id1': 'id2'}
+    assert 'item1: bilbyJob (id: $id1)' in gwc.request.call_args_list[0][1]['query']
+    assert gwc.request.call_args_list[1][1]['variables'] == {'id0': 'id3'}
+
+
+def test_update_jobs(server):
+    updated = {}
+
+    def update_bilby_job(input):
+        if input['jobId'] == 'locked':
+            raise Exception('You do not have permission to update this job')
+        updated[input['jobId']] = input
+        return {'result': 'Job saved!'}
+
+    server.resolvers['updateBilbyJob'] = update_bilby_job
+    server.resolvers['eventId'] = lambda eventId: {
+        'eventId': eventId, 'triggerId': 'S123456a', 'nickname': 'GW123', 'isLigoEvent': False, 'gpsTime': 1.0
+    }
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint)
+    jobs = [gwc.get_job_by_id(job_id) for job_id in ['job1', 'job2', 'locked']]
+    server.reset_counters()
+
+    results = gwc.update_jobs({
+        jobs[0]: {'name': 'new_name', 'event_id': 'GW123456_123456'},
+        jobs[1]: {'description': 'new description', 'event_id': None},
+        jobs[2]: {'name': 'locked_name'},
+    })
+
+    assert results == {jobs[0]: None, jobs[1]: None, jobs[2]: 'You do not have permission to update this job'}
+    assert updated == {
+        'job1': {'jobId': 'job1', 'name': 'new_name', 'eventId': 'GW123456_123456'},
+        'job2': {'jobId': 'job2', 'description': 'new description', 'eventId': ''},
+    }
+    # One request for the updates, and one to obtain the new Event ID
+    assert len(server.requests) == 2
+
+    assert jobs[0].name == 'new_name'
+    assert jobs[0].event_id is gwc.event_ids.get('GW123456_123456')
+    assert jobs[0].event_id.nickname == 'GW123'
+    assert jobs[1].description == 'new description'
+    assert jobs[1].event_id is None
+    assert jobs[2].name == 'test_name'
+
+
+def test_update_jobs_request_failure(server, monkeypatch):
+    updated = []
+
+    def update_bilby_job(input):
+        updated.append(input['jobId'])
+        if input['jobId'] == 'job2':
+            # The request for the second chunk fails, after the first chunk has been applied
+            server.failures.append(503)
+        return {'result': 'Job saved!'}
+
+    server.resolvers['updateBilbyJob'] = update_bilby_job
+    monkeypatch.setattr('gwcloud_python.gwcloud.GWCLOUD_BATCH_SIZE', 2)
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint, retry_backoff=0)
+    jobs = [gwc.get_job_by_id(f'job{i}') for i in range(1, 5)]
+
+    results = gwc.update_jobs({job: {'name': f'new_{job.id}'} for job in jobs})
+
+    assert updated == ['job1', 'job2']
+    assert results[jobs[0]] is None
+    assert results[jobs[1]] is None
+    assert '503' in results[jobs[2]]
+    assert results[jobs[3]] == results[jobs[2]]
+    assert [job.name for job in jobs] == ['new_job1', 'new_job2', 'test_name', 'test_name']
+
+
+def test_update_jobs_invalid_attribute(server):
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint)
+    job = gwc.get_job_by_id('job1')
+
+    with pytest.raises(ValueError):
+        gwc.update_jobs({job: {'user': 'Someone Else'}})
+
+
+@pytest.fixture
+def event_id_server(server):
+    event_ids = {
+        'GW000001_000001': {'eventId': 'GW000001_000001', 'triggerId': 'S000001a', 'nickname': 'first',
+                            'isLigoEvent': False, 'gpsTime': 1.0},
+        'GW000002_000002': {'eventId': 'GW000002_000002', 'triggerId': 'S000002a', 'nickname': 'second',
+                            'isLigoEvent': False, 'gpsTime': 2.0},
+        'GW000003_000003': {'eventId': 'GW000003_000003', 'triggerId': None, 'nickname': None,
+                            'isLigoEvent': False, 'gpsTime': 3.0},
+    }
+
+    def create_event_id(input):
+        if input['eventId'] == 'GW999999_999999':
+            raise Exception('Event ID already exists')
+        event_ids[input['eventId']] = input
+        return {'result': 'Event ID created!'}
+
+    def update_event_id(input):
+        event_ids[input['eventId']] = input
+        server.updated_event_ids.append(input['eventId'])
+        return {'result': 'Event ID updated!'}
+
+    def delete_event_id(input):
+        del event_ids[input['eventId']]
+        return {'result': 'Event ID deleted!'}
+
+    server.resolvers.update({
+        'allEventIds': lambda: list(event_ids.values()),
+        'createEventId': create_event_id,
+        'updateEventId': update_event_id,
+        'deleteEventId': delete_event_id,
+    })
+    server.event_ids = event_ids
+    server.updated_event_ids = []
+    return server
+
+
+def test_upsert_event_ids(event_id_server):
+    gwc = GWCloud(token='my_token', endpoint=event_id_server.endpoint)
+    event_id_server.reset_counters()
+
+    event_ids = gwc.upsert_event_ids([
+        # Unchanged, as fields which are not provided keep their current values
+        {'event_id': 'GW000001_000001', 'nickname': 'first', 'gps_time': ''},
+        # Updated, as read from a CSV file
+        {'event_id': 'GW000002_000002', 'nickname': 'renamed', 'gps_time': '2.0', 'is_ligo_event': 'True'},
+        # Created
+        EventID(event_id='GW000004_000004', gps_time=4.0),
+    ], delete_missing=True)
+
+    assert [event_id.event_id for event_id in event_ids] == ['GW000001_000001', 'GW000002_000002', 'GW000004_000004']
+    assert all(event_id is gwc.event_ids.get(event_id.event_id) for event_id in event_ids)
+    assert event_ids[1] == EventID('GW000002_000002', 'S000002a', 'renamed', True, 2.0)
+
+    assert sorted(event_id_server.event_ids) == ['GW000001_000001', 'GW000002_000002', 'GW000004_000004']
+    assert event_id_server.event_ids['GW000002_000002']['nickname'] == 'renamed'
+    # The empty GPS time is left out, so the first Event ID is not updated and keeps its GPS time
+    assert event_id_server.updated_event_ids == ['GW000002_000002']
+    assert event_id_server.event_ids['GW000001_000001']['gpsTime'] == 1.0
+    assert event_ids[0].gps_time == 1.0
+    assert 'GW000003_000003' not in gwc.event_ids
+    # One request for the snapshot, then one each for the creates, updates and deletes
+    assert len(event_id_server.requests) == 4
+
+
+def test_upsert_event_ids_merged(event_id_server):
+    gwc = GWCloud(token='my_token', endpoint=event_id_server.endpoint)
+
+    event_ids = gwc.upsert_event_ids([EventID(event_id='GW000002_000002', gps_time=2.5)])
+
+    # The fields of the EventID which are None keep their current values, both in GWCloud and locally
+    assert event_id_server.updated_event_ids == ['GW000002_000002']
+    assert event_id_server.event_ids['GW000002_000002']['nickname'] == 'second'
+    assert event_id_server.event_ids['GW000002_000002']['triggerId'] == 'S000002a'
+    assert event_ids == [EventID('GW000002_000002', 'S000002a', 'second', False, 2.5)]
+    assert event_ids[0] is gwc.event_ids.get('GW000002_000002')
+
+
+def test_upsert_event_ids_nothing_changed(event_id_server):
+    gwc = GWCloud(token='my_token', endpoint=event_id_server.endpoint)
+    event_id_server.reset_counters()
+
+    event_ids = gwc.upsert_event_ids([{'event_id': 'GW000003_000003'}])
+
+    assert event_ids == [EventID('GW000003_000003', gps_time=3.0)]
+    assert len(event_id_server.requests) == 1
+
+
+def test_upsert_event_ids_partial_failure(event_id_server):
+    gwc = GWCloud(token='my_token', endpoint=event_id_server.endpoint)
+
+    with pytest.raises(EventIDUpsertError) as exc_info:
+        gwc.upsert_event_ids([
+            {'event_id': 'GW999999_999999', 'gps_time': 9.0},
+            {'event_id': 'GW000005_000005', 'gps_time': 5.0},
+        ])
+
+    assert exc_info.value.errors == {'GW999999_999999': 'Event ID already exists'}
+    assert [event_id.event_id for event_id in exc_info.value.event_ids] == ['GW000005_000005']
+    assert 'GW000005_000005' in event_id_server.event_ids
+
+
+def test_upsert_event_ids_requires_gps_time(event_id_server):
+    gwc = GWCloud(token='my_token', endpoint=event_id_server.endpoint)
+
+    with pytest.raises(ValueError):
+        gwc.upsert_event_ids([{'event_id': 'GW000005_000005', 'nickname': 'no time'}])
+
+
+def test_submitted_job_loaded_lazily(server):
+    server.resolvers['newBilbyJobFromIniString'] = lambda input: {
+        'result': {'jobId': 'new_job', 'supportingFiles': []}
+    }
+    server.resolvers['uploadSupportingFiles'] = lambda input: {'result': {'result': True}}
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint)
+    server.reset_counters()
+
+    job = gwc.start_bilby_job_from_string('test_name', 'test description', False, 'label=test')
+    # There are no supporting files, so nothing is uploaded
+    assert len(server.requests) == 1
+    assert job.id == 'new_job'
+    assert not job.loaded
+    assert repr(job) == 'BilbyJob(id=new_job)'
+
+    assert job.name == 'test_name'
+    assert job.loaded
+    assert job.status == JobStatus(status='Completed', date='2021-12-02')
+    assert len(server.requests) == 2
+
+
+def test_supporting_files_uploaded_in_batches(server, tmp_path, monkeypatch):
+    (tmp_path / 'psd.txt').write_bytes(b'psd' * 100)
+    (tmp_path / 'psd_copy.txt').write_bytes(b'psd' * 100)
+    (tmp_path / 'calibration.txt').write_bytes(b'calibration' * 100)
+    (tmp_path / 'prior.txt').write_bytes(b'prior' * 100)
+    supporting_files = {
+        'psd_1': tmp_path / 'psd.txt',
+        'psd_2': tmp_path / '..' / tmp_path.name / 'psd.txt',
+        'psd_3': tmp_path / 'psd_copy.txt',
+        'calibration': tmp_path / 'calibration.txt',
+        'prior': tmp_path / 'prior.txt',
+    }
+
+    uploaded = {}
+
+    def upload_supporting_files(input):
+        for supporting_file in input['supportingFiles']:
+            uploaded[supporting_file['fileToken']] = supporting_file['supportingFile']['content']
+        return {'result': {'result': True}}
+
+    server.resolvers['uploadSupportingFiles'] = upload_supporting_files
+    monkeypatch.setattr('gwcloud_python.gwcloud.GWCLOUD_SUPPORTING_FILES_BATCH_FILES', 2)
+    progress = []
+    gwc = GWCloud(
+        token='my_token',
+        endpoint=server.endpoint,
+        retry_backoff=0,
+        upload_progress=lambda bytes_sent, total: progress.append((bytes_sent, total))
+    )
+    server.reset_counters()
+    # The first batch fails, and is sent again
+    server.failures = [503]
+
+    gwc._upload_supporting_files(list(supporting_files.keys()), list(supporting_files.values()), max_workers=1)
+
+    assert uploaded == {token: path.read_bytes() for token, path in supporting_files.items()}
+    # The three tokens for the same PSD share a single file, and the three distinct files are split into two batches
+    assert [len(files) for files in server.uploads] == [2, 2, 1]
+    assert progress[-1] == (1900, 1900)
+
+
+def test_start_bilby_jobs_from_files(server, tmp_path):
+    specs = []
+    for i in range(6):
+        (tmp_path / f'job_{i}').mkdir()
+        (tmp_path / f'job_{i}' / 'psd.txt').write_text(f'psd {i}')
+        (tmp_path / f'job_{i}' / 'config.ini').write_text(f'label=job_{i}')
+        specs.append({
+            'job_name': f'job_{i}',
+            'job_description': 'test description',
+            'private': True,
+            'ini_file': tmp_path / f'job_{i}' / 'config.ini'
+        })
+    specs[4]['ini_file'] = tmp_path / 'missing.ini'
+    (tmp_path / 'job_5' / 'psd.txt').unlink()
+
+    tokens = {}
+    uploaded = {}
+
+    def new_bilby_job_from_ini_string(input):
+        label = input['params']['iniString']['iniString'].split('=')[1]
+        tokens[f'{label}_psd'] = label
+        return {'result': {'jobId': label, 'supportingFiles': [{'filePath': 'psd.txt', 'token': f'{label}_psd'}]}}
+
+    def upload_supporting_files(input):
+        for supporting_file in input['supportingFiles']:
+            uploaded[tokens[supporting_file['fileToken']]] = supporting_file['supportingFile']['content']
+        return {'result': {'result': True}}
+
+    server.resolvers['newBilbyJobFromIniString'] = new_bilby_job_from_ini_string
+    server.resolvers['uploadSupportingFiles'] = upload_supporting_files
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint, upload_progress=lambda bytes_sent, total: None)
+    cwd = os.getcwd()
+
+    results = gwc.start_bilby_jobs_from_files(specs, max_workers=4)
+
+    assert os.getcwd() == cwd
+    assert [result.id for result in results[:4]] == ['job_0', 'job_1', 'job_2', 'job_3']
+    assert all(result.loaded for result in results[:4])
+    assert isinstance(results[4], FileNotFoundError)
+    assert 'psd.txt' in str(results[5])
+    # Each job's supporting file is found relative to its own ini file
+    assert uploaded == {f'job_{i}': f'psd {i}'.encode() for i in range(4)}
+
+
+def test_hydrate_jobs(server):
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint)
+    jobs = [BilbyJob._lazy(gwc, f'job{i}') for i in range(5)] + [gwc.get_job_by_id('loaded')]
+    jobs[1].name = 'local_name'
+    server.reset_counters()
+
+    assert gwc.hydrate_jobs(jobs) is jobs
+    assert len(server.requests) == 1
+    assert all(job.loaded for job in jobs)
+    assert [job.id for job in jobs] == ['job0', 'job1', 'job2', 'job3', 'job4', 'loaded']
+    assert jobs[0].name == 'test_name'
+    assert jobs[1].name == 'local_name'
+    assert jobs[1].description == 'test description'
+
+    gwc.hydrate_jobs(jobs)
+    assert len(server.requests) == 1
+
+
+def test_wait_for_lazy_jobs(server):
+    resolve_bilby_job = server.resolvers['bilbyJob']
+    polled = set()
+
+    def resolve_running_bilby_job(id):
+        job_data = resolve_bilby_job(id)
+        if id not in polled:
+            # Each job is running when it is loaded, and has completed by the time it is polled
+            polled.add(id)
+            job_data['jobStatus'] = {'name': 'Running', 'date': '2021-12-01'}
+        return job_data
+
+    server.resolvers['bilbyJob'] = resolve_running_bilby_job
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint)
+    jobs = [BilbyJob._lazy(gwc, f'job{i}') for i in range(20)]
+    server.reset_counters()
+
+    assert gwc.wait_for_jobs(jobs, min_interval=0) == jobs
+    # One request loads every job, and one request polls their statuses
+    assert len(server.requests) == 2
+    assert all(job.status == JobStatus(status='Completed', date='2021-12-02') for job in jobs)
+
+
+def test_hydrate_missing_job(server):
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint)
+    job = BilbyJob._lazy(gwc, 'missing')
+
+    with pytest.raises(Exception):
+        job.name
+
+
+def test_create_event_id_built_locally(event_id_server):
+    gwc = GWCloud(token='my_token', endpoint=event_id_server.endpoint)
+    event_id_server.reset_counters()
+
+    event_id = gwc.create_event_id('GW000004_000004', 4.0, trigger_id='S000004a')
+    assert event_id == EventID('GW000004_000004', 'S000004a', None, False, 4.0)
+    assert event_id is gwc.event_ids.get('GW000004_000004')
+    assert len(event_id_server.requests) == 1
+
+
+def test_upload_hdf5_job_streamed(server, tmp_path):
+    hdf5_file = tmp_path / 'result.hdf5'
+    hdf5_file.write_bytes(b'\x89HDF\r\n\x1a\n' + bytes(range(256)) * 4096)
+    ini_file = tmp_path / 'config.ini'
+    ini_file.write_bytes(b'label=test_job\noutdir=./')
+
+    def upload_hdf5_bilby_job(input):
+        assert input['hdf5File']['content'] == hdf5_file.read_bytes()
+        assert input['iniFile'] == {'name': 'config.ini', 'content': ini_file.read_bytes()}
+        assert input['uploadToken'] == 'upload_token'
+        return {'result': {'jobId': 'uploaded_job'}}
+
+    server.resolvers['generateBilbyJobUploadToken'] = lambda: {'token': 'upload_token'}
+    server.resolvers['uploadHdf5BilbyJob'] = upload_hdf5_bilby_job
+
+    progress = []
+    gwc = GWCloud(
+        token='my_token',
+        endpoint=server.endpoint,
+        upload_progress=lambda bytes_sent, total: progress.append((bytes_sent, total))
+    )
+    job = gwc.upload_hdf5_job('description', hdf5_file, ini_file)
+
+    assert job.id == 'uploaded_job'
+    assert len(server.uploads) == 1
+    assert progress[-1] == (int(server.request_headers[-1]['Content-Length']),) * 2
+
+
+def test_upload_job_directory_streamed(server, tmp_path):
+    (tmp_path / 'result').mkdir()
+    (tmp_path / 'result' / 'test_result.json').write_bytes(b'{"result": true}' * 10000)
+    (tmp_path / 'test_config_complete.ini').write_text('label=test')
+
+    def upload_bilby_job(input):
+        with tarfile.open(fileobj=io.BytesIO(input['jobFile']['content']), mode='r:gz') as tar_handle:
+            assert sorted(tar_handle.getnames()) == ['result', 'result/test_result.json', 'test_config_complete.ini']
+        return {'result': {'jobId': 'uploaded_job'}}
+
+    server.resolvers['generateBilbyJobUploadToken'] = lambda: {'token': 'upload_token'}
+    server.resolvers['uploadBilbyJob'] = upload_bilby_job
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint, upload_progress=lambda bytes_sent, total: None)
+
+    job = gwc.upload_job_directory('description', tmp_path, stream=True)
+
+    assert job.id == 'uploaded_job'
+    # The archive is complete before it is uploaded, so the request has a known size
+    assert 'Transfer-Encoding' not in server.request_headers[-1]
+    assert int(server.request_headers[-1]['Content-Length']) > 0
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['result', 'test_config_complete.ini']
+
+
+def test_upload_job_directory_filtered(server, tmp_path):
+    (tmp_path / 'result').mkdir()
+    (tmp_path / 'result' / 'test_result.json').write_text('{"result": true}')
+    (tmp_path / 'result' / 'test_checkpoint.pickle').write_bytes(b'checkpoint' * 1000)
+    (tmp_path / 'test_config_complete.ini').write_text('label=test')
+
+    def upload_bilby_job(input):
+        with tarfile.open(fileobj=io.BytesIO(input['jobFile']['content']), mode='r:gz') as tar_handle:
+            assert sorted(tar_handle.getnames()) == ['result', 'result/test_result.json', 'test_config_complete.ini']
+        return {'result': {'jobId': 'uploaded_job'}}
+
+    server.resolvers['generateBilbyJobUploadToken'] = lambda: {'token': 'upload_token'}
+    server.resolvers['uploadBilbyJob'] = upload_bilby_job
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint, upload_progress=lambda bytes_sent, total: None)
+
+    job = gwc.upload_job_directory('description', tmp_path, upload_filter=DEFAULT_UPLOAD_FILTER)
+    assert job.id == 'uploaded_job'
+
+
+def test_upload_job_directories(server, tmp_path):
+    job_directories = {}
+    for i in range(5):
+        (tmp_path / f'job_{i}').mkdir()
+        (tmp_path / f'job_{i}' / 'test_config_complete.ini').write_text(f'label=job_{i}')
+        job_directories[tmp_path / f'job_{i}'] = f'description {i}'
+    job_directories[tmp_path / 'missing'] = 'missing'
+
+    def upload_bilby_job(input):
+        assert input['uploadToken'] == 'upload_token'
+        with tarfile.open(fileobj=io.BytesIO(input['jobFile']['content']), mode='r:gz') as tar_handle:
+            assert tar_handle.getnames() == ['test_config_complete.ini']
+            label = tar_handle.extractfile('test_config_complete.ini').read().decode().split('=')[1]
+        assert input['details']['description'] == f'description {label[-1]}'
+        return {'result': {'jobId': label}}
+
+    server.resolvers['generateBilbyJobUploadToken'] = lambda: {'token': 'upload_token'}
+    server.resolvers['uploadBilbyJob'] = upload_bilby_job
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint, upload_progress=lambda bytes_sent, total: None)
+    server.reset_counters()
+
+    results = gwc.upload_job_directories(job_directories, max_workers=3, archive_workers=2)
+
+    assert [job.id for job in results[:5]] == ['job_0', 'job_1', 'job_2', 'job_3', 'job_4']
+    assert isinstance(results[5], FileNotFoundError)
+    # A single upload token is generated and reused for every job
+    assert sum('generateBilbyJobUploadToken' in (request.get('query') or '') for request in server.requests) == 1
+    # The temporary archives are removed once they have been uploaded
+    assert all(len(list(job_directory.iterdir())) == 1 for job_directory in list(job_directories)[:5])
+
+
+@pytest.mark.parametrize('stream', [False, True])
+def test_upload_job_directory_once(server, tmp_path, stream):
+    job_directory = tmp_path / 'job'
+    job_directory.mkdir()
+    (job_directory / 'test_config_complete.ini').write_text('label=test')
+    uploads = []
+
+    def upload_bilby_job(input):
+        uploads.append(input['details']['description'])
+        return {'result': {'jobId': f'job_{len(uploads)}'}}
+
+    server.resolvers['generateBilbyJobUploadToken'] = lambda: {'token': 'upload_token'}
+    server.resolvers['uploadBilbyJob'] = upload_bilby_job
+    gwc = GWCloud(
+        token='my_token',
+        endpoint=server.endpoint,
+        upload_progress=lambda bytes_sent, total: None,
+        upload_ledger=tmp_path / 'ledger.json'
+    )
+
+    assert gwc.upload_job_directory('first', job_directory, stream=stream).id == 'job_1'
+    # The same content is not uploaded again with the same details
+    assert gwc.upload_job_directory('first', job_directory, stream=stream).id == 'job_1'
+    assert uploads == ['first']
+
+    # But it is uploaded as a new job with a different description or visibility
+    assert gwc.upload_job_directory('second', job_directory, stream=stream).id == 'job_2'
+    assert gwc.upload_job_directory('second', job_directory, public=True, stream=stream).id == 'job_3'
+    assert gwc.upload_job_directory('second', job_directory, public=True, stream=stream).id == 'job_3'
+    assert uploads == ['first', 'second', 'second']
+
+    (job_directory / 'test_config_complete.ini').write_text('label=changed')
+    assert gwc.upload_job_directory('first', job_directory, stream=stream).id == 'job_4'
+    assert uploads == ['first', 'second', 'second', 'first']
+
+
+def test_upload_job_directories_once(server, tmp_path):
+    job_directories = {}
+    for i in range(4):
+        (tmp_path / f'job_{i}').mkdir()
+        (tmp_path / f'job_{i}' / 'test_config_complete.ini').write_text('label=test')
+        job_directories[tmp_path / f'job_{i}'] = 'other' if i == 3 else 'description'
+    uploads = []
+
+    def upload_bilby_job(input):
+        uploads.append(input['details']['description'])
+        return {'result': {'jobId': f'job_{len(uploads)}'}}
+
+    server.resolvers['generateBilbyJobUploadToken'] = lambda: {'token': 'upload_token'}
+    server.resolvers['uploadBilbyJob'] = upload_bilby_job
+    gwc = GWCloud(
+        token='my_token',
+        endpoint=server.endpoint,
+        upload_progress=lambda bytes_sent, total: None,
+        upload_ledger=tmp_path / 'ledger.json'
+    )
+
+    results = gwc.upload_job_directories(job_directories, max_workers=3)
+
+    # The three directories with the same content and description are uploaded once, and share the created job
+    assert sorted(uploads) == ['description', 'other']
+    assert results[0] is results[1] is results[2]
+    assert results[3].id != results[0].id
+    assert all(len(list(job_directory.iterdir())) == 1 for job_directory in job_directories)
+
+
+@pytest.fixture
+def upload_server():
+    sessions = StandInUploadSessions()
+    with StandInGraphQLServer(sessions.resolvers()) as server:
+        server.sessions = sessions
+        yield server
+
+
+def test_upload_job_archive_in_parts(upload_server, tmp_path):
+    job_archive = tmp_path / 'job.tar.gz'
+    job_archive.write_bytes(bytes(range(256)) * 18)
+
+    progress = []
+    gwc = GWCloud(
+        token='my_token',
+        endpoint=upload_server.endpoint,
+        upload_progress=lambda bytes_sent, total: progress.append((bytes_sent, total))
+    )
+    job = gwc.upload_job_archive('description', job_archive, resumable=True, part_size=1000, max_workers=3)
+
+    assert job.id == '1'
+    assert upload_server.sessions.archives['1'] == job_archive.read_bytes()
+    assert sorted(upload_server.sessions.part_numbers) == [1, 2, 3, 4, 5]
+    assert progress[-1] == (4608, 4608)
+    assert not (tmp_path / 'job.tar.gz.upload.json').exists()
+
+
+def test_upload_job_archive_resumed(upload_server, tmp_path):
+    job_archive = tmp_path / 'job.tar.gz'
+    job_archive.write_bytes(bytes(range(256)) * 18)
+    upload_server.sessions.failing_parts = {3}
+
+    gwc = GWCloud(token='my_token', endpoint=upload_server.endpoint, upload_progress=lambda bytes_sent, total: None)
+    with pytest.raises(Exception, match='Part 3 failed'):
+        gwc.upload_job_archive('description', job_archive, resumable=True, part_size=1000)
+
+    assert (tmp_path / 'job.tar.gz.upload.json').exists()
+    assert not upload_server.sessions.archives
+
+    # Only the failed part is uploaded again, without creating a new upload session
+    upload_server.sessions.part_numbers = []
+    upload_server.reset_counters()
+    job = gwc.upload_job_archive('description', job_archive, resumable=True, part_size=1000)
+
+    assert upload_server.sessions.part_numbers == [3]
+    assert [parse_operation(request['query'])[1] for request in upload_server.requests] == [
+        'UploadBilbyJobPartMutation',
+        'CompleteBilbyJobUploadSessionMutation'
+    ]
+    assert upload_server.sessions.archives[job.id] == job_archive.read_bytes()
+    assert not (tmp_path / 'job.tar.gz.upload.json').exists()
@@ -0,0 +1,139 @@
+import pytest
+
+from gwcloud_python import GWCloud, BilbyJob, EventID, JobCatalogue
+
+
+def _job_data(i, name, description, status='Completed', event_id='GW123456'):
+    return {
+        "id": f"id{i}",
+        "name": name,
+        "description": description,
+        "user": f"Test User{i % 2}",
+        "event_id": {
+            "event_id": event_id,
+            "trigger_id": None,
+            "nickname": None,
+            "is_ligo_event": False
+        } if event_id else None,
+        "job_status": {
+            "name": status,
+            "date": f"2021-01-0{i}"
+        }
+    }
+
+
+@pytest.fixture
+def mock_gwdc_init(mocker):
+    def mock_init(self, token, endpoint, custom_error_handler=None):
+        pass
+
+    mocker.patch('gwdc_python.gwdc.GWDC.__init__', mock_init)
+
+
+@pytest.fixture
+def public_jobs():
+    return [
+        _job_data(1, "GW150914_official", "Official analysis of GW150914"),
+        _job_data(2, "binary_black_hole", "A test of a binary black hole"),
+        _job_data(3, "neutron_star", "Binary neutron star injection", status='Error', event_id=None),
+    ]
+
+
+@pytest.fixture
+def setup_mock_pages(mocker, mock_gwdc_init):
+    def _setup_mock_pages(pages):
+        responses = [{'all_event_ids': [{'event_id': 'GW123456', 'gps_time': 1126259462.391}]}]
+        for i, page in enumerate(pages):
+            responses.append({
+                'public_bilby_jobs': {
+                    'page_info': {
+                        'has_next_page': i < len(pages) - 1,
+                        'end_cursor': f'cursor{i}'
+                    },
+                    'edges': [{'node': job} for job in page]
+                }
+            })
+        mock_request = mocker.Mock(side_effect=responses)
+        mocker.patch('gwdc_python.gwdc.GWDC.request', mock_request)
+        return mock_request
+
+    return _setup_mock_pages
+
+
+@pytest.fixture
+def synced_catalogue(setup_mock_pages, public_jobs):
+    setup_mock_pages([public_jobs[:2], public_jobs[2:]])
+    catalogue = JobCatalogue(GWCloud(token='my_token'))
+    catalogue.sync()
+    return catalogue
+
+
+def test_catalogue_sync_follows_pages(setup_mock_pages, public_jobs):
+    mock_request = setup_mock_pages([public_jobs[:2], public_jobs[2:]])
+    catalogue = JobCatalogue(GWCloud(token='my_token'))
+
+    assert catalogue.last_synced is None
+    assert catalogue.sync() == 3
+    assert len(catalogue) == 3
+    assert catalogue.last_synced is not None
+
+    assert mock_request.call_count == 3
+    assert mock_request.call_args_list[2][1]['variables']['after'] == 'cursor0'
+
+
+def test_catalogue_sync_is_incremental(synced_catalogue, setup_mock_pages, public_jobs):
+    changed = _job_data(4, "new_job", "A brand new job")
+    mock_request = setup_mock_pages([[changed, public_jobs[0]], public_jobs[1:]])
+    synced_catalogue.client.request = mock_request
+
+    assert synced_catalogue.sync() == 1
+    assert len(synced_catalogue) == 4
+
+    # The second page is unchanged and should not be requested again, unless a full sync is asked for
+    mock_request = setup_mock_pages([public_jobs[1:]])
+    synced_catalogue.client.request = mock_request
+    assert synced_catalogue.sync() == 0
+    assert mock_request.call_count == 2
+
+
+def test_catalogue_full_sync_removes_jobs(synced_catalogue, setup_mock_pages, public_jobs):
+    # The second job is deleted on the server, which an incremental sync stops before seeing
+    mock_request = setup_mock_pages([public_jobs[:1], public_jobs[2:]])
+    synced_catalogue.client.request = mock_request
+    assert synced_catalogue.sync() == 0
+    assert len(synced_catalogue) == 3
+
+    mock_request = setup_mock_pages([public_jobs[:1], public_jobs[2:]])
+    synced_catalogue.client.request = mock_request
+    assert synced_catalogue.sync(full=True) == 0
+    assert mock_request.call_count == 3
+    assert len(synced_catalogue) == 2
+    assert synced_catalogue.get_job_by_id('id2') is None
+    assert [job.id for job in synced_catalogue.search("binary")] == ['id3']
+    assert synced_catalogue.connection.execute("SELECT COUNT(*) FROM jobs_fts").fetchone()[0] == 2
+
+
+def test_catalogue_search(synced_catalogue):
+    jobs = synced_catalogue.search("binary")
+    assert sorted(job.id for job in jobs) == ['id2', 'id3']
+    assert all(isinstance(job, BilbyJob) for job in jobs)
+
+    assert [job.id for job in synced_catalogue.search("bin black")] == ['id2']
+    assert [job.id for job in synced_catalogue.search("binary", status='Error')] == ['id3']
+    assert [job.id for job in synced_catalogue.search(user='Test User1')] == ['id3', 'id1']
+    assert synced_catalogue.search('"unbalanced') == []
+    assert len(synced_catalogue.search(number=2)) == 2
+
+
+def test_catalogue_returns_full_jobs(synced_catalogue, public_jobs):
+    job = synced_catalogue.get_job_by_id('id1')
+
+    assert job.name == public_jobs[0]['name']
+    assert job.description == public_jobs[0]['description']
+    assert job.user == public_jobs[0]['user']
+    assert job.event_id == EventID(event_id='GW123456', gps_time=1126259462.391)
+    assert job.client is synced_catalogue.client
+
+    assert synced_catalogue.get_job_by_id('id3').event_id is None
+    assert synced_catalogue.get_job_by_id('missing') is None
+    assert [job.id for job in synced_catalogue.search(event_id=EventID(event_id='GW123456'))] == ['id2', 'id1']
@@ -0,0 +1,86 @@
+import pytest
+
+from gwdc_python.helpers import JobStatus
+
+from gwcloud_python import GWCloud, BilbyJob, EventID, JobTable
+
+np = pytest.importorskip('numpy')
+
+
+@pytest.fixture
+def job_nodes():
+    return [
+        {
+            'id': f'id{i}',
+            'name': f'test_name_{i}',
+            'description': f'test description {i}',
+            'user': f'Test User{i % 2}',
+            'event_id': {'event_id': 'GW123456', 'nickname': 'GW123456'} if i % 3 else None,
+            'job_status': {'name': 'Completed' if i % 2 else 'Error', 'date': f'2021-0{i}-01T12:00:00+00:00'},
+        }
+        for i in range(1, 7)
+    ]
+
+
+@pytest.fixture
+def job_table(setup_mock_gwdc, job_nodes):
+    setup_mock_gwdc({'public_bilby_jobs': {'edges': [{'node': node} for node in job_nodes]}})
+    return GWCloud(token='my_token').get_public_job_list(as_table=True)
+
+
+@pytest.fixture
+def setup_mock_gwdc(mocker):
+    def mock_init(self, token, endpoint, custom_error_handler=None):
+        pass
+
+    mocker.patch('gwdc_python.gwdc.GWDC.__init__', mock_init)
+
+    def mock_gwdc(request_data):
+        mocker.patch('gwdc_python.gwdc.GWDC.request', mocker.Mock(return_value=request_data))
+
+    return mock_gwdc
+
+
+def test_job_table_columns(job_table, job_nodes):
+    assert isinstance(job_table, JobTable)
+    assert len(job_table) == 6
+
+    assert list(job_table['id']) == [node['id'] for node in job_nodes]
+    assert list(job_table['user']) == [node['user'] for node in job_nodes]
+    assert list(job_table['event_id']) == ['GW123456', 'GW123456', None, 'GW123456', 'GW123456', None]
+    assert list(job_table.categories['status']) == ['Completed', 'Error']
+    assert job_table.codes['status'].dtype == np.int32
+    assert job_table['status_date'][0] == np.datetime64('2021-01-01T12:00:00')
+
+
+def test_job_table_filtering(job_table):
+    completed = job_table.where(status='Completed')
+    assert list(completed['id']) == ['id1', 'id3', 'id5']
+
+    assert list(job_table.where(status='Error', event_id=EventID(event_id='GW123456'))['id']) == ['id2', 'id4']
+    assert list(job_table.where(event_id=[None])['id']) == ['id3', 'id6']
+    assert list(job_table.where(user=['Test User0', 'Missing User'])['id']) == ['id2', 'id4', 'id6']
+    assert list(job_table.where(after='2021-03-01', before='2021-05-01')['id']) == ['id3', 'id4']
+    assert len(job_table.where(status='Missing')) == 0
+
+    assert list(job_table.filter(job_table['name'] == 'test_name_4')['id']) == ['id4']
+    assert job_table.value_counts('status') == {'Completed': 3, 'Error': 3}
+
+
+def test_job_table_to_jobs(job_table, job_nodes):
+    jobs = job_table.to_jobs(job_table['user'] == 'Test User1')
+
+    assert [job.id for job in jobs] == ['id1', 'id3', 'id5']
+    assert all(isinstance(job, BilbyJob) for job in jobs)
+    assert jobs[0].status == JobStatus(status='Completed', date=job_nodes[0]['job_status']['date'])
+    assert jobs[0].event_id == EventID(event_id='GW123456', nickname='GW123456')
+    assert jobs[0].event_id is jobs[2].event_id
+    assert jobs[1].event_id is None
+
+
+def test_job_table_to_pandas(job_table):
+    pd = pytest.importorskip('pandas')
+
+    df = job_table.to_pandas()
+    assert isinstance(df['status'].dtype, pd.CategoricalDtype)
+    assert list(df['id']) == list(job_table['id'])
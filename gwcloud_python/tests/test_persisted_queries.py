@@ -0,0 +1,45 @@
+from gwcloud_python import GWCloud
+from gwcloud_python.utils.graphql import query_hash
+
+
+def _request_bytes(server, persisted_queries, repeats=10):
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint, persisted_queries=persisted_queries)
+    server.reset_counters()
+    for _ in range(repeats):
+        job = gwc.get_job_by_id('job_id')
+        assert job.name == 'test_name'
+    return server.request_bytes
+
+
+def test_query_hash_is_cached():
+    query = "query { allEventIds { eventId } }"
+    assert query_hash(query) == query_hash(query)
+    assert len(query_hash(query)) == 64
+
+
+def test_persisted_queries_fall_back_to_full_document(server):
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint, persisted_queries=True)
+    server.reset_counters()
+
+    gwc.get_job_by_id('job_id')
+    gwc.get_job_by_id('job_id')
+
+    # The first request misses and is retried with the full document, after which only the hash is sent
+    assert ['query' in request for request in server.requests] == [False, True, False]
+
+
+def test_persisted_queries_reduce_request_bytes(server):
+    full_bytes = _request_bytes(server, persisted_queries=False)
+    persisted_bytes = _request_bytes(server, persisted_queries=True)
+
+    assert persisted_bytes < full_bytes / 2
+
+
+def test_persisted_queries_not_supported(server):
+    server.persisted_queries = False
+    gwc = GWCloud(token='my_token', endpoint=server.endpoint, persisted_queries=True)
+    assert not gwc.client.persisted_queries
+
+    server.reset_counters()
+    assert gwc.get_job_by_id('job_id').name == 'test_name'
+    assert all('extensions' not in request for request in server.requests)
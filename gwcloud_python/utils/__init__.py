@@ -1,3 +1,4 @@
 from . import identifiers
 from . import file_filters
 from . import file_download
+from . import filter_rules
@@ -0,0 +1,667 @@
+import gzip
+import io
+import json
+import os
+import struct
+import tarfile
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, ExitStack
+from hashlib import sha256
+from pathlib import Path
+from tempfile import SpooledTemporaryFile
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from . import identifiers
+from ..settings import (
+    GWCLOUD_ARCHIVE_PIPE_SIZE,
+    GWCLOUD_ARCHIVE_SPOOL_SIZE,
+    GWCLOUD_ARCHIVE_BLOCK_SIZE,
+    GWCLOUD_UPLOAD_CHUNK_SIZE
+)
+
+_ZSTD_REQUIRED = "The zstd codec requires zstandard, which can be installed with 'pip install gwcloud-python[zstd]'"
+
+
+# Leading bytes of files whose contents are already compressed, namely PNG and JPEG images, HDF5 files, and gzip,
+# zstd, bzip2, xz and zip archives
+_COMPRESSED_SIGNATURES = (
+    b"\x89PNG\r\n\x1a\n",
+    b"\xff\xd8\xff",
+    b"\x89HDF\r\n\x1a\n",
+    b"\x1f\x8b",
+    b"\x28\xb5\x2f\xfd",
+    b"BZh",
+    b"\xfd7zXZ\x00",
+    b"PK\x03\x04",
+)
+
+
+def _compressed_file(file_path):
+    """Checks to see if the given file path points to a file which is already compressed, such as a PNG or HDF5
+    file, from its suffix or otherwise its leading bytes
+
+    Parameters
+    ----------
+    file_path : ~pathlib.Path
+        File path to check
+
+    Returns
+    -------
+    bool
+        True if the file is already compressed, False otherwise
+    """
+    if identifiers.png_file(file_path) or identifiers.hdf5_file(file_path):
+        return True
+
+    try:
+        with open(file_path, "rb") as f:
+            header = f.read(8)
+    except OSError:
+        return False
+    return header.startswith(_COMPRESSED_SIGNATURES)
+
+
+# Header of a gzip member, without a file name or modification time
+_GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+
+
+# Number of bytes of earlier data which deflate can refer back to
+_GZIP_WINDOW = 1 << zlib.MAX_WBITS
+
+
+def _raw_compressor(level):
+    # A negative window size makes zlib write raw deflate data, without a header or trailer
+    return zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+
+
+def _compress_block(data, level, dictionary=b""):
+    # The block is primed with the data before it, so that it compresses as well as if it were compressed with the
+    # rest of the stream, and ends with a sync flush, so that the next block starts on a byte boundary
+    if dictionary:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=dictionary)
+    else:
+        compressor = _raw_compressor(level)
+    return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+class _GzipWriter(io.RawIOBase):
+    """Writes a single member gzip stream whose compression level can change part way through, so that files which
+    are already compressed can be stored at level 0. Each run of data at the same level is compressed as raw deflate
+    data by its own compressor, which is fully flushed at the end of the run so that the next run starts on a byte
+    boundary, and all of the runs share one gzip header and trailer
+    """
+
+    def __init__(self, fileobj, level):
+        super().__init__()
+        self._fileobj = fileobj
+        self._level = self._default_level = level
+        self._levels = deque()
+        self._position = 0
+        self._crc = 0
+        self._compressor = None
+        self._fileobj.write(_GZIP_HEADER)
+
+    def set_level(self, offset, level=None):
+        """Compress the data from `offset` bytes into the stream onwards at `level`, or at the default level if None"""
+        self._levels.append((offset, self._default_level if level is None else level))
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        view = memoryview(data).cast("B")
+        size = len(view)
+        while view:
+            while self._levels and self._levels[0][0] <= self._position:
+                level = self._levels.popleft()[1]
+                if level != self._level:
+                    self._end_run()
+                    self._level = level
+
+            length = len(view)
+            if self._levels:
+                length = min(length, self._levels[0][0] - self._position)
+            self._crc = zlib.crc32(view[:length], self._crc)
+            self._compress(view[:length])
+            self._position += length
+            view = view[length:]
+        return size
+
+    def _compress(self, data):
+        if self._compressor is None:
+            self._compressor = _raw_compressor(self._level)
+        self._fileobj.write(self._compressor.compress(data))
+
+    def _end_run(self):
+        if self._compressor is not None:
+            self._fileobj.write(self._compressor.flush(zlib.Z_FULL_FLUSH))
+            self._compressor = None
+
+    def _finish(self):
+        # The deflate data ends with a final block, which is empty if every run has already been flushed
+        compressor = self._compressor or _raw_compressor(self._level)
+        self._fileobj.write(compressor.flush())
+        self._compressor = None
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            self._finish()
+            self._fileobj.write(struct.pack("<II", self._crc & 0xffffffff, self._position & 0xffffffff))
+        finally:
+            super().close()
+
+
+class _ParallelGzipWriter(_GzipWriter):
+    """Writes a single member gzip stream in the same way as pigz, compressing each block of data as raw deflate data
+    primed with the last 32 KiB before it and ending with a sync flush, several blocks at a time in a thread pool.
+    zlib releases the GIL while compressing, so the blocks are compressed in parallel, while the checksum of the data
+    is computed as it is written. A block also ends wherever the compression level changes
+    """
+
+    def __init__(self, fileobj, level, threads, block_size=GWCLOUD_ARCHIVE_BLOCK_SIZE):
+        super().__init__(fileobj, level)
+        self._block_size = block_size
+        self._buffer = bytearray()
+        self._dictionary = b""
+        self._pending = deque()
+        self._max_pending = threads * 2
+        self._executor = ThreadPoolExecutor(max_workers=threads)
+
+    def _submit(self, block):
+        self._pending.append(self._executor.submit(_compress_block, block, self._level, self._dictionary))
+        # Deflate can refer back at most 32 KiB, so only that much of the data before each block is needed
+        self._dictionary = (self._dictionary + block)[-_GZIP_WINDOW:]
+        # Blocks are written in order, limiting the number held in memory
+        while len(self._pending) > self._max_pending or (self._pending and self._pending[0].done()):
+            self._fileobj.write(self._pending.popleft().result())
+
+    def _compress(self, data):
+        self._buffer += data
+        while len(self._buffer) >= self._block_size:
+            self._submit(bytes(self._buffer[:self._block_size]))
+            del self._buffer[:self._block_size]
+
+    def _end_run(self):
+        # Data buffered before the compression level changes is compressed at the previous level
+        if self._buffer:
+            self._submit(bytes(self._buffer))
+            self._buffer.clear()
+
+    def _finish(self):
+        self._end_run()
+        while self._pending:
+            self._fileobj.write(self._pending.popleft().result())
+        super()._finish()
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self._executor.shutdown()
+
+
+@contextmanager
+def _no_compression(fileobj, level, threads):
+    yield fileobj
+
+
+@contextmanager
+def _gzip(fileobj, level, threads):
+    # The stream modes of tarfile only accept a compression level from Python 3.12, so the gzip layer is added here
+    with _GzipWriter(fileobj, level) as writer:
+        yield writer
+
+
+@contextmanager
+def _parallel_gzip(fileobj, level, threads):
+    with _ParallelGzipWriter(fileobj, level, threads) as writer:
+        yield writer
+
+
+@contextmanager
+def _zstd(fileobj, level, threads):
+    if zstandard is None:
+        raise ImportError(_ZSTD_REQUIRED)
+    compressor = zstandard.ZstdCompressor(level=level, threads=threads)
+    with compressor.stream_writer(fileobj, closefd=False) as writer:
+        yield writer
+
+
+# The archive codecs, mapping each name to the function used to open a compressed stream, the default compression
+# level and the file extension of the archive
+ARCHIVE_CODECS = {
+    "none": (_no_compression, None, ".tar"),
+    "gzip": (_gzip, 2, ".tar.gz"),
+    "parallel_gzip": (_parallel_gzip, 2, ".tar.gz"),
+    "zstd": (_zstd, 3, ".tar.zst"),
+}
+
+
+def _get_codec(codec):
+    if codec not in ARCHIVE_CODECS:
+        raise ValueError(f"Unknown archive codec '{codec}', must be one of {', '.join(ARCHIVE_CODECS)}")
+    return ARCHIVE_CODECS[codec]
+
+
+def archive_extension(codec):
+    """Get the file extension of archives written with a codec
+
+    Parameters
+    ----------
+    codec : str
+        Name of the codec, one of 'none', 'gzip', 'parallel_gzip' or 'zstd'
+
+    Returns
+    -------
+    str
+    """
+    return _get_codec(codec)[2]
+
+
+class ArchiveFingerprint:
+    """
+    ArchiveFingerprint is a Merkle hash of the members of a job archive, combining a hash of the name, size and
+    contents of each member. The order of the members does not change the fingerprint, so a job has the same
+    fingerprint whether it is computed while the job is archived or from an existing archive.
+    """
+
+    def __init__(self):
+        self._leaves = {}
+
+    def add(self, tarinfo, content_digest=b""):
+        """Add a member of the archive
+
+        Parameters
+        ----------
+        tarinfo : tarfile.TarInfo
+            Information about the member
+        content_digest : bytes, optional
+            SHA-256 digest of the contents of the member, if it is a file, by default b""
+        """
+        leaf = sha256(json.dumps([tarinfo.name, tarinfo.size, tarinfo.linkname]).encode("utf-8"))
+        leaf.update(content_digest)
+        self._leaves[tarinfo.name] = leaf.digest()
+
+    def hexdigest(self):
+        """Get the fingerprint of the members added so far
+
+        Returns
+        -------
+        str
+        """
+        root = sha256()
+        for name in sorted(self._leaves):
+            root.update(self._leaves[name])
+        return root.hexdigest()
+
+
+class _HashingReader:
+    def __init__(self, fileobj, digest):
+        self._fileobj = fileobj
+        self._digest = digest
+
+    def read(self, size=-1):
+        data = self._fileobj.read(size)
+        self._digest.update(data)
+        return data
+
+
+def _add_member(tar_handle, item, arcname, fingerprint):
+    if fingerprint is None:
+        tar_handle.add(item, arcname=arcname, recursive=False)
+        return
+
+    # Files are hashed as they are read into the archive, so they are only read once
+    tarinfo = tar_handle.gettarinfo(item, arcname)
+    if tarinfo is None:
+        return
+
+    digest = sha256()
+    if tarinfo.isreg():
+        with open(item, "rb") as f:
+            tar_handle.addfile(tarinfo, _HashingReader(f, digest))
+        fingerprint.add(tarinfo, digest.digest())
+    else:
+        tar_handle.addfile(tarinfo)
+        fingerprint.add(tarinfo)
+
+
+def _content_digest(fileobj):
+    digest = sha256()
+    for chunk in iter(lambda: fileobj.read(GWCLOUD_UPLOAD_CHUNK_SIZE), b""):
+        digest.update(chunk)
+    return digest.digest()
+
+
+def archive_fingerprint(job_archive):
+    """Compute the fingerprint of an existing job archive, which is the same as the fingerprint computed while
+    archiving the job directory
+
+    Parameters
+    ----------
+    job_archive : str or ~pathlib.Path
+        Path to the job archive
+
+    Returns
+    -------
+    str
+    """
+    fingerprint = ArchiveFingerprint()
+    with open(job_archive, "rb") as f:
+        header = f.read(4)
+        f.seek(0)
+        try:
+            with ExitStack() as stack:
+                fileobj = f
+                # The stream modes of tarfile only read the first gzip member or zstd frame, so the archive is
+                # decompressed by readers which read all of them
+                if header.startswith(b"\x1f\x8b"):
+                    fileobj = stack.enter_context(gzip.GzipFile(fileobj=f, mode="rb"))
+                elif zstandard is not None and header == b"\x28\xb5\x2f\xfd":
+                    fileobj = stack.enter_context(
+                        zstandard.ZstdDecompressor().stream_reader(f, closefd=False, read_across_frames=True)
+                    )
+
+                with tarfile.open(fileobj=fileobj, mode="r|*") as tar_handle:
+                    for tarinfo in tar_handle:
+                        if tarinfo.isreg():
+                            fingerprint.add(tarinfo, _content_digest(tar_handle.extractfile(tarinfo)))
+                        else:
+                            fingerprint.add(tarinfo)
+            return fingerprint.hexdigest()
+        except tarfile.ReadError:
+            # Files which are not tar archives are fingerprinted by their contents as a whole
+            f.seek(0)
+            return _content_digest(f).hex()
+
+
+def write_job_archive(fileobj, job_directory, codec="gzip", level=None, threads=None, content_aware=True,
+                      members=None, fingerprint=None):
+    """Write a tar archive of a job directory to a file object, which only needs to support writing
+
+    Parameters
+    ----------
+    fileobj : file-like
+        Writable file object to which the archive is written
+    job_directory : str or ~pathlib.Path
+        Path to the job directory
+    codec : str, optional
+        Compression used for the archive, one of 'none', 'gzip', 'parallel_gzip' or 'zstd', by default 'gzip'.
+        The 'parallel_gzip' and 'zstd' codecs compress using several threads
+    level : int, optional
+        Compression level, by default 2 for the gzip codecs and 3 for zstd
+    threads : int, optional
+        Number of threads used by the parallel codecs, by default the number of CPUs
+    content_aware : bool, optional
+        If True, files which are already compressed, such as PNG and HDF5 files, are stored without being compressed
+        again by the gzip codecs, by default True
+    members : list, optional
+        Paths of the files and directories in the job directory to archive, such as those selected by an
+        :class:`~gwcloud_python.utils.upload_filter.UploadFilter`. If None, everything is archived, by default None
+    fingerprint : ArchiveFingerprint, optional
+        If given, each member is added to the fingerprint as it is archived, by default None
+    """
+    open_codec, default_level, _ = _get_codec(codec)
+    level = default_level if level is None else level
+    threads = threads or os.cpu_count() or 1
+
+    path = Path(job_directory)
+    members = path.rglob("*") if members is None else members
+    with open_codec(fileobj, level, threads) as compressed:
+        content_aware = content_aware and isinstance(compressed, _GzipWriter)
+        with tarfile.open(fileobj=compressed, mode="w|") as tar_handle:
+            for item in members:
+                if content_aware and item.is_file():
+                    # The offset is the position of the member in the uncompressed archive
+                    compressed.set_level(tar_handle.offset, 0 if _compressed_file(item) else None)
+                _add_member(tar_handle, item, item.relative_to(path), fingerprint)
+
+
+class _NullWriter(io.RawIOBase):
+    def writable(self):
+        return True
+
+    def write(self, data):
+        return len(data)
+
+
+def job_directory_fingerprint(job_directory, members=None):
+    """Compute the fingerprint of a job directory without writing an archive, which is the same as the fingerprint
+    computed while archiving it
+
+    Parameters
+    ----------
+    job_directory : str or ~pathlib.Path
+        Path to the job directory
+    members : list, optional
+        Paths of the files and directories in the job directory to include. If None, everything is included,
+        by default None
+
+    Returns
+    -------
+    str
+    """
+    fingerprint = ArchiveFingerprint()
+    write_job_archive(_NullWriter(), job_directory, codec="none", members=members, fingerprint=fingerprint)
+    return fingerprint.hexdigest()
+
+
+class ArchivePipe(io.RawIOBase):
+    """
+    ArchivePipe is a readable stream of data which is written by a producer thread. At most `max_size` bytes are
+    buffered at a time, so the producer waits for the data to be read before writing more. If the producer fails,
+    its exception is raised by the next read, and if the pipe is closed before all of the data has been read, the
+    producer's next write raises a BrokenPipeError so that it stops.
+
+    Parameters
+    ----------
+    producer : function
+        Function which is called in a separate thread with a writable file object, to which it writes the data
+    name : str
+        File name of the stream, used when it is uploaded
+    max_size : int, optional
+        Maximum number of bytes buffered between the producer and the reader, by default GWCLOUD_ARCHIVE_PIPE_SIZE
+    """
+
+    def __init__(self, producer, name, max_size=GWCLOUD_ARCHIVE_PIPE_SIZE):
+        super().__init__()
+        self.name = name
+        self.max_size = max_size
+        self._chunks = deque()
+        self._size = 0
+        self._finished = False
+        self._error = None
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._produce, args=(producer,), daemon=True)
+        self._thread.start()
+
+    def _produce(self, producer):
+        try:
+            producer(_PipeWriter(self))
+        except BaseException as e:
+            self._error = e
+        finally:
+            with self._condition:
+                self._finished = True
+                self._condition.notify_all()
+
+    def _write(self, data):
+        data = bytes(data)
+        if not data:
+            # An empty chunk would be read as the end of the stream
+            return 0
+
+        with self._condition:
+            # A single write larger than the buffer is still accepted once the buffer is empty
+            self._condition.wait_for(lambda: self.closed or not self._chunks or self._size + len(data) <= self.max_size)
+            if self.closed:
+                raise BrokenPipeError("The archive pipe was closed before the archive was complete")
+            self._chunks.append(data)
+            self._size += len(data)
+            self._condition.notify_all()
+        return len(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        with self._condition:
+            self._condition.wait_for(lambda: self._chunks or self._finished)
+            if not self._chunks:
+                if self._error is not None:
+                    raise self._error
+                return 0
+
+            chunk = self._chunks.popleft()
+            size = min(len(buffer), len(chunk))
+            buffer[:size] = chunk[:size]
+            if size < len(chunk):
+                self._chunks.appendleft(chunk[size:])
+            self._size -= size
+            self._condition.notify_all()
+            return size
+
+    def close(self):
+        with self._condition:
+            super().close()
+            self._chunks.clear()
+            self._size = 0
+            self._condition.notify_all()
+        self._thread.join()
+
+
+class _PipeWriter(io.RawIOBase):
+    def __init__(self, pipe):
+        super().__init__()
+        self._pipe = pipe
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        return self._pipe._write(data)
+
+
+def stream_job_archive(job_directory, codec="gzip", level=None, threads=None, content_aware=True, members=None):
+    """Create a tar archive of a job directory as a readable stream. The archive is written in a separate
+    thread as it is read, without writing it to disk
+
+    Parameters
+    ----------
+    job_directory : str or ~pathlib.Path
+        Path to the job directory
+    codec : str, optional
+        Compression used for the archive, as for :func:`write_job_archive`, by default 'gzip'
+    level : int, optional
+        Compression level, by default the default level of the codec
+    threads : int, optional
+        Number of threads used by the parallel codecs, by default the number of CPUs
+    content_aware : bool, optional
+        If True, files which are already compressed are stored without being compressed again, by default True
+    members : list, optional
+        Paths of the files and directories in the job directory to archive. If None, everything is archived,
+        by default None
+
+    Returns
+    -------
+    ArchivePipe
+        Readable stream of the archive, which should be closed once it is no longer needed
+    """
+    name = f"job{archive_extension(codec)}"
+    return ArchivePipe(
+        lambda fileobj: write_job_archive(fileobj, job_directory, codec, level, threads, content_aware, members),
+        name
+    )
+
+
+class SpooledArchive(io.RawIOBase):
+    """
+    SpooledArchive is a temporary file for a job archive, which is held in memory until it grows larger than
+    `max_size` bytes, after which it is moved to a file in the system temporary directory. Unlike an
+    :class:`ArchivePipe`, the whole archive is written before it is read, so its size is known when it is uploaded.
+    Unlike a :class:`tempfile.SpooledTemporaryFile`, it is named, so that it can be uploaded as a file.
+
+    Parameters
+    ----------
+    name : str
+        File name of the archive, used when it is uploaded
+    max_size : int, optional
+        Maximum number of bytes held in memory, by default GWCLOUD_ARCHIVE_SPOOL_SIZE
+    """
+
+    def __init__(self, name, max_size=GWCLOUD_ARCHIVE_SPOOL_SIZE):
+        super().__init__()
+        self.name = name
+        self._file = SpooledTemporaryFile(max_size=max_size)
+
+    def readable(self):
+        return True
+
+    def writable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._file.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def write(self, data):
+        return self._file.write(data)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        return self._file.seek(offset, whence)
+
+    def tell(self):
+        return self._file.tell()
+
+    def close(self):
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+
+def spool_job_archive(job_directory, codec="gzip", level=None, threads=None, content_aware=True, members=None):
+    """Create a tar archive of a job directory in a :class:`SpooledArchive`, which is held in memory unless it is
+    larger than GWCLOUD_ARCHIVE_SPOOL_SIZE, so that no temporary file is written to the job directory
+
+    Parameters
+    ----------
+    job_directory : str or ~pathlib.Path
+        Path to the job directory
+    codec : str, optional
+        Compression used for the archive, as for :func:`write_job_archive`, by default 'gzip'
+    level : int, optional
+        Compression level, by default the default level of the codec
+    threads : int, optional
+        Number of threads used by the parallel codecs, by default the number of CPUs
+    content_aware : bool, optional
+        If True, files which are already compressed are stored without being compressed again, by default True
+    members : list, optional
+        Paths of the files and directories in the job directory to archive. If None, everything is archived,
+        by default None
+
+    Returns
+    -------
+    SpooledArchive
+        The complete archive, positioned at its start, which should be closed once it is no longer needed
+    """
+    archive = SpooledArchive(f"job{archive_extension(codec)}")
+    try:
+        write_job_archive(archive, job_directory, codec, level, threads, content_aware, members)
+        archive.seek(0)
+    except BaseException:
+        archive.close()
+        raise
+    return archive
@@ -0,0 +1,228 @@
+import io
+import json
+import os
+import threading
+from pathlib import Path
+
+
+def part_ranges(size, part_size):
+    """Split a file into parts of a fixed size, the last of which may be smaller
+
+    Parameters
+    ----------
+    size : int
+        Size of the file in bytes
+    part_size : int
+        Size of each part in bytes
+
+    Returns
+    -------
+    list
+        The part number, starting from 1, offset and size of each part. An empty file has a single empty part
+    """
+    offsets = range(0, size, part_size) if size else [0]
+    return [(number, offset, min(part_size, size - offset)) for number, offset in enumerate(offsets, start=1)]
+
+
+class FilePart(io.RawIOBase):
+    """
+    FilePart is a readable view of a range of bytes in a file, which reads from its own handle so that several parts
+    of the same file can be read at once from different threads.
+
+    Parameters
+    ----------
+    path : str or ~pathlib.Path
+        Path to the file
+    offset : int
+        Position in the file at which the part starts
+    size : int
+        Number of bytes in the part
+    on_read : function, optional
+        Called with the number of bytes each time the part is read, by default None. Bytes which are read again after
+        seeking back, such as when a request is retried, are not counted again
+    """
+
+    def __init__(self, path, offset, size, on_read=None):
+        super().__init__()
+        self.name = Path(path).name
+        self.offset = offset
+        self.size = size
+        self.on_read = on_read
+        self._file = open(path, "rb")
+        self._file.seek(offset)
+        self._position = 0
+        self._read = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self.size
+        self._position = min(max(offset, 0), self.size)
+        self._file.seek(self.offset + self._position)
+        return self._position
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self.size - self._position)
+        if size <= 0:
+            return 0
+
+        size = self._file.readinto(memoryview(buffer)[:size])
+        self._position += size
+        if self.on_read is not None and self._position > self._read:
+            self.on_read(self._position - self._read)
+        self._read = max(self._read, self._position)
+        return size
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+class UploadProgress:
+    """
+    UploadProgress combines the progress of the parts of a file being uploaded at the same time into a single callback
+
+    Parameters
+    ----------
+    progress : function
+        Called with the number of bytes sent so far and the total number of bytes
+    total : int
+        Total size of the file in bytes
+    sent : int, optional
+        Number of bytes which had already been sent before the upload started, by default 0
+    """
+
+    def __init__(self, progress, total, sent=0):
+        self.progress = progress
+        self.total = total
+        self.sent = sent
+        self._lock = threading.Lock()
+
+    def __call__(self, size):
+        with self._lock:
+            self.sent += size
+            self.progress(self.sent, self.total)
+
+
+class UploadJournal:
+    """
+    UploadJournal records the parts of a chunked upload that have been completed in a local JSON file, so that an
+    interrupted upload can be resumed by sending only the parts that are missing.
+
+    Parameters
+    ----------
+    path : str or ~pathlib.Path
+        Path to the journal file
+
+    Attributes
+    ----------
+    session_id : str or None
+        ID of the upload session on the server
+    parts : dict
+        Dictionary mapping the number of each completed part to the ID returned by the server
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.session_id = None
+        self.parts = {}
+        self._fingerprint = None
+
+    @staticmethod
+    def fingerprint(file_path, part_size):
+        """Identify a version of a file and the parts it is split into, so that a journal is only resumed for the
+        same upload
+
+        Parameters
+        ----------
+        file_path : ~pathlib.Path
+            Path to the file being uploaded
+        part_size : int
+            Size of each part in bytes
+
+        Returns
+        -------
+        dict
+        """
+        stat = file_path.stat()
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "part_size": part_size}
+
+    def resume(self, fingerprint):
+        """Load the journal of a previous attempt at the same upload, if there is one
+
+        Parameters
+        ----------
+        fingerprint : dict
+            Fingerprint of the upload, from :meth:`fingerprint`
+
+        Returns
+        -------
+        bool
+            True if the journal was loaded, False if there is no journal or it is for a different upload
+        """
+        try:
+            with self.path.open() as f:
+                journal = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if journal.get("fingerprint") != fingerprint:
+            return False
+
+        self.session_id = journal["session_id"]
+        self.parts = {int(number): part_id for number, part_id in journal["parts"].items()}
+        self._fingerprint = fingerprint
+        return True
+
+    def start(self, session_id, fingerprint):
+        """Start a new journal, replacing any existing journal
+
+        Parameters
+        ----------
+        session_id : str
+            ID of the upload session on the server
+        fingerprint : dict
+            Fingerprint of the upload, from :meth:`fingerprint`
+        """
+        self.session_id = session_id
+        self.parts = {}
+        self._fingerprint = fingerprint
+        self._save()
+
+    def record(self, number, part_id):
+        """Record that a part has been uploaded
+
+        Parameters
+        ----------
+        number : int
+            Number of the part
+        part_id : str
+            ID of the part returned by the server
+        """
+        self.parts[number] = part_id
+        self._save()
+
+    def remove(self):
+        """Remove the journal once the upload is complete"""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _save(self):
+        journal = {"session_id": self.session_id, "fingerprint": self._fingerprint, "parts": self.parts}
+        # The journal is replaced in a single step, so that it is never left partially written
+        temporary_path = self.path.with_name(f"{self.path.name}.tmp")
+        with temporary_path.open("w") as f:
+            json.dump(journal, f)
+        os.replace(temporary_path, self.path)
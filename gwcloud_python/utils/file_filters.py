@@ -1,5 +1,69 @@
-from gwdc_python.files.filters import filter_file_list
-from . import identifiers
+def _categories(file_path):
+    """Find every category a file path belongs to, with the same rules as the matching functions in
+    :mod:`~gwcloud_python.utils.identifiers`, but looking at each part of the path only once"""
+    name = file_path.name
+    suffix = file_path.suffix
+    parts = file_path.parts
+    # The first directory containing the file, as checked by identifiers.data_dir and identifiers.result_dir
+    base_dir = parts[0] if len(parts) > 1 else None
+
+    categories = []
+    if suffix == '.png':
+        categories.append('png')
+        if base_dir == 'data':
+            categories.append('data_png')
+        elif base_dir == 'result':
+            categories.append('result_png')
+        if name.endswith('_corner.png'):
+            categories.append('corner_plot')
+    elif suffix == '.html':
+        categories.append('html')
+    elif name.endswith('_config_complete.ini'):
+        categories.append('config')
+    elif base_dir == 'result' and name.endswith('_result.json'):
+        categories.append('result_json')
+        if name.endswith('_merge_result.json'):
+            categories.append('result_merged_json')
+    return tuple(categories)
+
+
+def _path_cached(f, key, compute):
+    """Get a value computed from the path of a file, such as its categories. The values are kept on the file itself,
+    along with the path they were computed for, so that a list filtered several times is only classified once and the
+    values go away with the files. Files which can't hold attributes, such as named tuples, are classified each time"""
+    cache = getattr(f, '_path_cache', None)
+    if cache is None or cache[0] != f.path:
+        cache = (f.path, {})
+        try:
+            f._path_cache = cache
+        except AttributeError:
+            pass
+
+    values = cache[1]
+    if key not in values:
+        values[key] = compute(f.path)
+    return values[key]
+
+
+def _classify(file_list):
+    # Sorts the files into the categories used by the file list filters in a single pass over the list
+    classified = {}
+    for f in file_list:
+        for category in _path_cached(f, 'categories', _categories):
+            classified.setdefault(category, []).append(f)
+    return classified
+
+
+def _first_category(classified, *categories):
+    # Returns the files in the first of the categories which has any, as a new list which can be safely modified
+    for category in categories:
+        if classified.get(category):
+            return list(classified[category])
+    return []
+
+
+def _category(file_list, *categories):
+    return _first_category(_classify(file_list), *categories)
 
 
 def default_filter(file_list):
@@ -21,26 +85,12 @@ def default_filter(file_list):
     .FileReferenceList
         Subset of the input FileReferenceList containing only the paths that match the above default file criteria
     """
-    # Get png files in data dir
-    data_png_file_list, file_list = filter_file_list(identifiers.data_png_file, file_list)
-
-    # Get png files in result dir
-    result_png_file_list, file_list = filter_file_list(identifiers.result_png_file, file_list)
-
-    # Get complete config file
-    config_file_list, file_list = filter_file_list(identifiers.config_file, file_list)
-
-    # Get index html file
-    html_file_list, file_list = filter_file_list(identifiers.html_file, file_list)
-
-    # Get merged json file in result dir
-    result_json_file_list, file_list = filter_file_list(identifiers.result_merged_json_file, file_list)
-
-    # If merged json doesn't exist, get result json file in result dir
-    if not result_json_file_list:
-        result_json_file_list, file_list = filter_file_list(identifiers.result_json_file, file_list)
-
-    return data_png_file_list + result_png_file_list + config_file_list + html_file_list + result_json_file_list
+    classified = _classify(file_list)
+    return [
+        f
+        for category in ['data_png', 'result_png', 'config', 'html']
+        for f in classified.get(category, [])
+    ] + _first_category(classified, 'result_merged_json', 'result_json')
 
 
 def config_filter(file_list):
@@ -58,7 +108,7 @@ def config_filter(file_list):
     .FileReferenceList
         Subset of the input FileReferenceList containing only the paths that match the above config file criteria
     """
-    return filter_file_list(identifiers.config_file, file_list)[0]
+    return _category(file_list, 'config')
 
 
 def png_filter(file_list):
@@ -76,7 +126,7 @@ def png_filter(file_list):
     .FileReferenceList
         Subset of the input FileReferenceList containing only the paths that match the above png file criteria
     """
-    return filter_file_list(identifiers.png_file, file_list)[0]
+    return _category(file_list, 'png')
 
 
 def corner_plot_filter(file_list):
@@ -94,7 +144,7 @@ def corner_plot_filter(file_list):
     .FileReferenceList
         Subset of the input FileReferenceList containing only the paths that match the above corner plot file criteria
     """
-    return filter_file_list(identifiers.corner_plot_file, file_list)[0]
+    return _category(file_list, 'corner_plot')
 
 
 def result_json_filter(file_list):
@@ -113,14 +163,7 @@ def result_json_filter(file_list):
     .FileReferenceList
         Subset of the input FileReferenceList containing only the paths that match the merged json file criteria
     """
-    # Get merged json file in result dir
-    result_json_file_list, _ = filter_file_list(identifiers.result_merged_json_file, file_list)
-
-    # If merged json doesn't exist, get result json file in result dir
-    if not result_json_file_list:
-        result_json_file_list, _ = filter_file_list(identifiers.result_json_file, file_list)
-
-    return result_json_file_list
+    return _category(file_list, 'result_merged_json', 'result_json')
 
 
 def sort_file_list(file_list):
@@ -1,8 +1,84 @@
+from hashlib import sha256
 from pathlib import Path
 
+from ..settings import GWCLOUD_UPLOAD_CHUNK_SIZE
+
 
 def check_file(path):
     path = Path(path)
     if not path.is_file():
         raise Exception(f"The supporting file \"{str(path)}\" does not exist.")
     return path
+
+
+def _file_digest(path):
+    digest = sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(GWCLOUD_UPLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def group_supporting_files(tokens, file_paths):
+    """Group the upload tokens of supporting files by the file they refer to, so that each file is only uploaded once.
+    Paths which resolve to the same file are grouped together, as are different files with the same contents
+
+    Parameters
+    ----------
+    tokens : list
+        List of supporting file upload tokens
+    file_paths : list
+        List of local file paths to the supporting files, one for each token
+
+    Returns
+    -------
+    list
+        The path, size and list of tokens of each distinct file, in the order the files first appear
+    """
+    files = {}
+    for token, file_path in zip(tokens, file_paths):
+        path = check_file(file_path).resolve()
+        stat = path.stat()
+        files.setdefault((stat.st_dev, stat.st_ino), (path, stat.st_size, []))[2].append(token)
+
+    # Only files of the same size can have the same contents, so other files are not read
+    sizes = {}
+    for path, size, _ in files.values():
+        sizes[size] = sizes.get(size, 0) + 1
+
+    distinct = {}
+    for key, (path, size, file_tokens) in files.items():
+        if sizes[size] > 1:
+            key = (size, _file_digest(path))
+        distinct.setdefault(key, (path, size, []))[2].extend(file_tokens)
+    return list(distinct.values())
+
+
+def batch_supporting_files(files, max_bytes, max_files):
+    """Split supporting files into batches to be uploaded in separate requests
+
+    Parameters
+    ----------
+    files : list
+        The path, size and list of tokens of each file, from :func:`group_supporting_files`
+    max_bytes : int
+        Maximum total size of the files in a batch, unless a single file is larger
+    max_files : int
+        Maximum number of files in a batch
+
+    Returns
+    -------
+    list
+        List of batches, each of which is a list of files
+    """
+    batches, batch, batch_bytes = [], [], 0
+    for f in files:
+        if batch and (batch_bytes + f[1] > max_bytes or len(batch) >= max_files):
+            batches.append(batch)
+            batch, batch_bytes = [], 0
+        batch.append(f)
+        batch_bytes += f[1]
+
+    if batch:
+        batches.append(batch)
+    return batches
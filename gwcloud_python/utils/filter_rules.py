@@ -0,0 +1,246 @@
+import re
+from pathlib import PurePath
+
+from .file_filters import _path_cached
+
+# A numbered backreference, whose backslash is not itself escaped
+_BACKREFERENCE = re.compile(r"(?<!\\)(?:\\\\)*\\[1-9]")
+
+
+def _glob_pattern(pattern):
+    # Translates a glob pattern into a regular expression matching the whole of a path
+    regex = "" if "/" in pattern else "(?:.*/)?"
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+        elif pattern.startswith("**", i):
+            regex += ".*"
+            i += 2
+        elif pattern[i] == "*":
+            regex += "[^/]*"
+            i += 1
+        elif pattern[i] == "?":
+            regex += "[^/]"
+            i += 1
+        elif pattern[i] == "[" and pattern.find("]", i + 2) != -1:
+            end = pattern.find("]", i + 2)
+            characters = pattern[i + 1:end].replace("\\", "\\\\")
+            if characters.startswith("!"):
+                characters = "^" + characters[1:]
+            regex += f"[{characters}]"
+            i = end + 1
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+    return regex + r"\Z"
+
+
+class FilterRule:
+    """
+    FilterRule is the base of the declarative rules which select files by their path. Rules are combined with
+    :class:`All`, :class:`Any` and :class:`Fallback`, or the `&` and `|` operators, and a rule is itself a file list
+    filter, which takes a list of files with a `path` attribute and returns those it selects, in the order they are
+    listed. It can therefore be registered as a filter of a job, such as with
+    ``BilbyJob.register_file_list_filter('result_hdf5', Directory('result') & Suffix('.hdf5'))``, or used to select
+    the files of an :class:`~gwcloud_python.utils.upload_filter.UploadFilter`.
+
+    All of the path rules in a rule are compiled into a single regular expression the first time it is used, so that
+    each path is only matched once, and the matches are kept on each file, so that filtering the same files again
+    doesn't match their paths again.
+    """
+
+    _compiled = None
+
+    def __and__(self, other):
+        return All(self, other)
+
+    def __or__(self, other):
+        return Any(self, other)
+
+    def _leaves(self):
+        raise NotImplementedError
+
+    def _select(self, matched):
+        raise NotImplementedError
+
+    def __call__(self, file_list):
+        if self._compiled is None:
+            self._compiled = _CompiledRule(self)
+        return self._compiled(file_list)
+
+
+class _PathRule(FilterRule):
+    # A rule matching the path of each file against a regular expression, anchored at the start of the path
+    def __init__(self, pattern):
+        self.pattern = pattern
+
+    def _leaves(self):
+        yield self
+
+    def _select(self, matched):
+        return matched[self.pattern]
+
+
+class Glob(_PathRule):
+    """
+    Selects the files matching a glob pattern, such as 'result/**/*.hdf5'. The pattern is matched against the whole
+    path of the file, in which '*' and '?' do not match across directories, and '**/' matches any number of
+    directories. A pattern without a '/' is matched against the name of the file, in any directory.
+
+    Parameters
+    ----------
+    pattern : str
+        Glob pattern to match
+    """
+
+    def __init__(self, pattern):
+        super().__init__(_glob_pattern(pattern))
+
+
+class Regex(_PathRule):
+    """
+    Selects the files whose path contains a match for a regular expression, which may be anchored with '^' and '$'.
+    As the expression is compiled together with the other rules, it must not use named groups, backreferences or
+    global flags such as '(?i)', though flags can be set for part of the expression with a group such as '(?i:...)'.
+
+    Parameters
+    ----------
+    pattern : str
+        Regular expression to search for
+
+    Raises
+    ------
+    ValueError
+        If the expression uses named groups, backreferences or global flags
+    re.error
+        If the expression is not valid
+    """
+
+    def __init__(self, pattern):
+        compiled = re.compile(pattern)
+        if compiled.flags & ~re.UNICODE:
+            raise ValueError(
+                f"The regular expression {pattern!r} sets global flags, which would apply to every rule it is compiled "
+                f"with. Use a group such as '(?i:...)' to set flags for part of the expression instead"
+            )
+        if compiled.groupindex or _BACKREFERENCE.search(pattern):
+            raise ValueError(
+                f"The regular expression {pattern!r} uses named groups or backreferences, which can't be used as it is "
+                f"compiled together with other rules"
+            )
+
+        super().__init__(f".*?(?:{pattern})")
+        # Checks that the expression can be compiled in the form it takes in the combined expression
+        re.compile(f"(?:(?=(?P<rule0>{self.pattern})))?")
+
+
+class Directory(_PathRule):
+    """
+    Selects the files in a directory, including those in its subdirectories.
+
+    Parameters
+    ----------
+    directory : str or ~pathlib.Path
+        Path of the directory, relative to the job, such as 'result'
+    anywhere : bool, optional
+        If True, the directory may be inside any other directory, by default False
+    """
+
+    def __init__(self, directory, anywhere=False):
+        directory = re.escape(PurePath(directory).as_posix().strip("/")) + "/"
+        super().__init__(f"(?:.*/)?{directory}" if anywhere else directory)
+
+
+class Suffix(_PathRule):
+    """
+    Selects the files whose name ends with the given string, such as '.png' or '_result.json'.
+
+    Parameters
+    ----------
+    suffix : str
+        End of the file name
+    """
+
+    def __init__(self, suffix):
+        super().__init__(f".*{re.escape(suffix)}\\Z")
+
+
+class _CombinedRule(FilterRule):
+    def __init__(self, *rules):
+        self.rules = rules
+
+    def _leaves(self):
+        for rule in self.rules:
+            yield from rule._leaves()
+
+
+class All(_CombinedRule):
+    """
+    Selects the files selected by every one of the given rules.
+
+    Parameters
+    ----------
+    *rules : FilterRule
+        Rules to combine
+    """
+
+    def _select(self, matched):
+        return set.intersection(*[rule._select(matched) for rule in self.rules])
+
+
+class Any(_CombinedRule):
+    """
+    Selects the files selected by any of the given rules.
+
+    Parameters
+    ----------
+    *rules : FilterRule
+        Rules to combine
+    """
+
+    def _select(self, matched):
+        return set().union(*[rule._select(matched) for rule in self.rules])
+
+
+class Fallback(_CombinedRule):
+    """
+    Selects the files selected by the first of the given rules to select any files from the list, such as
+    ``Fallback(Suffix('_merge_result.json'), Suffix('_result.json'))`` to select the merged result files, or the
+    unmerged result files if there are no merged ones.
+
+    Parameters
+    ----------
+    *rules : FilterRule
+        Rules to try, in order
+    """
+
+    def _select(self, matched):
+        for rule in self.rules:
+            selected = rule._select(matched)
+            if selected:
+                return selected
+        return set()
+
+
+class _CompiledRule:
+    """Matches each path against all of the path rules of a rule at once, using a regular expression made of an
+    optional lookahead for each path rule, which captures a named group if the path rule matches"""
+
+    def __init__(self, rule):
+        self.rule = rule
+        patterns = list(dict.fromkeys(leaf.pattern for leaf in rule._leaves()))
+        self.patterns = {f"rule{i}": pattern for i, pattern in enumerate(patterns)}
+        self.regex = re.compile("".join(f"(?:(?=(?P<{name}>{pattern})))?" for name, pattern in self.patterns.items()))
+
+    def _match_path(self, file_path):
+        groups = self.regex.match(PurePath(file_path).as_posix()).groupdict()
+        return frozenset(pattern for name, pattern in self.patterns.items() if groups[name] is not None)
+
+    def __call__(self, file_list):
+        matched = {pattern: set() for pattern in self.patterns.values()}
+        for index, f in enumerate(file_list):
+            for pattern in _path_cached(f, self.regex, self._match_path):
+                matched[pattern].add(index)
+        return [file_list[index] for index in sorted(self.rule._select(matched))]
@@ -0,0 +1,133 @@
+import re
+from functools import lru_cache
+from hashlib import sha256
+
+_OPERATION = re.compile(r'^\s*(query|mutation|subscription)?\s*([_A-Za-z]\w*)?')
+_ROOT_FIELD = re.compile(r'\{\s*(?:\w+\s*:\s*)?([_A-Za-z]\w*)')
+
+
+@lru_cache(maxsize=1024)
+def query_hash(query):
+    """Get the SHA-256 hash of a GraphQL document, as used to identify persisted queries.
+    Hashes are cached, so each document is only hashed once
+
+    Parameters
+    ----------
+    query : str
+        GraphQL document
+
+    Returns
+    -------
+    str
+        Hex digest of the SHA-256 hash of the document
+    """
+    return sha256(query.encode('utf-8')).hexdigest()
+
+
+@lru_cache(maxsize=1024)
+def parse_operation(query):
+    """Get the type and name of the operation in a GraphQL document. Anonymous operations are named after their
+    first root field, and documents without an operation type are queries
+
+    Parameters
+    ----------
+    query : str
+        GraphQL document
+
+    Returns
+    -------
+    tuple
+        The operation type, one of "query", "mutation" or "subscription", and the operation name
+    """
+    operation_type, name = _OPERATION.match(query).groups()
+    if name is None:
+        root_field = _ROOT_FIELD.search(query)
+        name = root_field.group(1) if root_field else "anonymous"
+    return operation_type or "query", name
+
+
+def batched_operation(operation, name, field, argument, argument_type, selection, count):
+    """Build a GraphQL document which applies the same field to many arguments, using aliases to distinguish them.
+    Each aliased field is named `item{i}` and takes its argument from the variable `${argument}{i}`
+
+    Parameters
+    ----------
+    operation : str
+        Type of the operation, either "query" or "mutation"
+    name : str
+        Name of the operation
+    field : str
+        Name of the field to apply to each argument
+    argument : str
+        Name of the argument of the field
+    argument_type : str
+        GraphQL type of the argument, e.g. "ID!"
+    selection : str
+        Selection set applied to each aliased field, including the enclosing braces
+    count : int
+        Number of aliased fields in the document
+
+    Returns
+    -------
+    str
+        The batched GraphQL document
+    """
+    variables = ", ".join(f"${argument}{i}: {argument_type}" for i in range(count))
+    fields = "\n".join(f"item{i}: {field} ({argument}: ${argument}{i}) {selection}" for i in range(count))
+    return f"{operation} {name}({variables}) {{\n{fields}\n}}"
+
+
+def batched_variables(argument, values):
+    """Build the variables for a document created with :func:`batched_operation`
+
+    Parameters
+    ----------
+    argument : str
+        Name of the argument of the field
+    values : list
+        Values of the argument for each aliased field
+
+    Returns
+    -------
+    dict
+        Variables dictionary for the batched document
+    """
+    return {f"{argument}{i}": value for i, value in enumerate(values)}
+
+
+def batched_results(data, count):
+    """Unpack the response of a document created with :func:`batched_operation` into a list of results
+
+    Parameters
+    ----------
+    data : dict
+        Data returned by the request
+    count : int
+        Number of aliased fields in the document
+
+    Returns
+    -------
+    list
+        Results of each aliased field, in order
+    """
+    return [data.get(f"item{i}") for i in range(count)]
+
+
+def chunked(items, size):
+    """Split a list into consecutive chunks of at most `size` items
+
+    Parameters
+    ----------
+    items : list
+        List to split
+    size : int
+        Maximum size of each chunk
+
+    Yields
+    ------
+    list
+        Consecutive chunks of the input list
+    """
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
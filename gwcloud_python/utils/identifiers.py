@@ -33,6 +33,22 @@ def png_file(file_path):
     return match_file_suffix(file_path, 'png')
 
 
+def hdf5_file(file_path):
+    """Checks to see if the given file path points to a HDF5 file
+
+    Parameters
+    ----------
+    file_path : ~pathlib.Path
+        File path to check
+
+    Returns
+    -------
+    bool
+        True if path points to a HDF5 file, False otherwise
+    """
+    return match_file_suffix(file_path, 'hdf5') or match_file_suffix(file_path, 'h5')
+
+
 def data_dir(file_path):
     """Checks to see if the given file path starts with 'data' directory
 
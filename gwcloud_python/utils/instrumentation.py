@@ -0,0 +1,172 @@
+import json
+from bisect import bisect_left
+from threading import Lock
+
+# Upper bounds, in seconds, of the buckets of the request latency histograms
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+class OperationStats:
+    """Aggregated statistics for all requests of a single GraphQL operation."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        # One count per latency bucket, with a final bucket for latencies beyond the largest bound
+        self.latency_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def record(self, latency, request_bytes=0, response_bytes=0, retries=0, error=False):
+        self.count += 1
+        self.errors += bool(error)
+        self.retries += retries
+        self.request_bytes += request_bytes
+        self.response_bytes += response_bytes
+        self.latency_sum += latency
+        self.latency_max = max(self.latency_max, latency)
+        self.latency_counts[bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def percentile(self, q):
+        """Estimate a latency percentile from the histogram, as the upper bound of the bucket containing it
+
+        Parameters
+        ----------
+        q : float
+            Percentile to estimate, between 0 and 100
+
+        Returns
+        -------
+        float or None
+            Estimated latency in seconds, or None if no requests have been recorded
+        """
+        if not self.count:
+            return None
+
+        rank = q / 100 * self.count
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.latency_counts):
+            cumulative += count
+            if cumulative >= rank:
+                return min(bound, self.latency_max)
+        return self.latency_max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "retries": self.retries,
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "latency_mean": self.latency_sum / self.count if self.count else None,
+            "latency_max": self.latency_max,
+            "latency_p50": self.percentile(50),
+            "latency_p90": self.percentile(90),
+            "latency_p99": self.percentile(99),
+        }
+
+
+class RequestStats:
+    """
+    RequestStats records the GraphQL requests made by a GWCloud instance, aggregated by operation name.
+    Each operation keeps counts of its requests, errors, retries and bytes sent and received, along with a histogram of
+    request latencies from which percentiles are estimated.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.operations = {}
+
+    def record(self, operation, latency, request_bytes=0, response_bytes=0, retries=0, error=False):
+        """Record a single request
+
+        Parameters
+        ----------
+        operation : str
+            Name of the GraphQL operation
+        latency : float
+            Time taken by the request, in seconds
+        request_bytes : int, optional
+            Size of the request body, by default 0
+        response_bytes : int, optional
+            Size of the response body, by default 0
+        retries : int, optional
+            Number of times the request was retried, by default 0
+        error : bool, optional
+            True if the request failed, by default False
+        """
+        with self._lock:
+            stats = self.operations.get(operation)
+            if stats is None:
+                stats = self.operations[operation] = OperationStats()
+            stats.record(latency, request_bytes, response_bytes, retries, error)
+
+    def reset(self):
+        """Discard all recorded requests"""
+        with self._lock:
+            self.operations = {}
+
+    def summary(self):
+        """Summarise the recorded requests
+
+        Returns
+        -------
+        dict
+            Dictionary mapping each operation name to a dictionary of its statistics
+        """
+        with self._lock:
+            return {operation: stats.summary() for operation, stats in sorted(self.operations.items())}
+
+    def to_json(self):
+        """Export the summary of the recorded requests as JSON
+
+        Returns
+        -------
+        str
+        """
+        return json.dumps(self.summary())
+
+    def to_prometheus(self, prefix="gwcloud"):
+        """Export the recorded requests in the Prometheus text exposition format
+
+        Parameters
+        ----------
+        prefix : str, optional
+            Prefix of the metric names, by default "gwcloud"
+
+        Returns
+        -------
+        str
+        """
+        counters = [
+            ("requests_total", "Total number of GraphQL requests", "count"),
+            ("request_errors_total", "Total number of failed GraphQL requests", "errors"),
+            ("request_retries_total", "Total number of retried GraphQL requests", "retries"),
+            ("request_bytes_total", "Total size of GraphQL request bodies in bytes", "request_bytes"),
+            ("response_bytes_total", "Total size of GraphQL response bodies in bytes", "response_bytes"),
+        ]
+
+        with self._lock:
+            operations = sorted(self.operations.items())
+            lines = []
+            for name, description, attribute in counters:
+                lines.append(f"# HELP {prefix}_{name} {description}")
+                lines.append(f"# TYPE {prefix}_{name} counter")
+                for operation, stats in operations:
+                    lines.append(f'{prefix}_{name}{{operation="{operation}"}} {getattr(stats, attribute)}')
+
+            name = f"{prefix}_request_duration_seconds"
+            lines.append(f"# HELP {name} Latency of GraphQL requests in seconds")
+            lines.append(f"# TYPE {name} histogram")
+            for operation, stats in operations:
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), stats.latency_counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{operation="{operation}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_sum{{operation="{operation}"}} {stats.latency_sum}')
+                lines.append(f'{name}_count{{operation="{operation}"}} {stats.count}')
+
+        return "\n".join(lines) + "\n"
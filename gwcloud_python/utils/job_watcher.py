@@ -0,0 +1,107 @@
+import time
+from dataclasses import dataclass
+
+from gwdc_python.helpers import JobStatus
+from gwdc_python.logger import create_logger
+
+logger = create_logger(__name__)
+
+# Job status names from which a job will not progress any further
+TERMINAL_JOB_STATUSES = frozenset({
+    'Completed',
+    'Error',
+    'Cancelled',
+    'Deleted',
+    'Wall Time Exceeded',
+    'Out of Memory',
+})
+
+
+def is_terminal(status):
+    """Checks to see if a job status is one from which the job will not progress any further
+
+    Parameters
+    ----------
+    status : ~gwdc_python.helpers.JobStatus
+        Job status to check
+
+    Returns
+    -------
+    bool
+        True if the status is terminal, False otherwise
+    """
+    return status is not None and status.status in TERMINAL_JOB_STATUSES
+
+
+@dataclass
+class JobStatusChange:
+    """Describes a change in the status of a job seen while watching it."""
+    job: object
+    previous: JobStatus
+    status: JobStatus
+
+    @property
+    def is_terminal(self):
+        return is_terminal(self.status)
+
+
+def _watch_job_statuses(get_statuses, jobs, min_interval, max_interval, backoff, timeout=None):
+    """Poll the statuses of many jobs until they have all reached a terminal status, yielding changes as they are seen.
+    Jobs are polled together using a single function call, and the polling interval backs off while nothing changes.
+
+    Parameters
+    ----------
+    get_statuses : function
+        Takes a list of job ids and returns a dict mapping each id to its job status data, or None if missing
+    jobs : list
+        List of BilbyJob instances to watch. Their status attribute is updated as changes are seen
+    min_interval : float
+        Minimum time between polls, in seconds
+    max_interval : float
+        Maximum time between polls, in seconds
+    backoff : float
+        Factor by which the polling interval grows after a poll that saw no changes
+    timeout : float, optional
+        Stop watching after this many seconds, by default None
+
+    Yields
+    ------
+    JobStatusChange
+        The change in status of a job
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    pending = {job.id: job for job in jobs if not is_terminal(job.status)}
+    interval = min_interval
+
+    while pending:
+        changed = False
+        for job_id, status_data in get_statuses(list(pending)).items():
+            job = pending[job_id]
+            if status_data is None:
+                logger.warning(f'Job {job_id} could not be found, it will no longer be watched.')
+                del pending[job_id]
+                continue
+
+            status = JobStatus(status=status_data['name'], date=status_data['date'])
+            if status == job.status:
+                continue
+
+            changed = True
+            change = JobStatusChange(job=job, previous=job.status, status=status)
+            job.status = status
+            if change.is_terminal:
+                del pending[job_id]
+            yield change
+
+        if not pending:
+            return
+
+        interval = min_interval if changed else min(interval * backoff, max_interval)
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.info(f'Stopped watching {len(pending)} jobs that have not finished.')
+                return
+            interval = min(interval, remaining)
+
+        time.sleep(interval)
@@ -0,0 +1,155 @@
+import json
+import os
+from uuid import uuid4
+
+from gwdc_python.logger import create_logger
+from tqdm import tqdm
+
+from ..settings import GWCLOUD_UPLOAD_CHUNK_SIZE
+
+logger = create_logger(__name__)
+
+
+def _remaining_size(f):
+    """Get the number of bytes between the current position of a file and its end, or None if it can't be known"""
+    try:
+        return os.fstat(f.fileno()).st_size - f.tell()
+    except (AttributeError, OSError, ValueError):
+        pass
+
+    try:
+        position = f.tell()
+        size = f.seek(0, os.SEEK_END) - position
+        f.seek(position)
+        return size
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _file_key(f):
+    """Identify the data that will be read from a file, so that the same data is only sent once"""
+    try:
+        stat = os.fstat(f.fileno())
+        return stat.st_dev, stat.st_ino, f.tell()
+    except (AttributeError, OSError, ValueError):
+        return id(f)
+
+
+def tqdm_progress():
+    """Create an upload progress callback which displays a tqdm progress bar
+
+    Returns
+    -------
+    function
+        Progress callback, taking the number of bytes sent so far and the total number of bytes
+    """
+    bar = None
+
+    def update_progress(bytes_sent, total):
+        nonlocal bar
+        if bar is None:
+            bar = tqdm(total=total, leave=True, unit="B", unit_scale=True)
+        bar.update(bytes_sent - bar.n)
+        if total is not None and bytes_sent >= total:
+            bar.close()
+            logger.info("Files are being processed remotely, please be patient. This may take a while...")
+
+    return update_progress
+
+
+class MultipartStream:
+    """
+    MultipartStream encodes a GraphQL multipart request, following the GraphQL multipart request specification, as an
+    iterable of chunks. Files are read a chunk at a time as the request is sent, so only a single chunk is held in
+    memory regardless of the size of the files. A file that appears more than once in the variables is only sent
+    once, with each of its paths listed in the map.
+
+    The requests_toolbelt MultipartEncoder used by GWDC also streams the files, but it is sent outside of the session
+    of the client, without a timeout or retries, and reports its progress to a fixed progress bar. MultipartStream is
+    sent by :class:`~gwcloud_python.client.GWCloudClient`, with its upload timeout and retries, and reports to the
+    progress callback of the upload.
+
+    Parameters
+    ----------
+    operations : dict
+        The GraphQL operation, with each file in the variables replaced by None
+    files : dict
+        Dictionary mapping the path of each file in the operation to a tuple of the file name and file object
+    chunk_size : int, optional
+        Number of bytes read from a file at a time, by default GWCLOUD_UPLOAD_CHUNK_SIZE
+    progress : function, optional
+        Called with the number of bytes sent so far and the total size of the request, which is None if any of the
+        file sizes are unknown, each time a chunk is sent, by default None
+
+    Attributes
+    ----------
+    size : int or None
+        Total size of the request in bytes, or None if it can't be known before the files are read
+    bytes_sent : int
+        Number of bytes of the request that have been sent
+    """
+
+    def __init__(self, operations, files, chunk_size=GWCLOUD_UPLOAD_CHUNK_SIZE, progress=None):
+        self.boundary = uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.bytes_sent = 0
+
+        parts = {}
+        files_map = {}
+        for path, (file_name, f) in files.items():
+            key = _file_key(f)
+            if key not in parts:
+                parts[key] = (str(len(parts)), file_name, f)
+            files_map.setdefault(parts[key][0], []).append(path)
+
+        self._parts = [
+            (self._header("operations"), json.dumps(operations).encode("utf-8")),
+            (self._header("map"), json.dumps(files_map).encode("utf-8")),
+        ] + [(self._header(name, file_name), f) for name, file_name, f in parts.values()]
+        self._footer = f"--{self.boundary}--\r\n".encode("utf-8")
+
+        self.size = len(self._footer)
+        for header, body in self._parts:
+            size = len(body) if isinstance(body, bytes) else _remaining_size(body)
+            if size is None or self.size is None:
+                self.size = None
+            else:
+                # Each part ends with a line break after its body
+                self.size += len(header) + size + 2
+
+    def _header(self, name, file_name=None):
+        disposition = f'form-data; name="{name}"'
+        if file_name is None:
+            return f"--{self.boundary}\r\nContent-Disposition: {disposition}\r\n\r\n".encode("utf-8")
+
+        return (
+            f'--{self.boundary}\r\nContent-Disposition: {disposition}; filename="{file_name}"\r\n'
+            f"Content-Type: application/octet-stream\r\n\r\n"
+        ).encode("utf-8")
+
+    def __len__(self):
+        if self.size is None:
+            raise TypeError("The size of the multipart request is not known")
+        return self.size
+
+    def _chunks(self):
+        for header, body in self._parts:
+            yield header
+            if isinstance(body, bytes):
+                yield body
+            else:
+                chunk = body.read(self.chunk_size)
+                while chunk:
+                    yield chunk
+                    chunk = body.read(self.chunk_size)
+            yield b"\r\n"
+        yield self._footer
+
+    def __iter__(self):
+        for chunk in self._chunks():
+            yield chunk
+            self.bytes_sent += len(chunk)
+            if self.progress is not None:
+                self.progress(self.bytes_sent, self.size)
@@ -0,0 +1,53 @@
+from concurrent.futures import Future
+from threading import Lock
+
+
+class SingleFlight:
+    """
+    SingleFlight ensures that only one call for a given key is in progress at a time. Callers that arrive while a
+    call for the same key is in progress wait for it to finish and share its result, rather than repeating the call.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._calls = {}
+
+    def __len__(self):
+        return len(self._calls)
+
+    def do(self, key, fn):
+        """Call a function, or wait for the result of an identical call that is already in progress
+
+        Parameters
+        ----------
+        key : hashable
+            Identifies calls that are equivalent to each other
+        fn : function
+            Function, taking no arguments, that performs the call
+
+        Returns
+        -------
+        object
+            The result of the call. This is the same object for every caller that shared the call
+
+        Raises
+        ------
+        Exception
+            Any exception raised by the call is raised for every caller that shared it
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if leader:
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    del self._calls[key]
+
+        return future.result()
@@ -0,0 +1,293 @@
+import gzip
+import io
+import os
+import tarfile
+import threading
+import zlib
+
+import pytest
+
+from gwcloud_python.utils.archive import (
+    ArchiveFingerprint,
+    ArchivePipe,
+    SpooledArchive,
+    archive_fingerprint,
+    job_directory_fingerprint,
+    spool_job_archive,
+    stream_job_archive,
+    write_job_archive,
+    _compressed_file,
+    _GzipWriter,
+    _ParallelGzipWriter
+)
+
+
+@pytest.fixture
+def job_directory(tmp_path):
+    (tmp_path / 'data').mkdir()
+    (tmp_path / 'data' / 'test.dat').write_bytes(b'data' * 1000)
+    (tmp_path / 'result').mkdir()
+    (tmp_path / 'result' / 'test_result.json').write_text('{"result": true}')
+    (tmp_path / 'test_config_complete.ini').write_text('label=test')
+    return tmp_path
+
+
+def _archive_contents(data, mode='r:gz'):
+    with tarfile.open(fileobj=io.BytesIO(data), mode=mode) as tar_handle:
+        return {
+            member.name: tar_handle.extractfile(member).read() if member.isfile() else None
+            for member in tar_handle.getmembers()
+        }
+
+
+def test_stream_job_archive(job_directory):
+    written = io.BytesIO()
+    write_job_archive(written, job_directory)
+
+    with stream_job_archive(job_directory) as archive:
+        streamed = archive.read()
+
+    assert _archive_contents(streamed) == _archive_contents(written.getvalue()) == {
+        'data': None,
+        'data/test.dat': b'data' * 1000,
+        'result': None,
+        'result/test_result.json': b'{"result": true}',
+        'test_config_complete.ini': b'label=test',
+    }
+
+
+def test_spool_job_archive(job_directory):
+    written = io.BytesIO()
+    write_job_archive(written, job_directory)
+
+    with spool_job_archive(job_directory) as archive:
+        assert archive.name == 'job.tar.gz'
+        assert archive.read() == written.getvalue()
+        assert archive.seek(0, os.SEEK_END) == len(written.getvalue())
+    # Nothing is written to the job directory
+    assert sorted(path.name for path in job_directory.iterdir()) == ['data', 'result', 'test_config_complete.ini']
+
+
+def test_spooled_archive_rolls_over():
+    with SpooledArchive('test', max_size=100) as archive:
+        archive.write(b'x' * 60)
+        assert not archive._file._rolled
+        archive.write(b'y' * 60)
+        assert archive._file._rolled
+
+        archive.seek(0)
+        assert archive.read() == b'x' * 60 + b'y' * 60
+
+
+def test_archive_pipe_is_bounded():
+    buffered = []
+
+    def producer(fileobj):
+        for _ in range(10):
+            fileobj.write(b'x' * 100)
+            buffered.append(fileobj._pipe._size)
+
+    pipe = ArchivePipe(producer, 'test', max_size=250)
+    assert pipe.read() == b'x' * 1000
+    assert max(buffered) <= 250
+
+
+def test_archive_pipe_raises_producer_error():
+    def producer(fileobj):
+        fileobj.write(b'partial')
+        raise ValueError('Producer failed')
+
+    with ArchivePipe(producer, 'test') as pipe:
+        assert pipe.read(7) == b'partial'
+        with pytest.raises(ValueError, match='Producer failed'):
+            pipe.read(7)
+
+
+def test_archive_pipe_closed_early():
+    stopped = threading.Event()
+
+    def producer(fileobj):
+        try:
+            while True:
+                fileobj.write(b'x' * 100)
+        except BrokenPipeError:
+            stopped.set()
+            raise
+
+    pipe = ArchivePipe(producer, 'test', max_size=100)
+    assert pipe.read(10) == b'x' * 10
+    pipe.close()
+    assert stopped.is_set()
+
+
+@pytest.mark.parametrize('codec, mode', [('none', 'r:'), ('gzip', 'r:gz'), ('parallel_gzip', 'r:gz')])
+def test_archive_codecs(job_directory, codec, mode):
+    expected = io.BytesIO()
+    write_job_archive(expected, job_directory, codec='none')
+
+    written = io.BytesIO()
+    write_job_archive(written, job_directory, codec=codec, threads=2)
+    assert _archive_contents(written.getvalue(), mode) == _archive_contents(expected.getvalue(), 'r:')
+
+
+def test_archive_zstd(job_directory):
+    zstandard = pytest.importorskip('zstandard')
+
+    written = io.BytesIO()
+    write_job_archive(written, job_directory, codec='zstd', threads=2)
+    with zstandard.ZstdDecompressor().stream_reader(io.BytesIO(written.getvalue())) as reader:
+        data = reader.read()
+
+    expected = io.BytesIO()
+    write_job_archive(expected, job_directory, codec='none')
+    assert _archive_contents(data, 'r:') == _archive_contents(expected.getvalue(), 'r:')
+
+
+def test_archive_unknown_codec(job_directory):
+    with pytest.raises(ValueError):
+        write_job_archive(io.BytesIO(), job_directory, codec='bzip2')
+
+
+def test_parallel_gzip_blocks():
+    data = bytes(range(256)) * 1000
+    written = io.BytesIO()
+    with _ParallelGzipWriter(written, level=6, threads=4, block_size=1000) as writer:
+        for i in range(0, len(data), 777):
+            writer.write(data[i:i + 777])
+
+    compressed = written.getvalue()
+    # The blocks are written as a single gzip member, which a single decompressor reads in full
+    decompressor = zlib.decompressobj(31)
+    assert decompressor.decompress(compressed) == data
+    assert decompressor.eof and not decompressor.unused_data
+
+
+def test_parallel_gzip_dictionary():
+    # Each block repeats the one before it, which is only found if the blocks are primed with the data before them
+    block = os.urandom(4000)
+    written = io.BytesIO()
+    with _ParallelGzipWriter(written, level=6, threads=4, block_size=4000) as writer:
+        writer.write(block * 50)
+
+    assert len(written.getvalue()) < 2 * len(block)
+    assert gzip.decompress(written.getvalue()) == block * 50
+
+
+def test_compressed_file(tmp_path):
+    (tmp_path / 'test_corner.png').write_bytes(b'not really a png')
+    (tmp_path / 'samples.dat').write_bytes(b'\x89HDF\r\n\x1a\n' + b'data' * 10)
+    (tmp_path / 'samples.txt').write_text('label=test')
+
+    assert _compressed_file(tmp_path / 'test_corner.png') is True
+    assert _compressed_file(tmp_path / 'samples.dat') is True
+    assert _compressed_file(tmp_path / 'samples.txt') is False
+    assert _compressed_file(tmp_path / 'missing.txt') is False
+
+
+@pytest.mark.parametrize('codec', ['gzip', 'parallel_gzip'])
+def test_archive_stores_compressed_files(job_directory, codec):
+    image = os.urandom(10000)
+    (job_directory / 'result' / 'test_corner.png').write_bytes(image)
+
+    stored = io.BytesIO()
+    write_job_archive(stored, job_directory, codec=codec, threads=2)
+    compressed = io.BytesIO()
+    write_job_archive(compressed, job_directory, codec=codec, threads=2, content_aware=False)
+
+    # The image is copied into the archive as it is, while the text files are still compressed
+    assert image in stored.getvalue()
+    assert image not in compressed.getvalue()
+    assert b'label=test' not in stored.getvalue()
+    assert _archive_contents(stored.getvalue()) == _archive_contents(compressed.getvalue())
+
+
+@pytest.mark.parametrize('codec', ['gzip', 'parallel_gzip'])
+def test_archive_stream_readable(job_directory, codec):
+    # A stored image between compressed files, and a file spanning several parallel blocks
+    (job_directory / 'data' / 'plot.png').write_bytes(b'\x89PNG\r\n\x1a\n' + os.urandom(10000))
+    (job_directory / 'result' / 'samples.dat').write_bytes(b'samples ' * (300 * 1024))
+
+    written = io.BytesIO()
+    write_job_archive(written, job_directory, codec=codec, threads=2)
+    expected = io.BytesIO()
+    write_job_archive(expected, job_directory, codec='none')
+
+    # Stream readers only read the first member of a gzip stream, so every member must be read this way
+    with tarfile.open(fileobj=io.BytesIO(written.getvalue()), mode='r|gz') as tar_handle:
+        contents = {
+            member.name: tar_handle.extractfile(member).read() if member.isfile() else None for member in tar_handle
+        }
+    assert contents == _archive_contents(expected.getvalue(), 'r:')
+
+
+def test_gzip_levels():
+    written = io.BytesIO()
+    with _GzipWriter(written, level=6) as writer:
+        writer.set_level(100, 0)
+        writer.set_level(200)
+        writer.write(b'a' * 150)
+        writer.write(b'b' * 150)
+
+    compressed = written.getvalue()
+    # The stored run is written in the middle of a single gzip member, which stream readers read in full
+    assert compressed.count(b'\x1f\x8b\x08') == 1
+    assert b'a' * 50 + b'b' * 50 in compressed
+    assert gzip.decompress(compressed) == b'a' * 150 + b'b' * 150
+    assert zlib.decompressobj(31).decompress(compressed) == b'a' * 150 + b'b' * 150
+
+
+@pytest.fixture
+def fingerprinted_directory(job_directory):
+    # A compressed image, which is stored in the middle of the gzip stream, and a file larger than a parallel block
+    (job_directory / 'data' / 'plot.png').write_bytes(b'\x89PNG\r\n\x1a\n' + os.urandom(10000))
+    (job_directory / 'result' / 'samples.hdf5').write_bytes(b'\x89HDF\r\n\x1a\n' + os.urandom(1000))
+    (job_directory / 'result' / 'samples.dat').write_bytes(b'samples ' * (300 * 1024))
+    return job_directory
+
+
+def _write_fingerprinted(job_directory, job_archive, codec):
+    fingerprint = ArchiveFingerprint()
+    with job_archive.open('wb') as f:
+        write_job_archive(f, job_directory, codec=codec, threads=2, fingerprint=fingerprint)
+    return fingerprint.hexdigest()
+
+
+@pytest.mark.parametrize('codec', ['none', 'gzip', 'parallel_gzip', 'zstd'])
+def test_archive_fingerprint(fingerprinted_directory, tmp_path_factory, codec):
+    if codec == 'zstd':
+        pytest.importorskip('zstandard')
+    archives = tmp_path_factory.mktemp('archives')
+    fingerprint = _write_fingerprinted(fingerprinted_directory, archives / 'first.tar', codec)
+
+    # The fingerprint computed while archiving matches that of the written archive, whatever the codec
+    assert fingerprint == archive_fingerprint(archives / 'first.tar')
+    assert fingerprint == job_directory_fingerprint(fingerprinted_directory)
+
+    # Changing only the bytes of the stored image changes the fingerprint, however it is computed
+    (fingerprinted_directory / 'data' / 'plot.png').write_bytes(b'\x89PNG\r\n\x1a\n' + os.urandom(10000))
+    changed = _write_fingerprinted(fingerprinted_directory, archives / 'second.tar', codec)
+    assert changed != fingerprint
+    assert archive_fingerprint(archives / 'second.tar') == changed
+    assert job_directory_fingerprint(fingerprinted_directory) == changed
+
+    (fingerprinted_directory / 'result' / 'test_result.json').write_text('{"result": false}')
+    assert job_directory_fingerprint(fingerprinted_directory) != changed
+
+
+def test_archive_fingerprint_multiple_members(fingerprinted_directory, tmp_path_factory):
+    written = io.BytesIO()
+    fingerprint = ArchiveFingerprint()
+    write_job_archive(written, fingerprinted_directory, codec='none', fingerprint=fingerprint)
+
+    # Archives written elsewhere, such as by concatenating gzip members, are read in full
+    data = written.getvalue()
+    job_archive = tmp_path_factory.mktemp('archives') / 'job.tar.gz'
+    job_archive.write_bytes(b''.join(gzip.compress(data[i:i + 4096]) for i in range(0, len(data), 4096)))
+    assert archive_fingerprint(job_archive) == fingerprint.hexdigest()
+
+
+def test_archive_fingerprint_not_an_archive(tmp_path):
+    job_archive = tmp_path / 'job.tar.gz'
+    job_archive.write_bytes(b'not an archive')
+    assert archive_fingerprint(job_archive) == archive_fingerprint(job_archive)
+    assert len(archive_fingerprint(job_archive)) == 64
@@ -0,0 +1,54 @@
+import pytest
+
+from gwcloud_python.utils.chunked_upload import FilePart, UploadJournal, part_ranges
+
+
+@pytest.fixture
+def job_archive(tmp_path):
+    job_archive = tmp_path / 'job.tar.gz'
+    job_archive.write_bytes(bytes(range(256)) * 10)
+    return job_archive
+
+
+def test_part_ranges():
+    assert part_ranges(2500, 1000) == [(1, 0, 1000), (2, 1000, 1000), (3, 2000, 500)]
+    assert part_ranges(2000, 1000) == [(1, 0, 1000), (2, 1000, 1000)]
+    assert part_ranges(0, 1000) == [(1, 0, 0)]
+
+
+def test_file_part(job_archive):
+    read = []
+    with FilePart(job_archive, 1000, 1000, on_read=read.append) as part:
+        assert part.name == 'job.tar.gz'
+        assert part.seek(0, 2) == 1000
+        part.seek(0)
+        assert part.read() == job_archive.read_bytes()[1000:2000]
+        assert part.read() == b''
+
+        # Data that is read again is only counted once
+        part.seek(500)
+        assert len(part.read()) == 500
+
+    assert sum(read) == 1000
+
+
+def test_upload_journal(job_archive, tmp_path):
+    fingerprint = UploadJournal.fingerprint(job_archive, 1000)
+    journal = UploadJournal(tmp_path / 'journal.json')
+    assert journal.resume(fingerprint) is False
+
+    journal.start('session', fingerprint)
+    journal.record(2, 'part_2')
+
+    resumed = UploadJournal(tmp_path / 'journal.json')
+    assert resumed.resume(fingerprint) is True
+    assert resumed.session_id == 'session'
+    assert resumed.parts == {2: 'part_2'}
+
+    # A journal is not resumed for a different version of the archive, or different parts
+    assert UploadJournal(tmp_path / 'journal.json').resume(UploadJournal.fingerprint(job_archive, 500)) is False
+    job_archive.write_bytes(b'changed')
+    assert UploadJournal(tmp_path / 'journal.json').resume(UploadJournal.fingerprint(job_archive, 1000)) is False
+
+    resumed.remove()
+    assert not (tmp_path / 'journal.json').exists()
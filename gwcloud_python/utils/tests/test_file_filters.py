@@ -1,5 +1,9 @@
+import gc
+import weakref
+from pathlib import Path
+
 import pytest
-from gwcloud_python.utils import file_filters
+from gwcloud_python.utils import file_filters, identifiers
 from gwcloud_python import FileReference, FileReferenceList
 
 
@@ -202,3 +206,62 @@ def test_result_json_file_filter(full_with_merge, full_without_merge, merge, unm
     sub_list = file_filters.result_json_filter(full_without_merge)
     assert file_filters.sort_file_list(sub_list) != file_filters.sort_file_list(merge)
     assert file_filters.sort_file_list(sub_list) == file_filters.sort_file_list(unmerge)
+
+
+@pytest.mark.parametrize('path', [
+    'test.png', 'data/test.png', 'data/dir/test_corner.png', 'result/test_corner.png', 'other/data/test.png',
+    'index.html', 'result/index.html', 'test_config_complete.ini', 'result/test_config_complete.ini',
+    'result/test_result.json', 'result/dir/test_merge_result.json', 'test_result.json', 'data/test_result.json',
+    '/result/test_result.json', 'result/test.json', 'result'
+])
+def test_categories_match_identifiers(path):
+    path = Path(path)
+    assert set(file_filters._categories(path)) == {
+        category
+        for category, identifier in [
+            ('png', identifiers.png_file),
+            ('data_png', identifiers.data_png_file),
+            ('result_png', identifiers.result_png_file),
+            ('corner_plot', identifiers.corner_plot_file),
+            ('html', identifiers.html_file),
+            ('config', identifiers.config_file),
+            ('result_merged_json', identifiers.result_merged_json_file),
+            ('result_json', identifiers.result_json_file),
+        ]
+        if identifier(path)
+    }
+
+
+def test_file_list_classified_once(mocker, full_with_merge):
+    categories = mocker.patch.object(file_filters, '_categories', wraps=file_filters._categories)
+    file_list = list(full_with_merge)
+
+    for file_filter in [file_filters.default_filter, file_filters.png_filter, file_filters.result_json_filter]:
+        file_filter(file_list)
+    assert categories.call_count == len(file_list)
+
+    # Filtered lists are independent of the cached categories
+    file_filters.png_filter(file_list).clear()
+    assert file_filters.png_filter(file_list)
+
+    # The categories are kept on each file, so a new list of the same files is not classified again, unless the path
+    # of a file changes
+    file_filters.png_filter(file_list[1:])
+    assert categories.call_count == len(file_list)
+    file_list[0].path = Path('result/renamed.png')
+    assert file_list[0] in file_filters.png_filter(file_list)
+    assert categories.call_count == len(file_list) + 1
+
+
+def test_file_list_filters_keep_no_references(placeholder_bilby_job):
+    file_list = [
+        FileReference(path=path, file_size='1', download_token='test_token', parent=placeholder_bilby_job)
+        for path in ['data/test.png', 'result/test_result.json', 'test_config_complete.ini']
+    ]
+    assert len(file_filters.default_filter(file_list)) == 3
+    references = [weakref.ref(f) for f in file_list]
+
+    # Nothing outside the files themselves keeps them alive once they have been filtered
+    del file_list
+    gc.collect()
+    assert all(reference() is None for reference in references)
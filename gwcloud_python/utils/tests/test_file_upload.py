@@ -1,4 +1,4 @@
-from gwcloud_python.utils.file_upload import check_file
+from gwcloud_python.utils.file_upload import check_file, group_supporting_files, batch_supporting_files
 import pytest
 from tempfile import NamedTemporaryFile, TemporaryDirectory
 from pathlib import Path
@@ -12,3 +12,28 @@ def test_get_endpoint_from_uploaded():
 
         with pytest.raises(Exception):
             check_file(tmp_dir / 'nonexistant')
+
+
+def test_group_supporting_files(tmp_path):
+    (tmp_path / 'psd.txt').write_bytes(b'psd')
+    (tmp_path / 'psd_copy.txt').write_bytes(b'psd')
+    (tmp_path / 'prior.txt').write_bytes(b'pri')
+
+    files = group_supporting_files(
+        ['psd_1', 'prior', 'psd_2', 'psd_3'],
+        [tmp_path / 'psd.txt', tmp_path / 'prior.txt', tmp_path / 'psd_copy.txt', tmp_path / '.' / 'psd.txt']
+    )
+    assert files == [
+        ((tmp_path / 'psd.txt').resolve(), 3, ['psd_1', 'psd_3', 'psd_2']),
+        ((tmp_path / 'prior.txt').resolve(), 3, ['prior']),
+    ]
+
+    with pytest.raises(Exception):
+        group_supporting_files(['missing'], [tmp_path / 'missing.txt'])
+
+
+def test_batch_supporting_files():
+    files = [(Path(f'{i}.txt'), size, [str(i)]) for i, size in enumerate([10, 20, 100, 5, 5, 5])]
+    batches = batch_supporting_files(files, max_bytes=50, max_files=2)
+    assert [[f[1] for f in batch] for batch in batches] == [[10, 20], [100], [5, 5], [5]]
+    assert batch_supporting_files([], max_bytes=50, max_files=2) == []
@@ -0,0 +1,113 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+from gwcloud_python import BilbyJob, FileReference, FileReferenceList
+from gwcloud_python.utils import filter_rules
+from gwcloud_python.utils.filter_rules import All, Any, Directory, Fallback, Glob, Regex, Suffix
+
+
+@dataclass
+class File:
+    path: Path
+
+
+def _files(*paths):
+    return [File(Path(path)) for path in paths]
+
+
+def _paths(file_list):
+    return [f.path.as_posix() for f in file_list]
+
+
+@pytest.fixture
+def files():
+    return _files(
+        'test_config_complete.ini',
+        'data/test_data.png',
+        'result/test_corner.png',
+        'result/test_par0_result.json',
+        'result/test_merge_result.json',
+        'result/final/test_result.hdf5',
+        'result/checkpoint/test_resume.pickle',
+        'log_data_analysis/result/test.log',
+    )
+
+
+@pytest.mark.parametrize('pattern, expected', [
+    ('*.png', ['data/test_data.png', 'result/test_corner.png']),
+    ('result/*.png', ['result/test_corner.png']),
+    ('result/*', [
+        'result/test_corner.png', 'result/test_par0_result.json', 'result/test_merge_result.json'
+    ]),
+    ('result/**/*.hdf5', ['result/final/test_result.hdf5']),
+    ('**/result/*.log', ['log_data_analysis/result/test.log']),
+    ('test_???0_result.json', ['result/test_par0_result.json']),
+    ('test_[!m]*_result.json', ['result/test_par0_result.json']),
+])
+def test_glob(files, pattern, expected):
+    assert _paths(Glob(pattern)(files)) == expected
+
+
+def test_path_rules(files):
+    assert _paths(Regex(r'_par\d+_')(files)) == ['result/test_par0_result.json']
+    assert _paths(Regex(r'^data/')(files)) == ['data/test_data.png']
+    assert _paths(Directory('result/final')(files)) == ['result/final/test_result.hdf5']
+    assert _paths(Directory('result', anywhere=True)(files)) == _paths(files[2:])
+    assert _paths(Suffix('_result.json')(files)) == ['result/test_par0_result.json', 'result/test_merge_result.json']
+
+
+@pytest.mark.parametrize('pattern', [r'(?i)\.PNG$', r'(a)_\1', r'(?P<name>a)'])
+def test_regex_rejected(pattern):
+    # These patterns are valid on their own, but not when compiled together with other rules
+    with pytest.raises(ValueError):
+        Regex(pattern)
+
+
+def test_regex_scoped_flags(files):
+    rule = Regex(r'(?i:\.PNG)$') | Regex(r'(_par|_merge)')
+    assert _paths(rule(files)) == [
+        'data/test_data.png', 'result/test_corner.png', 'result/test_par0_result.json', 'result/test_merge_result.json'
+    ]
+
+
+def test_combined_rules(files):
+    assert _paths(All(Directory('result'), Suffix('.hdf5'))(files)) == ['result/final/test_result.hdf5']
+    assert _paths((Suffix('.ini') | Glob('data/*.png'))(files)) == ['test_config_complete.ini', 'data/test_data.png']
+    assert _paths(Any(Suffix('.ini'), Directory('data') & Suffix('.json'))(files)) == ['test_config_complete.ini']
+
+    result_json = Fallback(Suffix('_merge_result.json'), Suffix('_result.json')) & Directory('result')
+    assert _paths(result_json(files)) == ['result/test_merge_result.json']
+    assert _paths(result_json(files[:4])) == ['result/test_par0_result.json']
+    assert result_json(files[:2]) == []
+
+
+def test_rule_compiled_once(mocker, files):
+    rule = Directory('result') & (Suffix('.png') | Suffix('.hdf5') | Suffix('.png'))
+    assert len(rule(files)) == 2
+    # Every path rule is matched by a single regular expression, with each distinct pattern only once
+    assert len(rule._compiled.patterns) == 3
+
+    # The matches are kept on each file, so the same files are not matched again, unless the path of a file changes
+    pure_path = mocker.patch.object(filter_rules, 'PurePath', wraps=filter_rules.PurePath)
+    assert len(rule(files)) == 2
+    assert len(rule(files[:3])) == 1
+    pure_path.assert_not_called()
+
+    files[0].path = Path('result/renamed.png')
+    assert len(rule(files)) == 3
+    assert pure_path.call_count == 1
+
+
+def test_register_rule(mocker, files):
+    class RuleBilbyJob(BilbyJob):
+        FILE_LIST_FILTERS = {'result_hdf5': Directory('result') & Suffix('.hdf5')}
+
+    parent = mocker.Mock(**{'is_external.return_value': False})
+    full = FileReferenceList([
+        FileReference(path=f.path, file_size='1', download_token='test_token', parent=parent) for f in files
+    ])
+    bilby_job = mocker.Mock(**{'get_full_file_list.return_value': full})
+
+    assert _paths(RuleBilbyJob.get_result_hdf5_file_list(bilby_job)) == ['result/final/test_result.hdf5']
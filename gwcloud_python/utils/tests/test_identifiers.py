@@ -8,6 +8,9 @@ def setup_paths():
     return {
         'png': Path('test.png'),
 
+        'hdf5': Path('this/is/a/test.hdf5'),
+        'h5': Path('test.h5'),
+
         'html': Path('test.html'),
         'dir_html': Path('this/is/a/test.html'),
 
@@ -59,6 +62,10 @@ def setup_identifiers():
             identifiers.png_file,
             ['png', 'corner', 'corner_bad_pattern', 'data_dir_png', 'data_png', 'result_dir_png', 'result_png']
         ),
+        (
+            identifiers.hdf5_file,
+            ['hdf5', 'h5']
+        ),
         (
             identifiers.data_dir,
             ['data_path', 'data_dir_png']
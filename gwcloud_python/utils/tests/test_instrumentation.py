@@ -0,0 +1,52 @@
+import json
+
+from gwcloud_python.utils.graphql import parse_operation
+from gwcloud_python.utils.instrumentation import RequestStats
+
+
+def test_parse_operation():
+    assert parse_operation("query ($id: ID!){ bilbyJob (id: $id) { id } }") == ("query", "bilbyJob")
+    assert parse_operation("query { allEventIds { eventId } }") == ("query", "allEventIds")
+    assert parse_operation("mutation DeleteEventIDMutation($input: X!) { a }") == ("mutation", "DeleteEventIDMutation")
+    assert parse_operation("{ sessionUser { isAuthenticated } }") == ("query", "sessionUser")
+
+
+def test_request_stats_summary():
+    stats = RequestStats()
+    for latency in [0.001, 0.02, 0.02, 0.3, 4]:
+        stats.record("bilbyJob", latency, request_bytes=10, response_bytes=100)
+    stats.record("bilbyJob", 0.2, retries=2, error=True)
+    stats.record("allEventIds", 0.05)
+
+    summary = stats.summary()
+    assert list(summary) == ["allEventIds", "bilbyJob"]
+    assert summary["bilbyJob"]["count"] == 6
+    assert summary["bilbyJob"]["errors"] == 1
+    assert summary["bilbyJob"]["retries"] == 2
+    assert summary["bilbyJob"]["request_bytes"] == 50
+    assert summary["bilbyJob"]["response_bytes"] == 500
+    assert summary["bilbyJob"]["latency_max"] == 4
+    assert summary["bilbyJob"]["latency_p50"] == 0.025
+    assert summary["bilbyJob"]["latency_p99"] == 4
+    assert summary["allEventIds"]["latency_p50"] == 0.05
+
+    assert json.loads(stats.to_json()) == summary
+
+    stats.reset()
+    assert stats.summary() == {}
+
+
+def test_request_stats_prometheus():
+    stats = RequestStats()
+    stats.record("bilbyJob", 0.02, request_bytes=10, response_bytes=100)
+    stats.record("bilbyJob", 500)
+
+    lines = stats.to_prometheus().splitlines()
+    assert "# TYPE gwcloud_requests_total counter" in lines
+    assert 'gwcloud_requests_total{operation="bilbyJob"} 2' in lines
+    assert 'gwcloud_response_bytes_total{operation="bilbyJob"} 100' in lines
+    assert 'gwcloud_request_duration_seconds_bucket{operation="bilbyJob",le="0.01"} 0' in lines
+    assert 'gwcloud_request_duration_seconds_bucket{operation="bilbyJob",le="0.025"} 1' in lines
+    assert 'gwcloud_request_duration_seconds_bucket{operation="bilbyJob",le="300"} 1' in lines
+    assert 'gwcloud_request_duration_seconds_bucket{operation="bilbyJob",le="+Inf"} 2' in lines
+    assert 'gwcloud_request_duration_seconds_count{operation="bilbyJob"} 2' in lines
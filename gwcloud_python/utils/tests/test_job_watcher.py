@@ -0,0 +1,75 @@
+import pytest
+from gwdc_python.helpers import JobStatus
+
+from gwcloud_python.utils.job_watcher import _watch_job_statuses, is_terminal
+
+
+@pytest.fixture
+def mock_sleep(mocker):
+    return mocker.patch('gwcloud_python.utils.job_watcher.time.sleep')
+
+
+@pytest.fixture
+def jobs(mocker):
+    return [
+        mocker.Mock(id=f'id{i}', status=JobStatus(status=status, date='2021-12-02'))
+        for i, status in enumerate(['Running', 'Queued', 'Completed'])
+    ]
+
+
+def _status(name):
+    return {'name': name, 'date': '2021-12-02'}
+
+
+def test_is_terminal():
+    assert is_terminal(JobStatus(status='Completed', date=''))
+    assert is_terminal(JobStatus(status='Wall Time Exceeded', date=''))
+    assert not is_terminal(JobStatus(status='Running', date=''))
+    assert not is_terminal(None)
+
+
+def test_watch_job_statuses(mocker, mock_sleep, jobs):
+    get_statuses = mocker.Mock(side_effect=[
+        {'id0': _status('Running'), 'id1': _status('Running')},
+        {'id0': _status('Running'), 'id1': _status('Running')},
+        {'id0': _status('Running'), 'id1': _status('Running')},
+        {'id0': _status('Completed'), 'id1': _status('Error')},
+    ])
+
+    changes = list(_watch_job_statuses(get_statuses, jobs, min_interval=1, max_interval=3, backoff=2))
+
+    assert [(c.job.id, c.previous.status, c.status.status) for c in changes] == [
+        ('id1', 'Queued', 'Running'),
+        ('id0', 'Running', 'Completed'),
+        ('id1', 'Running', 'Error'),
+    ]
+    assert jobs[0].status == JobStatus(status='Completed', date='2021-12-02')
+
+    # Terminal jobs are never polled, and all pending jobs are polled together
+    get_statuses.assert_called_with(['id0', 'id1'])
+    assert get_statuses.call_count == 4
+
+    # The interval resets after a change, then backs off until it reaches the maximum
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [1, 2, 3]
+
+
+def test_watch_job_statuses_drops_missing_jobs(mocker, mock_sleep, jobs):
+    get_statuses = mocker.Mock(side_effect=[
+        {'id0': None, 'id1': _status('Running')},
+        {'id1': _status('Completed')},
+    ])
+
+    changes = list(_watch_job_statuses(get_statuses, jobs, min_interval=1, max_interval=3, backoff=2))
+
+    assert [c.job.id for c in changes] == ['id1', 'id1']
+    get_statuses.assert_called_with(['id1'])
+
+
+def test_watch_job_statuses_timeout(mocker, mock_sleep, jobs):
+    get_statuses = mocker.Mock(return_value={'id0': _status('Running'), 'id1': _status('Queued')})
+    mocker.patch('gwcloud_python.utils.job_watcher.time.monotonic', side_effect=[0, 1, 5, 11])
+
+    changes = list(_watch_job_statuses(get_statuses, jobs, min_interval=2, max_interval=8, backoff=2, timeout=10))
+
+    assert changes == []
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [4, 5]
@@ -0,0 +1,77 @@
+import io
+import json
+
+import pytest
+
+from gwcloud_python.utils.multipart import MultipartStream
+
+
+class UnseekableFile(io.RawIOBase):
+    def __init__(self, content):
+        self._content = io.BytesIO(content)
+        self.name = 'unseekable.txt'
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        return self._content.readinto(buffer)
+
+
+@pytest.fixture
+def operations():
+    return {'query': 'mutation Upload($input: Input!) { upload(input: $input) { result } }', 'variables': {}}
+
+
+@pytest.fixture
+def test_file(tmp_path):
+    path = tmp_path / 'test.txt'
+    path.write_bytes(b'0123456789' * 100)
+    return path
+
+
+def test_multipart_stream(operations, test_file):
+    progress = []
+    with test_file.open('rb') as f:
+        stream = MultipartStream(
+            operations,
+            {'variables.input.file': ('test.txt', f)},
+            chunk_size=256,
+            progress=lambda bytes_sent, total: progress.append((bytes_sent, total))
+        )
+        chunks = list(stream)
+
+    body = b''.join(chunks)
+    assert len(body) == len(stream) == stream.size == stream.bytes_sent
+    assert max(len(chunk) for chunk in chunks) == 256
+    assert progress[-1] == (len(body), len(body))
+    assert [bytes_sent for bytes_sent, _ in progress] == sorted(bytes_sent for bytes_sent, _ in progress)
+
+    assert body.startswith(f'--{stream.boundary}\r\n'.encode())
+    assert body.endswith(f'--{stream.boundary}--\r\n'.encode())
+    assert json.dumps(operations).encode() in body
+    assert b'filename="test.txt"' in body
+    assert b'0123456789' * 100 + b'\r\n' in body
+
+
+def test_multipart_stream_deduplicates_files(operations, test_file):
+    with test_file.open('rb') as f1, test_file.open('rb') as f2:
+        stream = MultipartStream(operations, {
+            'variables.input.files.0': ('test.txt', f1),
+            'variables.input.files.1': ('test.txt', f2),
+            'variables.input.file': ('test.txt', f1),
+        })
+        body = b''.join(stream)
+
+    assert body.count(b'0123456789' * 100) == 1
+    assert json.dumps({'0': ['variables.input.files.0', 'variables.input.files.1', 'variables.input.file']}).encode() \
+        in body
+
+
+def test_multipart_stream_unknown_size(operations):
+    stream = MultipartStream(operations, {'variables.input.file': ('unseekable.txt', UnseekableFile(b'content'))})
+
+    assert stream.size is None
+    with pytest.raises(TypeError):
+        len(stream)
+    assert b'content\r\n' in b''.join(stream)
@@ -0,0 +1,69 @@
+import threading
+import time
+
+import pytest
+
+from gwcloud_python.utils.single_flight import SingleFlight
+
+
+@pytest.fixture
+def single_flight():
+    return SingleFlight()
+
+
+def _call_concurrently(single_flight, key, fn, count=5):
+    """Call fn through the single flight from several threads, releasing the first call once the others are waiting"""
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    outcomes = [None] * count
+
+    def blocking_fn():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return fn()
+
+    def target(i):
+        try:
+            outcomes[i] = single_flight.do(key, blocking_fn)
+        except Exception as e:
+            outcomes[i] = e
+
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    return calls, outcomes
+
+
+def test_single_flight_shares_result(single_flight):
+    calls, outcomes = _call_concurrently(single_flight, 'key', lambda: ['result'])
+
+    assert len(calls) == 1
+    assert outcomes[0] == ['result']
+    assert all(outcome is outcomes[0] for outcome in outcomes)
+    assert len(single_flight) == 0
+
+
+def test_single_flight_shares_exception(single_flight):
+    def fail():
+        raise ValueError('failed')
+
+    calls, outcomes = _call_concurrently(single_flight, 'key', fail)
+
+    assert len(calls) == 1
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+    assert len(single_flight) == 0
+
+
+def test_single_flight_sequential_calls(single_flight):
+    assert single_flight.do('key', lambda: 1) == 1
+    assert single_flight.do('key', lambda: 2) == 2
+    assert single_flight.do('other', lambda: 3) == 3
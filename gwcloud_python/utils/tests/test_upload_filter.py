@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import pytest
+
+from gwcloud_python.utils import identifiers
+from gwcloud_python.utils.upload_filter import UploadFilter, DEFAULT_UPLOAD_FILTER
+
+
+@pytest.fixture
+def job_directory(tmp_path):
+    files = {
+        'data/test_data.png': 10,
+        'data/test_checkpoint.pickle': 1000,
+        'result/test_result.json': 20,
+        'result/test_merge_result.json': 30,
+        'result/test_corner.png': 40,
+        'log_data_analysis/test.log': 200,
+        'log_data_analysis/scratch/test.tmp': 300,
+        'test_config_complete.ini': 50,
+        'index.html': 60,
+    }
+    for path, size in files.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_bytes(b'x' * size)
+    return tmp_path
+
+
+def _selected(upload_filter, job_directory):
+    members, skipped_bytes = upload_filter.select(job_directory)
+    return sorted(str(member.relative_to(job_directory)) for member in members), skipped_bytes
+
+
+def test_upload_filter_everything(job_directory):
+    members, skipped_bytes = _selected(UploadFilter(), job_directory)
+    assert len(members) == 13
+    assert skipped_bytes == 0
+
+
+def test_upload_filter_exclude(job_directory):
+    upload_filter = UploadFilter(exclude=['*.log', 'scratch', identifiers.data_dir])
+    # Directories which no longer contain any files are not uploaded
+    assert _selected(upload_filter, job_directory) == ([
+        'index.html',
+        'result',
+        'result/test_corner.png',
+        'result/test_merge_result.json',
+        'result/test_result.json',
+        'test_config_complete.ini',
+    ], 1510)
+
+
+def test_upload_filter_include(job_directory):
+    upload_filter = UploadFilter(include=['*.json', identifiers.png_file], exclude=['*_corner.png'])
+    assert _selected(upload_filter, job_directory) == ([
+        'data',
+        'data/test_data.png',
+        'result',
+        'result/test_merge_result.json',
+        'result/test_result.json',
+    ], 1650)
+
+
+def test_default_upload_filter(job_directory):
+    # Only the files served by default are uploaded, so the unmerged result is skipped in favour of the merged one
+    assert _selected(DEFAULT_UPLOAD_FILTER, job_directory) == ([
+        'data',
+        'data/test_data.png',
+        'index.html',
+        'result',
+        'result/test_corner.png',
+        'result/test_merge_result.json',
+        'test_config_complete.ini',
+    ], 1520)
+
+
+def test_upload_filter_relative_paths(job_directory):
+    seen = []
+    UploadFilter(include=[lambda path: seen.append(path) or True]).select(job_directory)
+    assert Path('data/test_data.png') in seen
@@ -0,0 +1,23 @@
+from gwcloud_python.utils.upload_ledger import UploadLedger
+
+
+def test_upload_ledger(tmp_path):
+    ledger = UploadLedger(tmp_path / 'ledger' / 'uploads.json')
+    assert ledger.get('endpoint', 'fingerprint', 'description', False) is None
+
+    ledger.record('endpoint', 'fingerprint', 'description', False, 'job_1')
+    assert ledger.get('endpoint', 'fingerprint', 'description', False) == 'job_1'
+    # Uploads are recorded separately for each server
+    assert ledger.get('other_endpoint', 'fingerprint', 'description', False) is None
+    # The same content uploaded with different details is a different job
+    assert ledger.get('endpoint', 'fingerprint', 'other description', False) is None
+    assert ledger.get('endpoint', 'fingerprint', 'description', True) is None
+
+
+def test_upload_ledger_shared(tmp_path):
+    first, second = UploadLedger(tmp_path / 'uploads.json'), UploadLedger(tmp_path / 'uploads.json')
+    first.record('endpoint', 'fingerprint_1', 'description', False, 'job_1')
+    second.record('endpoint', 'fingerprint_2', 'description', False, 'job_2')
+
+    assert first.get('endpoint', 'fingerprint_1', 'description', False) == 'job_1'
+    assert first.get('endpoint', 'fingerprint_2', 'description', False) == 'job_2'
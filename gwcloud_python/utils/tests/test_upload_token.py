@@ -0,0 +1,53 @@
+import base64
+import json
+
+import pytest
+
+from gwcloud_python.utils import upload_token
+from gwcloud_python.utils.upload_token import UploadTokenCache, token_expiry
+
+
+def _jwt(claims):
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).decode().rstrip('=')
+    return f'header.{payload}.signature'
+
+
+@pytest.fixture
+def now(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(upload_token.time, 'time', lambda: now[0])
+    return now
+
+
+def test_token_expiry():
+    assert token_expiry(_jwt({'exp': 1234})) == 1234
+    assert token_expiry(_jwt({'user': 1})) is None
+    assert token_expiry('not a jwt') is None
+    assert token_expiry('not.a.jwt') is None
+
+
+def test_upload_token_cache_jwt(now):
+    tokens = iter([_jwt({'exp': 2000, 'n': 1}), _jwt({'exp': 3000, 'n': 2})])
+    cache = UploadTokenCache(lambda: next(tokens), margin=100)
+
+    first = cache.get()
+    now[0] = 1899
+    assert cache.get() == first
+
+    # A new token is generated shortly before the first expires
+    now[0] = 1900
+    assert cache.get() != first
+
+
+def test_upload_token_cache_ttl(now):
+    tokens = iter(['token_1', 'token_2', 'token_3'])
+    cache = UploadTokenCache(lambda: next(tokens), ttl=500, margin=0)
+
+    assert cache.get() == 'token_1'
+    now[0] = 1499
+    assert cache.get() == 'token_1'
+    now[0] = 1500
+    assert cache.get() == 'token_2'
+
+    cache.invalidate()
+    assert cache.get() == 'token_3'
@@ -0,0 +1,77 @@
+from collections import namedtuple
+from pathlib import Path
+
+from . import file_filters
+
+# A file in a local job directory, with the attributes of a FileReference used by the file list filters
+_LocalFile = namedtuple("_LocalFile", ["path", "file_size"])
+
+
+def _matches(rule, file_path):
+    if callable(rule):
+        return rule(file_path)
+    # A pattern matches a file if it matches its path or any of the directories containing it
+    return any(path.match(rule) for path in [file_path, *list(file_path.parents)[:-1]])
+
+
+class UploadFilter:
+    """
+    UploadFilter selects the files of a job directory that are uploaded to GWCloud, so that scratch files,
+    checkpoints and logs are not uploaded. A file is uploaded if it is kept by the file list filter, matches any of
+    the include rules and matches none of the exclude rules. Each rule is either a glob pattern, such as '*.log',
+    which is matched against the path of the file relative to the job directory and each of the directories containing
+    it, or a function taking that path, such as those in :mod:`~gwcloud_python.utils.identifiers`.
+
+    Parameters
+    ----------
+    include : list, optional
+        Rules matching the files to upload. If None, all files are uploaded unless they are excluded, by default None
+    exclude : list, optional
+        Rules matching the files which are not uploaded, by default None
+    file_list_filter : function, optional
+        Function which takes a list of files with `path` and `file_size` attributes and returns those to upload, such
+        as those in :mod:`~gwcloud_python.utils.file_filters`, by default None
+    """
+
+    def __init__(self, include=None, exclude=None, file_list_filter=None):
+        self.include = list(include) if include is not None else None
+        self.exclude = list(exclude or [])
+        self.file_list_filter = file_list_filter
+
+    def _uploaded(self, file_path):
+        if self.include is not None and not any(_matches(rule, file_path) for rule in self.include):
+            return False
+        return not any(_matches(rule, file_path) for rule in self.exclude)
+
+    def select(self, job_directory):
+        """Select the files of a job directory to upload
+
+        Parameters
+        ----------
+        job_directory : str or ~pathlib.Path
+            Path to the job directory
+
+        Returns
+        -------
+        list
+            Paths of the selected files, and the directories containing them, in the order they are found
+        int
+            Total size in bytes of the files which are not selected
+        """
+        job_directory = Path(job_directory)
+        items = list(job_directory.rglob("*"))
+        files = [
+            _LocalFile(item.relative_to(job_directory), item.lstat().st_size) for item in items if not item.is_dir()
+        ]
+
+        kept = files if self.file_list_filter is None else self.file_list_filter(files)
+        selected = {f.path for f in kept if self._uploaded(f.path)}
+        uploaded = selected | {parent for path in selected for parent in path.parents}
+
+        skipped_bytes = sum(f.file_size for f in files if f.path not in selected)
+        members = [item for item in items if item.relative_to(job_directory) in uploaded]
+        return members, skipped_bytes
+
+
+# Only uploads the files which are served by default when the files of a job are downloaded
+DEFAULT_UPLOAD_FILTER = UploadFilter(file_list_filter=file_filters.default_filter)
@@ -0,0 +1,83 @@
+import json
+import os
+import threading
+from hashlib import sha256
+from pathlib import Path
+
+
+class UploadLedger:
+    """
+    UploadLedger records the ID of the job created by each upload in a local JSON file, keyed by the fingerprint of the
+    uploaded content, the description and visibility of the job, and the endpoint it was uploaded to, so that the same
+    job is not uploaded twice. Uploading the same content with a different description or visibility creates a new job.
+
+    Parameters
+    ----------
+    path : str or ~pathlib.Path
+        Path to the ledger file, which is created when the first upload is recorded
+    """
+
+    def __init__(self, path):
+        self.path = Path(path).expanduser()
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with self.path.open() as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    @staticmethod
+    def _key(fingerprint, description, public):
+        details = json.dumps([description, bool(public)], default=str)
+        return f"{fingerprint}-{sha256(details.encode('utf-8')).hexdigest()}"
+
+    def get(self, endpoint, fingerprint, description, public):
+        """Get the ID of the job created by an earlier upload of the same content, with the same details
+
+        Parameters
+        ----------
+        endpoint : str
+            Endpoint of the GWCloud server
+        fingerprint : str
+            Fingerprint of the uploaded content
+        description : str
+            Description of the job
+        public : bool
+            If the job is public or not
+
+        Returns
+        -------
+        str or None
+            ID of the job, or None if the content has not been uploaded before with the same details
+        """
+        with self._lock:
+            return self._load().get(endpoint, {}).get(self._key(fingerprint, description, public))
+
+    def record(self, endpoint, fingerprint, description, public, job_id):
+        """Record the job created by an upload
+
+        Parameters
+        ----------
+        endpoint : str
+            Endpoint of the GWCloud server
+        fingerprint : str
+            Fingerprint of the uploaded content
+        description : str
+            Description of the job
+        public : bool
+            If the job is public or not
+        job_id : str
+            ID of the created job
+        """
+        with self._lock:
+            # The ledger is read again before it is written, to keep uploads recorded by other processes
+            ledger = self._load()
+            ledger.setdefault(endpoint, {})[self._key(fingerprint, description, public)] = job_id
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with temporary_path.open("w") as f:
+                json.dump(ledger, f, indent=2)
+            os.replace(temporary_path, self.path)
@@ -0,0 +1,74 @@
+import base64
+import json
+import threading
+import time
+
+from ..settings import GWCLOUD_UPLOAD_TOKEN_TTL, GWCLOUD_UPLOAD_TOKEN_MARGIN
+
+
+def token_expiry(token):
+    """Get the time at which a JSON Web Token expires from its 'exp' claim
+
+    Parameters
+    ----------
+    token : str
+        The token
+
+    Returns
+    -------
+    float or None
+        Expiry time of the token as a Unix timestamp, or None if the token is not a JSON Web Token with an expiry time
+    """
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class UploadTokenCache:
+    """
+    UploadTokenCache holds an upload token so that it can be reused for many uploads, generating a new token once it
+    has expired. The cache is shared between threads, and only one thread generates a new token at a time.
+
+    Parameters
+    ----------
+    generate : function
+        Function, taking no arguments, which generates a new upload token
+    ttl : float, optional
+        Number of seconds for which a token is reused if it does not state when it expires,
+        by default GWCLOUD_UPLOAD_TOKEN_TTL
+    margin : float, optional
+        Number of seconds before a token expires at which a new token is generated instead,
+        by default GWCLOUD_UPLOAD_TOKEN_MARGIN
+    """
+
+    def __init__(self, generate, ttl=GWCLOUD_UPLOAD_TOKEN_TTL, margin=GWCLOUD_UPLOAD_TOKEN_MARGIN):
+        self.generate = generate
+        self.ttl = ttl
+        self.margin = margin
+        self._token = None
+        self._expires = 0
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Get an upload token, generating a new one if there is no token or it has expired
+
+        Returns
+        -------
+        str
+            The upload token
+        """
+        with self._lock:
+            if self._token is None or time.time() >= self._expires:
+                token = self.generate()
+                expiry = token_expiry(token)
+                self._expires = (time.time() + self.ttl if expiry is None else expiry) - self.margin
+                self._token = token
+            return self._token
+
+    def invalidate(self):
+        """Discard the upload token, so that a new one is generated for the next upload"""
+        with self._lock:
+            self._token = None